@@ -0,0 +1,50 @@
+"""add natural key unique constraints for bulk upsert
+
+Revision ID: a3f1c2d4e5b6
+Revises: 4575b3854e82
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c2d4e5b6'
+down_revision: Union[str, None] = '4575b3854e82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 表 -> (约束名, 自然键)
+NATURAL_KEYS = {
+    'qa': ('uq_qa_cell', ['line', 'year', 'month', 'day', 'scrapflag']),
+    'ehs': ('uq_ehs_year_week', ['year', 'week']),
+    'monthly_totals': ('uq_monthly_totals_line_period', ['line', 'year', 'month']),
+}
+
+
+def upgrade() -> None:
+    # 唯一索引要求定长列，与模型保持一致
+    with op.batch_alter_table('qa') as batch_op:
+        batch_op.alter_column('line', type_=sa.String(20))
+        for column in ('day', 'month', 'year'):
+            batch_op.alter_column(column, type_=sa.String(10))
+
+    for table, (name, columns) in NATURAL_KEYS.items():
+        group_by = ', '.join(columns)
+        # 先清理历史重复数据（并发保存产生），每个自然键保留最新一条
+        # 子查询多包一层，MySQL 不允许在 DELETE 的子查询中直接引用目标表
+        op.execute(sa.text(
+            f"DELETE FROM {table} WHERE id NOT IN ("
+            f"SELECT id FROM (SELECT MAX(id) AS id FROM {table} GROUP BY {group_by}) AS keep_rows)"
+        ))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(name, columns)
+
+
+def downgrade() -> None:
+    for table, (name, _) in NATURAL_KEYS.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(name, type_='unique')
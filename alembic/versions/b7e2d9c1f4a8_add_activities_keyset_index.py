@@ -0,0 +1,26 @@
+"""add (created_at, id) index for activities keyset pagination
+
+Revision ID: b7e2d9c1f4a8
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d9c1f4a8'
+down_revision: Union[str, None] = 'a3f1c2d4e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_activities_created_at_id', 'activities', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activities_created_at_id', table_name='activities')
@@ -0,0 +1,118 @@
+"""typed qa columns: integer day/month/year, numeric value
+
+Revision ID: c5d8e1f2a9b3
+Revises: b7e2d9c1f4a8
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d8e1f2a9b3'
+down_revision: Union[str, None] = 'b7e2d9c1f4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic')
+
+PERIOD_COLUMNS = ('day', 'month', 'year')
+CELL_KEY = ['year', 'month', 'line', 'day', 'scrapflag']
+
+
+def _to_int(value):
+    value = (value or '').strip()
+    return int(value) if value.isdigit() else None
+
+
+def _to_float(value):
+    try:
+        return float(value) if value and value.strip() else None
+    except ValueError:
+        return None
+
+
+def _to_str(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _log_unconverted(rows, updates, columns):
+    """旧列有值但无法转换的行写入迁移日志：旧列随后删除，这些格子的值将丢失"""
+    for column in columns:
+        failed = [
+            row['id'] for row, update in zip(rows, updates)
+            if update[f'{column}_new'] is None and str(row[column] or '').strip()
+        ]
+        if failed:
+            logger.warning(
+                'qa.%s: %d 行的值无法转换，已置为 NULL，id: %s',
+                column, len(failed), ', '.join(str(row_id) for row_id in failed),
+            )
+
+
+def _convert(new_types, convert):
+    """新增临时列 -> 逐行转换写入 -> 删除旧列并改名"""
+    conn = op.get_bind()
+    with op.batch_alter_table('qa') as batch_op:
+        batch_op.drop_constraint('uq_qa_cell', type_='unique')
+        for column, type_ in new_types.items():
+            batch_op.add_column(sa.Column(f'{column}_new', type_, nullable=True))
+
+    qa = sa.table('qa', sa.column('id'), *[sa.column(c) for c in new_types], *[sa.column(f'{c}_new') for c in new_types])
+    rows = conn.execute(sa.select(qa.c.id, *[qa.c[c] for c in new_types])).mappings().all()
+    updates = [
+        {'row_id': row['id'], **{f'{c}_new': convert[c](row[c]) for c in new_types}}
+        for row in rows
+    ]
+    _log_unconverted(rows, updates, new_types)
+    if updates:
+        conn.execute(
+            qa.update().where(qa.c.id == sa.bindparam('row_id')).values(
+                {f'{c}_new': sa.bindparam(f'{c}_new') for c in new_types}
+            ),
+            updates,
+        )
+
+    with op.batch_alter_table('qa') as batch_op:
+        for column, type_ in new_types.items():
+            batch_op.drop_column(column)
+            batch_op.alter_column(f'{column}_new', new_column_name=column, existing_type=type_)
+
+
+def _dedupe():
+    # "03" 与 "3" 转换后会落到同一格，保留最新一条
+    group_by = ', '.join(CELL_KEY)
+    op.execute(sa.text(
+        f"DELETE FROM qa WHERE id NOT IN ("
+        f"SELECT id FROM (SELECT MAX(id) AS id FROM qa GROUP BY {group_by}) AS keep_rows)"
+    ))
+
+
+def upgrade() -> None:
+    _convert(
+        {'day': sa.Integer(), 'month': sa.Integer(), 'year': sa.Integer(), 'value': sa.Float()},
+        {'day': _to_int, 'month': _to_int, 'year': _to_int, 'value': _to_float},
+    )
+    _dedupe()
+    with op.batch_alter_table('qa') as batch_op:
+        batch_op.create_unique_constraint('uq_qa_cell', CELL_KEY)
+        batch_op.create_index('ix_qa_line_year_month', ['line', 'year', 'month'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('qa') as batch_op:
+        batch_op.drop_index('ix_qa_line_year_month')
+    _convert(
+        {'day': sa.String(10), 'month': sa.String(10), 'year': sa.String(10), 'value': sa.String(255)},
+        {'day': _to_str, 'month': _to_str, 'year': _to_str, 'value': _to_str},
+    )
+    with op.batch_alter_table('qa') as batch_op:
+        batch_op.create_unique_constraint('uq_qa_cell', ['line', 'year', 'month', 'day', 'scrapflag'])
@@ -0,0 +1,58 @@
+"""add qa_monthly_rollup and backfill it from qa
+
+Revision ID: d9a4b6c3e7f1
+Revises: c5d8e1f2a9b3
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a4b6c3e7f1'
+down_revision: Union[str, None] = 'c5d8e1f2a9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'qa_monthly_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('line', sa.String(length=20), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('value_sum', sa.Float(), nullable=False),
+        sa.Column('scrap_sum', sa.Float(), nullable=False),
+        sa.Column('cell_count', sa.Integer(), nullable=False),
+        sa.Column('scrap_count', sa.Integer(), nullable=False),
+        sa.Column('min_value', sa.Float(), nullable=True),
+        sa.Column('max_value', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('year', 'month', 'line', name='uq_qa_monthly_rollup_period'),
+    )
+    op.create_index(op.f('ix_qa_monthly_rollup_id'), 'qa_monthly_rollup', ['id'], unique=False)
+
+    # 回填，与 services/qa_rollup.py 的聚合口径一致
+    op.execute(sa.text("""
+        INSERT INTO qa_monthly_rollup
+            (year, month, line, value_sum, scrap_sum, cell_count, scrap_count, min_value, max_value)
+        SELECT year, month, line,
+            COALESCE(SUM(CASE WHEN scrapflag THEN NULL ELSE value END), 0),
+            COALESCE(SUM(CASE WHEN scrapflag THEN value ELSE NULL END), 0),
+            COUNT(value),
+            COUNT(CASE WHEN scrapflag THEN value ELSE NULL END),
+            MIN(CASE WHEN scrapflag THEN NULL ELSE value END),
+            MAX(CASE WHEN scrapflag THEN NULL ELSE value END)
+        FROM qa
+        WHERE line IS NOT NULL AND year IS NOT NULL AND month IS NOT NULL
+        GROUP BY year, month, line
+    """))
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_qa_monthly_rollup_id'), table_name='qa_monthly_rollup')
+    op.drop_table('qa_monthly_rollup')
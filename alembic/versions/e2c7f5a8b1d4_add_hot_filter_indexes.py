@@ -0,0 +1,41 @@
+"""add composite indexes for router filters
+
+Revision ID: e2c7f5a8b1d4
+Revises: d9a4b6c3e7f1
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7f5a8b1d4'
+down_revision: Union[str, None] = 'd9a4b6c3e7f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (索引名, 表, 列)，与各路由的 WHERE / ORDER BY 对应
+INDEXES = [
+    ('ix_maint_daily_user_solved_date', 'maint_daily', ['user_id', 'solved_flag', 'date']),
+    ('ix_maint_daily_date', 'maint_daily', ['date']),
+    ('ix_maint_weekly_user_solved_datetime', 'maint_weekly', ['user_id', 'solved_flag', 'DateTime']),
+    ('ix_maint_weekly_datetime', 'maint_weekly', ['DateTime']),
+    ('ix_events_department_start_time', 'events', ['department', 'start_time']),
+    ('ix_events_start_time', 'events', ['start_time']),
+    ('ix_activities_department_created_at_id', 'activities', ['department', 'created_at', 'id']),
+    ('ix_qad_year_month', 'qad', ['year', 'month']),
+    ('ix_qa_kpi_year_month', 'qa_kpi', ['year', 'month']),
+    ('ix_monthly_totals_year_month', 'monthly_totals', ['year', 'month']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
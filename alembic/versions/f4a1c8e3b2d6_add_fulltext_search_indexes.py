@@ -0,0 +1,61 @@
+"""add fulltext search indexes (MySQL ngram FULLTEXT / SQLite FTS5)
+
+Revision ID: f4a1c8e3b2d6
+Revises: e2c7f5a8b1d4
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a1c8e3b2d6'
+down_revision: Union[str, None] = 'e2c7f5a8b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 表 -> 参与全文检索的列
+FULLTEXT = {
+    'activities': ['title', 'action', 'details', 'user_name'],
+    'maint_daily': ['title', 'wheres', 'content_daily'],
+    'maint_weekly': ['title', 'wheres', 'content'],
+    'events': ['name', 'department'],
+}
+
+
+def _sqlite_upgrade(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new_values = ', '.join(f'new.{c}' for c in columns)
+    old_values = ', '.join(f'old.{c}' for c in columns)
+    insert_new = f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});'
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    op.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='id', tokenize='trigram')")
+    op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END')
+    op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END')
+    op.execute(f'CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN {delete_old} {insert_new} END')
+    # 为已有数据建索引
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns in FULLTEXT.items():
+        if dialect == 'mysql':
+            op.create_index(f'ft_{table}', table, columns, mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+        elif dialect == 'sqlite':
+            _sqlite_upgrade(table, columns)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table in reversed(list(FULLTEXT)):
+        if dialect == 'mysql':
+            op.drop_index(f'ft_{table}', table_name=table)
+        elif dialect == 'sqlite':
+            fts = f'{table}_fts'
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+            op.execute(f'DROP TABLE IF EXISTS {fts}')
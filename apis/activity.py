@@ -1,62 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 from db.session import get_db
+from db.database import get_async_db
+from db.statement_timeout import time_budget
+from core.pagination import decode_cursor, estimate_count, exact_count, keyset_before, next_cursor
+from core.responses import conditional_response
+from core.versions import table_versions
+from services.exports import ACTIVITY_EXPORT, ExportFormat, export_response
+from services.list_views import ACTIVITY_ROWS
 from models.activity import Activity
 from models.user import User
 from schemas.activity import ActivityCreate, ActivityResponse, DataChangePayload, PaginatedActivityResponse
 from apis.user import get_current_user
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(time_budget("activities"))])
+
+# 游标分页的排序键
+CURSOR_KEYS = ("created_at", "id")
+CURSOR_COLUMNS = (Activity.created_at, Activity.id)
+
+def _filter_activities(query, user_name, department, type, days):
+    """列表与导出共用的筛选条件"""
+    if user_name:
+        query = query.where(Activity.user_name.ilike(f"%{user_name}%"))
+    if department:
+        query = query.where(Activity.department == department)
+    if type:
+        query = query.where(Activity.type.ilike(f"%{type}%"))
+    if days:
+        date_from = datetime.now() - timedelta(days=days)
+        query = query.where(Activity.created_at >= date_from)
+    return query
 
 @router.get("/activities/", response_model=PaginatedActivityResponse)
-def get_activities(
+async def get_activities(
+    request: Request,
     skip: int = 0,
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=200),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     user_name: Optional[str] = None,
     department: Optional[str] = None,
     type: Optional[str] = None,
     days: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取活动记录列表
     
     可以通过用户名、部门、类型和时间范围进行筛选
-    """
-    query = db.query(Activity)
-    
-    # 筛选条件
-    if user_name:
-        query = query.filter(Activity.user_name.ilike(f"%{user_name}%"))
-    if department:
-        query = query.filter(Activity.department == department)
-    if type:
-        query = query.filter(Activity.type.ilike(f"%{type}%"))
-    if days:
-        date_from = datetime.now() - timedelta(days=days)
-        query = query.filter(Activity.created_at >= date_from)
-    
-    # 获取总数
-    total = query.count()
-    
-    # 排序：最新的在前面
-    query = query.order_by(Activity.created_at.desc())
-    
-    # 分页
-    activities = query.offset(skip).limit(limit).all()
     
-    # 转换为响应格式
-    activity_responses = [activity.to_dict() for activity in activities]
-    
-    return PaginatedActivityResponse(
-        total=total,
-        items=activity_responses
-    )
+    按 (created_at, id) 游标分页：翻页时传入上一页返回的 next_cursor（传 cursor 时忽略 skip）。
+    total 默认为估算值（total_is_estimate=true），include_total=true 时返回精确总数。
+    活动表未变化时按 ETag 返回 304；响应中的相对时间（"x 分钟前"）按分钟变化，ETag 也随分钟更新。
+    """
+    async def load():
+        # 只读列表：只取需要的列，不构造 ORM 实例
+        query = _filter_activities(ACTIVITY_ROWS.select(), user_name, department, type, days)
+        
+        # 获取总数
+        if include_total:
+            total = await exact_count(db, query)
+        else:
+            total = await estimate_count(db, query)
+        
+        # 排序：最新的在前面
+        page = query.order_by(Activity.created_at.desc(), Activity.id.desc())
+        
+        # 分页：多取一行判断是否有下一页
+        if cursor:
+            after = decode_cursor(cursor, CURSOR_KEYS, CURSOR_COLUMNS)
+            page = page.where(keyset_before(CURSOR_COLUMNS, [after["created_at"], after["id"]]))
+        elif skip:
+            page = page.offset(skip)
+        # 按 Core 语句在连接上执行，跳过 ORM 结果加载
+        conn = await db.connection()
+        activities = (await conn.execute(page.limit(limit + 1))).all()
+        
+        # 转换为响应格式：ActivityRow 的字段与 ActivityResponse 一致，无需再经 pydantic 校验
+        return {
+            "total": total,
+            "items": ACTIVITY_ROWS.to_dtos(activities[:limit]),
+            "next_cursor": next_cursor(activities, limit, CURSOR_KEYS),
+            "total_is_estimate": not include_total,
+        }
+    
+    key = f"{datetime.now():%Y-%m-%d %H:%M}|{sorted(request.query_params.multi_items())}"
+    return await conditional_response(request, ("activities",), key, load)
+
+@router.get("/activities/export", summary="导出活动记录")
+async def export_activities(
+    format: ExportFormat = "csv",
+    user_name: Optional[str] = None,
+    department: Optional[str] = None,
+    type: Optional[str] = None,
+    days: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """按与列表相同的筛选条件流式导出（CSV / XLSX / NDJSON），最新的在前"""
+    query = _filter_activities(ACTIVITY_EXPORT.select(), user_name, department, type, days)
+    query = query.order_by(Activity.created_at.desc(), Activity.id.desc())
+    filters = {"用户": user_name, "部门": department, "类型": type, "天数": days}
+    details = ", ".join(f"{name}: {value}" for name, value in filters.items() if value)
+    return export_response(ACTIVITY_EXPORT, query, format, current_user, details)
 
 @router.post("/activities/", response_model=ActivityResponse)
 def create_activity(
@@ -94,6 +146,8 @@ def create_activity(
     db.add(db_activity)
     db.commit()
     db.refresh(db_activity)
+    # 同步接口运行在线程池中，回到事件循环推进版本
+    anyio.from_thread.run(table_versions.bump, "activities")
     
     return db_activity.to_dict()
 
@@ -151,6 +205,8 @@ def record_data_change(
     db.add(db_activity)
     db.commit()
     db.refresh(db_activity)
+    # 同步接口运行在线程池中，回到事件循环推进版本
+    anyio.from_thread.run(table_versions.bump, "activities")
     
     return db_activity.to_dict()
 
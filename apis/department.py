@@ -5,11 +5,13 @@ import logging
 from schemas import department as department_schema
 from services import department as department_service
 from db.database import get_db
+from db.statement_timeout import time_budget
 
 router = APIRouter(
     prefix="/departments",
     tags=["departments"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("departments"))],
 )
 
 # 设置日志
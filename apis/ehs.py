@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from db.database import get_db
+from db.database import get_async_db, AsyncSessionLocal
+from db.statement_timeout import time_budget
+from core.redis import cache, CacheKey
+from core.responses import conditional_response
+from core.versions import table_versions
 from models import ehs as ehs_model
 from schemas import ehs as ehs_schema
+from schemas.imports import ImportSummary
 from datetime import datetime
 from apis.user import get_current_user
 from models.user import User
 from services.activity_service import ActivityService
+from services.bulk_upsert import bulk_upsert
 import logging
 
 # 配置日志
@@ -18,72 +25,54 @@ router = APIRouter(
     prefix="/ehs",
     tags=["EHS"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("ehs"))],
 )
 
+async def _read_year(request: Request, year: int):
+    """读取某年的EHS数据（经缓存，数据未变化时返回 304）"""
+    async def load():
+        async with AsyncSessionLocal() as db:
+            ehs_data = (await db.execute(select(ehs_model.Ehs).where(
+                ehs_model.Ehs.year == year,
+            ))).scalars().all()
+            return [ehs_schema.Ehs.model_validate(item, from_attributes=True).model_dump(mode="json") for item in ehs_data]
+
+    key = CacheKey("ehs", str(year), "lwd")
+    return await conditional_response(request, ("ehs",), key.render(cache.prefix), lambda: cache.get_or_load(key, load))
+
 # 获取所有EHS数据
 @router.get("/", response_model=List[ehs_schema.Ehs])
-async def get_ehs(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    year = datetime.now().year
-    ehs_data = db.query(ehs_model.Ehs).filter(
-        ehs_model.Ehs.year == year,
-    ).all()
-    return ehs_data
+async def get_ehs(request: Request, current_user: User = Depends(get_current_user)):
+    return await _read_year(request, datetime.now().year)
 
 # 获取LWD数据
 @router.get("/lwd", response_model=List[ehs_schema.Ehs])
-async def get_lwd_data(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    year = datetime.now().year
-    ehs_data = db.query(ehs_model.Ehs).filter(
-        ehs_model.Ehs.year == year,
-    ).all()
-    return ehs_data
+async def get_lwd_data(request: Request, current_user: User = Depends(get_current_user)):
+    return await _read_year(request, datetime.now().year)
 
 # 更新LWD数据
 @router.put("/lwd", summary="更新LWD数据")
-async def update_lwd_data(ehs_entries: List[ehs_schema.EhsUpdate], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    updated_entries = []
-    created_entries = []
-    
+async def update_lwd_data(ehs_entries: List[ehs_schema.EhsUpdate], db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 确保年份为当前年份
     current_year = datetime.now().year
+    result = await bulk_upsert(
+        db, ehs_model.Ehs, [{**entry.dict(), "year": current_year} for entry in ehs_entries],
+        key=("year", "week"),
+        fields=("lwd",),
+    )
+    if not result.changed:
+        return {"message": "LWD数据更新成功"}
+    updated_entries = [{"before": before, "after": after} for before, after in result.updated]
+    created_entries = result.created
     
-    for entry in ehs_entries:
-        # 确保年份为当前年份
-        entry_with_year = entry.dict()
-        entry_with_year["year"] = current_year
-        
-        db_entry = db.query(ehs_model.Ehs).filter(
-            ehs_model.Ehs.week == entry.week,
-            ehs_model.Ehs.year == current_year
-        ).first()
-        
-        if db_entry:
-            # 保存更新前的数据
-            before_data = {
-                "id": db_entry.id,
-                "week": db_entry.week,
-                "year": db_entry.year,
-                "lwd": db_entry.lwd
-            }
-            
-            # 更新数据
-            db_entry.lwd = entry.lwd
-            
-            updated_entries.append({
-                "before": before_data,
-                "after": entry_with_year
-            })
-        else:
-            new_entry = ehs_model.Ehs(**entry_with_year)
-            db.add(new_entry)
-            created_entries.append(entry_with_year)
-    
-    db.commit()
+    await db.commit()
+    await cache.invalidate("ehs", str(current_year))
+    await table_versions.bump("ehs")
     
     # 记录更新活动
     if updated_entries:
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="EHS",
                 action_type="UPDATE",
@@ -101,8 +90,7 @@ async def update_lwd_data(ehs_entries: List[ehs_schema.EhsUpdate], db: Session =
     # 记录创建活动
     if created_entries:
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="EHS",
                 action_type="CREATE",
@@ -118,46 +106,43 @@ async def update_lwd_data(ehs_entries: List[ehs_schema.EhsUpdate], db: Session =
     
     return {"message": "LWD数据更新成功"}
 
+# 导入LWD数据
+@router.post("/lwd/import", response_model=ImportSummary, summary="导入LWD数据（CSV / XLSX）")
+async def import_lwd_data(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    """列: 年、周、LWD；已有的周按值更新。有任何行错误时不导入"""
+    # 导入解析只有导入接口用到，首次导入时再加载
+    from services.imports import LwdImport, record_import, run_import
+    spec = LwdImport()
+    result = await run_import(db, spec, file)
+    if result.changed:
+        for year, _ in result.periods:
+            await cache.invalidate("ehs", str(year))
+        await table_versions.bump("ehs")
+    await record_import(current_user, spec, result)
+    return result
+
 # 更新EHS数据
 @router.put("/", summary="更新EHS数据")
-async def update_ehs_entries(ehs_entries: List[ehs_schema.EhsUpdate], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    updated_entries = []
-    created_entries = []
-    
-    for entry in ehs_entries:
-        db_entry = db.query(ehs_model.Ehs).filter(
-            ehs_model.Ehs.week == entry.week,
-            ehs_model.Ehs.year == entry.year
-        ).first()
-        
-        if db_entry:
-            # 保存更新前的数据
-            before_data = {
-                "id": db_entry.id,
-                "week": db_entry.week,
-                "year": db_entry.year,
-                "lwd": db_entry.lwd
-            }
-            
-            # 更新数据
-            db_entry.lwd = entry.lwd
-            
-            updated_entries.append({
-                "before": before_data,
-                "after": entry.dict()
-            })
-        else:
-            new_entry = ehs_model.Ehs(**entry.dict())
-            db.add(new_entry)
-            created_entries.append(entry.dict())
+async def update_ehs_entries(ehs_entries: List[ehs_schema.EhsUpdate], db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    result = await bulk_upsert(
+        db, ehs_model.Ehs, [entry.dict() for entry in ehs_entries],
+        key=("year", "week"),
+        fields=("lwd",),
+    )
+    if not result.changed:
+        return {"message": "EHS数据更新成功"}
+    updated_entries = [{"before": before, "after": after} for before, after in result.updated]
+    created_entries = result.created
     
-    db.commit()
+    await db.commit()
+    for year in {entry.year for entry in ehs_entries}:
+        await cache.invalidate("ehs", str(year))
+    await table_versions.bump("ehs")
     
     # 记录更新活动
     if updated_entries:
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="EHS",
                 action_type="UPDATE",
@@ -175,8 +160,7 @@ async def update_ehs_entries(ehs_entries: List[ehs_schema.EhsUpdate], db: Sessio
     # 记录创建活动
     if created_entries:
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="EHS",
                 action_type="CREATE",
@@ -1,24 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from db.session import get_db
+from db.database import get_async_db, AsyncSessionLocal
+from db.statement_timeout import time_budget
+from core.redis import cache, CacheKey
+from core.responses import conditional_response
+from core.versions import table_versions
 from models.event import Event
 from models.user import User
 from schemas.event import EventCreate, Event as EventSchema
 from apis.user import get_current_user
 from services.activity_service import ActivityService
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(time_budget("events"))])
 
 @router.get("/events/", response_model=List[EventSchema])
-def get_events(
+async def get_events(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     department: Optional[str] = None,
     upcoming: Optional[bool] = False,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -26,29 +31,35 @@ def get_events(
     
     可以通过部门和是否即将到来进行筛选
     """
-    query = db.query(Event)
-    
-    # 筛选条件
-    if department:
-        query = query.filter(Event.department == department)
-    
-    # 如果需要获取即将到来的事件
-    if upcoming:
-        today = datetime.now().date()
-        query = query.filter(Event.start_time >= today)
-    
-    # 按开始时间排序
-    query = query.order_by(Event.start_time)
-    
-    # 分页
-    events = query.offset(skip).limit(limit).all()
-    
-    return events
+    today = datetime.now().date()
+
+    async def load():
+        query = select(Event)
+        
+        # 筛选条件
+        if department:
+            query = query.where(Event.department == department)
+        
+        # 如果需要获取即将到来的事件
+        if upcoming:
+            query = query.where(Event.start_time >= today)
+        
+        # 按开始时间排序
+        query = query.order_by(Event.start_time)
+        
+        # 分页
+        async with AsyncSessionLocal() as db:
+            events = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
+            return [EventSchema.model_validate(event, from_attributes=True).model_dump(mode="json") for event in events]
+    
+    params = f"{department or ''}|{today if upcoming else ''}|{skip}|{limit}"
+    key = CacheKey("events", "all", params)
+    return await conditional_response(request, ("events",), key.render(cache.prefix), lambda: cache.get_or_load(key, load))
 
 @router.post("/events/", response_model=EventSchema)
-def create_event(
+async def create_event(
     event: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -62,12 +73,13 @@ def create_event(
     )
     
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
+    await db.refresh(db_event)
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="EVENT",
         action_type="CREATE",
@@ -81,31 +93,31 @@ def create_event(
     return db_event
 
 @router.get("/events/{event_id}", response_model=EventSchema)
-def get_event(
+async def get_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取指定ID的事件
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     return event
 
 @router.put("/events/{event_id}", response_model=EventSchema)
-def update_event(
+async def update_event(
     event_id: int,
     event_update: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     更新指定ID的事件
     """
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    db_event = await db.get(Event, event_id)
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -124,12 +136,13 @@ def update_event(
     db_event.start_time = event_update.start_time
     db_event.end_time = event_update.end_time
     
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
+    await db.refresh(db_event)
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="EVENT",
         action_type="UPDATE",
@@ -150,15 +163,15 @@ def update_event(
     return db_event
 
 @router.delete("/events/{event_id}")
-def delete_event(
+async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     删除指定ID的事件
     """
-    db_event = db.query(Event).filter(Event.id == event_id).first()
+    db_event = await db.get(Event, event_id)
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -174,12 +187,13 @@ def delete_event(
     event_name = db_event.name
     event_department = db_event.department
     
-    db.delete(db_event)
-    db.commit()
+    await db.delete(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="EVENT",
         action_type="DELETE",
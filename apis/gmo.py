@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from db.database import get_db
+from db.database import get_async_db
+from core.redis import cache
+from core.versions import table_versions
 from models import event as event_model
 from schemas import event as event_schema
 from apis.user import get_current_user
@@ -20,21 +23,22 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[event_schema.Event])
-async def get_events(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    events = db.query(event_model.Event).all()
+async def get_events(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    events = (await db.execute(select(event_model.Event))).scalars().all()
     return events
 
 @router.post("/", response_model=event_schema.Event, status_code=status.HTTP_201_CREATED)
-async def create_event(event: event_schema.EventCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_event(event: event_schema.EventCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     db_event = event_model.Event(**event.dict())
     db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
+    await db.refresh(db_event)
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="GMO",
             action_type="CREATE",
@@ -51,8 +55,8 @@ async def create_event(event: event_schema.EventCreate, db: Session = Depends(ge
     return db_event
 
 @router.put("/{event_id}", response_model=event_schema.Event)
-async def update_event(event_id: int, event: event_schema.EventCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_event = db.query(event_model.Event).filter(event_model.Event.id == event_id).first()
+async def update_event(event_id: int, event: event_schema.EventCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    db_event = await db.get(event_model.Event, event_id)
     if db_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -69,13 +73,14 @@ async def update_event(event_id: int, event: event_schema.EventCreate, db: Sessi
     for key, value in event.dict().items():
         setattr(db_event, key, value)
     
-    db.commit()
-    db.refresh(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
+    await db.refresh(db_event)
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="GMO",
             action_type="UPDATE",
@@ -93,8 +98,8 @@ async def update_event(event_id: int, event: event_schema.EventCreate, db: Sessi
     return db_event
 
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_event(event_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_event = db.query(event_model.Event).filter(event_model.Event.id == event_id).first()
+async def delete_event(event_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    db_event = await db.get(event_model.Event, event_id)
     if db_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -108,13 +113,14 @@ async def delete_event(event_id: int, db: Session = Depends(get_db), current_use
     }
     
     # 删除事件
-    db.delete(db_event)
-    db.commit()
+    await db.delete(db_event)
+    await db.commit()
+    await cache.invalidate("events")
+    await table_versions.bump("events")
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="GMO",
             action_type="DELETE",
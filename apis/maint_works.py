@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
 from datetime import date
-from db.database import get_db
+from db.database import get_async_db
+from db.statement_timeout import time_budget
 from models.maint import MaintDaily, MaintWeekly
 from schemas.maint_work import MaintDailyCreate, MaintDailyUpdate, MaintDailyResponse
 from schemas.maint_work import MaintWeeklyCreate, MaintWeeklyUpdate, MaintWeeklyResponse
 from apis.user import get_current_user
 from models.user import User
 from services.activity_service import ActivityService
+from core.pagination import keyset_page
+from core.responses import validated_response
+from schemas.pagination import Page
+from services.exports import MAINT_DAILY_EXPORT, MAINT_WEEKLY_EXPORT, ExportFormat, export_response
+from services.list_views import MAINT_DAILY_ROWS, MAINT_WEEKLY_ROWS
 import logging
 
 # 配置日志
@@ -19,46 +26,90 @@ router = APIRouter(
     prefix="/maint",
     tags=["维修工作"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("maint"))],
 )
 
-@router.get("/daily", response_model=List[MaintDailyResponse], summary="获取所有日维护任务")
+# 每页默认/最大条数
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+# 游标分页的排序键（DTO 字段名），按日期排序、id 作为次排序键
+DAILY_CURSOR_KEYS = ("date", "id")
+WEEKLY_CURSOR_KEYS = ("date_time", "id")
+
+def _filter_daily(query, user_id, start_date, end_date, solved, type):
+    """日任务列表与导出共用的筛选条件"""
+    if user_id:
+        query = query.where(MaintDaily.user_id == user_id)
+    if start_date:
+        query = query.where(MaintDaily.date >= start_date)
+    if end_date:
+        query = query.where(MaintDaily.date <= end_date)
+    if solved is not None:
+        solved_flag = 1 if solved else 0
+        query = query.where(MaintDaily.solved_flag == solved_flag)
+    if type is not None:
+        query = query.where(MaintDaily.type == type)
+    return query
+
+def _export_details(**filters) -> str:
+    return ", ".join(f"{name}: {value}" for name, value in filters.items() if value is not None)
+
+@router.get("/daily", response_model=Page[MaintDailyResponse], summary="获取所有日维护任务")
 async def get_all_daily_tasks(
     user_id: Optional[int] = None, 
     start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     solved: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    type: Optional[int] = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取维护日任务列表，旨在日维护任务未完成任务显示在本周维修计划内
     - 按用户ID筛选、开始之后未完成的本周任务接口
+    - 可按日期范围 [start_date, end_date]、维护类型筛选
+    - 按日期排序（order），游标分页：翻页时传入上一页返回的 next_cursor
+    - include_total=true 时返回精确总数
     """
-    query = db.query(MaintDaily)
-    # 应用筛选条件
-    if user_id:
-        query = query.filter(MaintDaily.user_id == user_id)
-    if start_date:
-        query = query.filter(MaintDaily.date >= start_date)
-    if solved is not None:
-        solved_flag = 1 if solved else 0
-        query = query.filter(MaintDaily.solved_flag == solved_flag)
-    
-    # 按日期升序排序
-    daily_tasks = query.order_by(MaintDaily.date.asc()).all()
-    return [MaintDailyResponse.model_validate_from_orm(task) for task in daily_tasks]
+    query = _filter_daily(MAINT_DAILY_ROWS.select(), user_id, start_date, end_date, solved, type)
+    page = await keyset_page(
+        db, MAINT_DAILY_ROWS, query, [MaintDaily.date, MaintDaily.id], DAILY_CURSOR_KEYS,
+        limit=limit, cursor=cursor, descending=order == "desc", include_total=include_total,
+    )
+    return validated_response(page)
+
+@router.get("/daily/export", summary="导出日维护任务")
+async def export_daily_tasks(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    solved: Optional[bool] = None,
+    type: Optional[int] = None,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_user)
+):
+    """按与列表相同的筛选条件流式导出（CSV / XLSX / NDJSON），按日期排序"""
+    query = _filter_daily(MAINT_DAILY_EXPORT.select(), user_id, start_date, end_date, solved, type)
+    query = query.order_by(MaintDaily.date, MaintDaily.id)
+    details = _export_details(user_id=user_id, start_date=start_date, end_date=end_date, solved=solved, type=type)
+    return export_response(MAINT_DAILY_EXPORT, query, format, current_user, details)
 
 @router.get("/daily/{task_id}", response_model=MaintDailyResponse, summary="获取单个日维护任务")
-async def get_daily_task(task_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_daily_task(task_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """旨在日历选取日期时显示具体工作"""
-    query = db.query(MaintDaily)
+    query = select(MaintDaily)
     # 具体日期筛选
     if task_id:
-        query = query.filter(MaintDaily.id == task_id)
-    daily_tasks = query.order_by(MaintDaily.date).all()
+        query = query.where(MaintDaily.id == task_id)
+    daily_tasks = (await db.execute(query.order_by(MaintDaily.date))).scalars().all()
     return MaintDailyResponse.model_validate_from_orm(daily_tasks[0])
 
 @router.post("/daily", response_model=MaintDailyResponse, summary="创建日维护任务")
-async def create_daily_task(task: MaintDailyCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_daily_task(task: MaintDailyCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """创建新的日维护任务"""
     db_task = MaintDaily(
         date=task.date,
@@ -72,13 +123,12 @@ async def create_daily_task(task: MaintDailyCreate, db: Session = Depends(get_db
     
     # 添加到数据库
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="MAINT",
             action_type="CREATE",
@@ -95,10 +145,10 @@ async def create_daily_task(task: MaintDailyCreate, db: Session = Depends(get_db
     return MaintDailyResponse.model_validate_from_orm(db_task)
 
 @router.put("/daily/{task_id}", response_model=MaintDailyResponse, summary="更新日维护任务")
-async def update_daily_task(task_id: int, task: MaintDailyUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_daily_task(task_id: int, task: MaintDailyUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """更新现有的日维护任务"""
     # 查找任务
-    db_task = db.query(MaintDaily).filter(MaintDaily.id == task_id).first()
+    db_task = await db.get(MaintDaily, task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -128,13 +178,12 @@ async def update_daily_task(task_id: int, task: MaintDailyUpdate, db: Session =
     for key, value in update_data.items():
         setattr(db_task, key, value)
     
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="MAINT",
             action_type="UPDATE",
@@ -152,9 +201,9 @@ async def update_daily_task(task_id: int, task: MaintDailyUpdate, db: Session =
     return MaintDailyResponse.model_validate_from_orm(db_task)
 
 @router.delete("/daily/{task_id}", status_code=status.HTTP_204_NO_CONTENT, summary="删除日维护任务")
-async def delete_daily_task(task_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def delete_daily_task(task_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """删除日维护任务"""
-    db_task = db.query(MaintDaily).filter(MaintDaily.id == task_id).first()
+    db_task = await db.get(MaintDaily, task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -173,13 +222,12 @@ async def delete_daily_task(task_id: int, db: Session = Depends(get_db), current
         "solved": db_task.solved_flag == 1
     }
     
-    db.delete(db_task)
-    db.commit()
+    await db.delete(db_task)
+    await db.commit()
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="MAINT",
             action_type="DELETE",
@@ -195,30 +243,71 @@ async def delete_daily_task(task_id: int, db: Session = Depends(get_db), current
     
     return None
 
-@router.get("/weekly", response_model=List[MaintWeeklyResponse], summary="获取所有周维护任务")
+def _weekly_query(user_id, start_date, end_date, solved, degree, query=None):
+    """周任务与问题记录（列表、导出）共用的筛选条件"""
+    if query is None:
+        query = MAINT_WEEKLY_ROWS.select()
+    if user_id:
+        query = query.where(MaintWeekly.user_id == user_id)
+    if start_date:
+        query = query.where(MaintWeekly.DateTime >= start_date)
+    if end_date:
+        query = query.where(MaintWeekly.DateTime <= end_date)
+    if solved is not None:
+        solved_flag = 1 if solved else 0
+        query = query.where(MaintWeekly.solved_flag == solved_flag)
+    if degree:
+        query = query.where(MaintWeekly.degree == degree)
+    return query
+
+@router.get("/weekly", response_model=Page[MaintWeeklyResponse], summary="获取所有周维护任务")
 async def get_all_weekly_tasks(
     user_id: Optional[int] = None, 
-    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    solved: Optional[bool] = None,
+    degree: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取维护周任务列表：
     - 可按用户ID筛选
-    - 可按开始日期筛选
-    - 可按解决状态筛选
+    - 可按日期范围 [start_date, end_date] 筛选
+    - 可按解决状态、严重程度筛选
+    - 按日期排序（order），游标分页；include_total=true 时返回精确总数
     """
-    query = db.query(MaintWeekly)
-    # 应用筛选条件
-    if user_id:
-        query = query.filter(MaintWeekly.user_id == user_id)    
-    # 按日期升序排序
-    weekly_tasks = query.order_by(MaintWeekly.DateTime.asc()).all()
-    return [MaintWeeklyResponse.model_validate_from_orm(task) for task in weekly_tasks]
+    query = _weekly_query(user_id, start_date, end_date, solved, degree)
+    page = await keyset_page(
+        db, MAINT_WEEKLY_ROWS, query, [MaintWeekly.DateTime, MaintWeekly.id], WEEKLY_CURSOR_KEYS,
+        limit=limit, cursor=cursor, descending=order == "desc", include_total=include_total,
+    )
+    return validated_response(page)
+
+@router.get("/weekly/export", summary="导出周维护任务与问题记录")
+async def export_weekly_tasks(
+    user_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    solved: Optional[bool] = None,
+    degree: Optional[str] = None,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_user)
+):
+    """按与列表相同的筛选条件流式导出（CSV / XLSX / NDJSON），按日期排序"""
+    query = _weekly_query(user_id, start_date, end_date, solved, degree, MAINT_WEEKLY_EXPORT.select())
+    query = query.order_by(MaintWeekly.DateTime, MaintWeekly.id)
+    details = _export_details(user_id=user_id, start_date=start_date, end_date=end_date, solved=solved, degree=degree)
+    return export_response(MAINT_WEEKLY_EXPORT, query, format, current_user, details)
 
 @router.get("/weekly/{task_id}", response_model=MaintWeeklyResponse, summary="获取单个周任务")
-async def get_weekly_task(task_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_weekly_task(task_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """根据ID获取特定的周任务"""
-    task = db.query(MaintWeekly).filter(MaintWeekly.id == task_id).first()
+    task = await db.get(MaintWeekly, task_id)
     if task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -227,7 +316,7 @@ async def get_weekly_task(task_id: int, db: Session = Depends(get_db), current_u
     return MaintWeeklyResponse.model_validate_from_orm(task)
 
 @router.post("/weekly", response_model=MaintWeeklyResponse, summary="创建周任务")
-async def create_weekly_task(task: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_weekly_task(task: dict, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """创建新的周任务或问题记录"""
     try:
         # 直接从字典中获取字段
@@ -243,13 +332,12 @@ async def create_weekly_task(task: dict, db: Session = Depends(get_db), current_
         
         # 添加到数据库
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
         
         # 记录活动
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="MAINT",
                 action_type="CREATE",
@@ -265,17 +353,17 @@ async def create_weekly_task(task: dict, db: Session = Depends(get_db), current_
         
         return MaintWeeklyResponse.model_validate_from_orm(db_task)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"创建失败: {str(e)}"
         )
 
 @router.put("/weekly/{task_id}", response_model=MaintWeeklyResponse, summary="更新周任务")
-async def update_weekly_task(task_id: int, task: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_weekly_task(task_id: int, task: dict, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """更新现有的周任务或问题记录"""
     # 查找任务
-    db_task = db.query(MaintWeekly).filter(MaintWeekly.id == task_id).first()
+    db_task = await db.get(MaintWeekly, task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -320,13 +408,12 @@ async def update_weekly_task(task_id: int, task: dict, db: Session = Depends(get
         if "solved_flag" in task:
             db_task.solved_flag = task["solved_flag"]
         
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
         
         # 记录活动
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="MAINT",
                 action_type="UPDATE",
@@ -343,16 +430,16 @@ async def update_weekly_task(task_id: int, task: dict, db: Session = Depends(get
         
         return MaintWeeklyResponse.model_validate_from_orm(db_task)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"更新失败: {str(e)}"
         )
 
 @router.delete("/weekly/{task_id}", status_code=status.HTTP_204_NO_CONTENT, summary="删除周任务")
-async def delete_weekly_task(task_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def delete_weekly_task(task_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """删除周任务"""
-    db_task = db.query(MaintWeekly).filter(MaintWeekly.id == task_id).first()
+    db_task = await db.get(MaintWeekly, task_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -371,13 +458,12 @@ async def delete_weekly_task(task_id: int, db: Session = Depends(get_db), curren
         "solved_flag": db_task.solved_flag
     }
     
-    db.delete(db_task)
-    db.commit()
+    await db.delete(db_task)
+    await db.commit()
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="MAINT",
             action_type="DELETE",
@@ -394,7 +480,7 @@ async def delete_weekly_task(task_id: int, db: Session = Depends(get_db), curren
     return None
 
 @router.post("/issues", response_model=MaintWeeklyResponse, summary="创建问题记录")
-async def create_issue(task: MaintWeeklyCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_issue(task: MaintWeeklyCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """创建新的问题记录"""
     try:
         db_task = MaintWeekly(
@@ -408,13 +494,12 @@ async def create_issue(task: MaintWeeklyCreate, db: Session = Depends(get_db), c
         )
         
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
         
         # 记录活动
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="MAINT",
                 action_type="CREATE",
@@ -430,16 +515,16 @@ async def create_issue(task: MaintWeeklyCreate, db: Session = Depends(get_db), c
         
         return MaintWeeklyResponse.model_validate_from_orm(db_task)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"创建问题记录失败: {str(e)}"
         )
 
 @router.put("/issues/{issue_id}", response_model=MaintWeeklyResponse, summary="更新问题记录")
-async def update_issue(issue_id: int, task: MaintWeeklyUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_issue(issue_id: int, task: MaintWeeklyUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """更新现有的问题记录"""
-    db_task = db.query(MaintWeekly).filter(MaintWeekly.id == issue_id).first()
+    db_task = await db.get(MaintWeekly, issue_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -470,13 +555,12 @@ async def update_issue(issue_id: int, task: MaintWeeklyUpdate, db: Session = Dep
         for key, value in update_data.items():
             setattr(db_task, key, value)
         
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
         
         # 记录活动
         try:
-            ActivityService.record_data_change(
-                db=db,
+            await ActivityService.record_data_change(
                 user=current_user,
                 module="MAINT",
                 action_type="UPDATE",
@@ -493,16 +577,16 @@ async def update_issue(issue_id: int, task: MaintWeeklyUpdate, db: Session = Dep
         
         return MaintWeeklyResponse.model_validate_from_orm(db_task)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"更新问题记录失败: {str(e)}"
         )
 
 @router.delete("/issues/{issue_id}", status_code=status.HTTP_204_NO_CONTENT, summary="删除问题记录")
-async def delete_issue(issue_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def delete_issue(issue_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """删除问题记录"""
-    db_task = db.query(MaintWeekly).filter(MaintWeekly.id == issue_id).first()
+    db_task = await db.get(MaintWeekly, issue_id)
     if db_task is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -521,13 +605,12 @@ async def delete_issue(issue_id: int, db: Session = Depends(get_db), current_use
         "solved": db_task.solved_flag == 1
     }
     
-    db.delete(db_task)
-    db.commit()
+    await db.delete(db_task)
+    await db.commit()
     
     # 记录活动
     try:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="MAINT",
             action_type="DELETE",
@@ -543,34 +626,37 @@ async def delete_issue(issue_id: int, db: Session = Depends(get_db), current_use
     
     return None
 
-@router.get("/issues", response_model=List[MaintWeeklyResponse], summary="获取所有问题记录")
+@router.get("/issues", response_model=Page[MaintWeeklyResponse], summary="获取所有问题记录")
 async def get_all_issues(
     user_id: Optional[int] = None,
     solved: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    degree: Optional[str] = None,
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取所有问题记录：
     - 可按用户ID筛选
-    - 可按解决状态筛选
+    - 可按解决状态、严重程度、日期范围 [start_date, end_date] 筛选
+    - 默认按日期降序（最新在前），游标分页；include_total=true 时返回精确总数
     """
-    query = db.query(MaintWeekly)
-    # 应用筛选条件
-    if user_id:
-        query = query.filter(MaintWeekly.user_id == user_id)
-    if solved is not None:
-        solved_flag = 1 if solved else 0
-        query = query.filter(MaintWeekly.solved_flag == solved_flag)
-    
-    # 按日期降序排序
-    issues = query.order_by(MaintWeekly.DateTime.desc()).all()
-    return [MaintWeeklyResponse.model_validate_from_orm(issue) for issue in issues]
+    query = _weekly_query(user_id, start_date, end_date, solved, degree)
+    page = await keyset_page(
+        db, MAINT_WEEKLY_ROWS, query, [MaintWeekly.DateTime, MaintWeekly.id], WEEKLY_CURSOR_KEYS,
+        limit=limit, cursor=cursor, descending=order == "desc", include_total=include_total,
+    )
+    return validated_response(page)
 
 @router.get("/issues/{issue_id}", response_model=MaintWeeklyResponse, summary="获取单个问题记录")
-async def get_issue(issue_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_issue(issue_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """根据ID获取特定的问题记录"""
-    issue = db.query(MaintWeekly).filter(MaintWeekly.id == issue_id).first()
+    issue = await db.get(MaintWeekly, issue_id)
     if issue is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, 
@@ -0,0 +1,91 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from db.database import get_pool_status
+from core import compression
+from core.admission import admission
+from core.metrics import prometheus_header, prometheus_sample
+from core.request_metrics import request_metrics
+from core.redis import cache
+from core.versions import table_versions
+from services.auth_cache import principal_cache
+from services.activity_writer import activity_writer
+
+router = APIRouter(
+    prefix="/monitor",
+    tags=["monitor"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Prometheus 抓取地址约定为 /metrics，不带 /monitor 前缀
+metrics_router = APIRouter(tags=["monitor"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _pool_metrics() -> str:
+    lines = []
+    pools = get_pool_status()
+    for name, field, kind, help_text in (
+        ("datalink_db_pool_checked_out", "checked_out", "gauge", "已借出的数据库连接数"),
+        ("datalink_db_pool_idle", "idle", "gauge", "空闲的数据库连接数"),
+        ("datalink_db_pool_timeouts_total", "timeouts", "counter", "获取数据库连接超时次数"),
+    ):
+        samples = [prometheus_sample(name, status[field], {"pool": pool})
+                   for pool, status in pools.items() if field in status]
+        if samples:
+            lines += prometheus_header(name, kind, help_text) + samples
+    return "\n".join(lines) + "\n" if lines else ""
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, summary="Prometheus 指标")
+async def get_metrics():
+    """按路由模板的请求数/耗时/响应大小、正在处理的请求数、准入控制计数，以及数据库连接池状态（Prometheus 文本格式）"""
+    return PlainTextResponse(
+        request_metrics.render() + admission.render() + _pool_metrics(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
+
+@router.get("/db-pool", summary="数据库连接池状态")
+async def get_db_pool_status():
+    """
+    返回同步/异步连接池的实时状态：
+    - checked_out / idle / overflow: 当前借出、空闲、溢出连接数
+    - wait_ms: 获取连接等待时间直方图（毫秒，累计分桶）
+    - timeouts / invalidated: 等待超时次数、失效（断开）连接次数
+    """
+    return get_pool_status()
+
+@router.get("/cache", summary="读缓存状态")
+async def get_cache_status():
+    """返回缓存后端类型、本地条目数以及命中/过期命中/未命中/失效计数"""
+    return cache.status()
+
+@router.get("/conditional-get", summary="条件 GET 状态")
+async def get_conditional_get_status():
+    """返回表版本推进次数、条件请求检查次数与其中返回 304 的次数"""
+    return table_versions.status()
+
+@router.get("/compression", summary="响应压缩状态")
+async def get_compression_status():
+    """返回压缩的响应数、流式压缩数、压缩前后字节数与节省的字节数"""
+    return compression.status()
+
+@router.get("/auth-cache", summary="认证缓存状态")
+async def get_auth_cache_status():
+    """返回已缓存的 token 数以及命中/未命中/淘汰/失效计数"""
+    return principal_cache.status()
+
+@router.get("/activity-writer", summary="活动日志写入器状态")
+async def get_activity_writer_status():
+    """
+    返回活动日志后台写入器状态：
+    - queue_depth: 队列中待写入条数
+    - dropped / failed: 队列满被丢弃、写库失败的条数
+    - flush_ms: 每批写入耗时直方图（毫秒）
+    """
+    return activity_writer.status()
+
+@router.get("/admission", summary="准入控制状态")
+async def get_admission_status():
+    """
+    返回各类请求（write / read / bulk）的并发上限、排队上限、正在处理与排队中的请求数、
+    获准与被拒绝（queue_full / timeout）次数，以及排队等待时间直方图（秒）
+    """
+    return admission.status()
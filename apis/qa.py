@@ -1,15 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from db.database import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from sqlalchemy import select, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from db.database import get_async_db, AsyncSessionLocal
+from db.statement_timeout import time_budget
+from core.redis import cache, CacheKey
+from core.responses import conditional_response
+from core.versions import table_versions
 from models.qa import Qa as qa_model,Qad as qad_model, QaKpi as qa_kpi_model, MonthlyTotal
-from schemas.qa import Qa as qa_schema, QaCreate, QaUpdate, QAResponse, MonthlyTotalCreate, MonthlyTotalResponse
+from schemas.qa import Qa as qa_schema, QaCreate, QaUpdate, QAResponse, MonthlyTotalCreate, MonthlyTotalResponse, QaSummary
 from schemas.qad import Qad as qad_schema, QadCreate, QadUpdate
 from schemas.qa_kpi import QaKpi as qa_kpi_schema, QaKpiCreate, QaKpiUpdate, QaKpiBulkUpdate
+from schemas.imports import ImportSummary
 from datetime import datetime
 from apis.user import get_current_user
 from models.user import User
 from services.activity_service import ActivityService
+from services.activity_writer import activity_writer
+from services.bulk_upsert import bulk_upsert
+from services.qa_summary import qa_summary
+from services.qa_rollup import refresh_rollup
+from services.exports import QA_EXPORT, ExportFormat, export_response
 from models.activity import Activity
 import logging
 
@@ -21,20 +33,42 @@ router = APIRouter(
     prefix="/qa",
     tags=["qa"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("qa"))],
 )
 
+async def _invalidate_summary(years) -> None:
+    """GP12 变更影响当年汇总及下一年的同比"""
+    for year in years:
+        await cache.invalidate("qa_summary", str(year))
+        await cache.invalidate("qa_summary", str(year + 1))
+
+def _period(year, month) -> str:
+    """缓存周期键，整型列的月份统一去掉前导零"""
+    month = str(month)
+    return f"{year}-{int(month) if month.isdigit() else month}"
+
 @router.post("/", response_model=qa_schema, status_code=status.HTTP_201_CREATED, summary="Create a new QA entry")
-async def create_qa(qa: QaCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_qa(qa: QaCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     # 创建QA记录
-    db_qa = qa_model(**qa.dict())
+    row = qa.to_row()
+    db_qa = qa_model(**row)
     db.add(db_qa)
-    db.commit()
-    db.refresh(db_qa)   
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="该生产线当天的GP12数据已存在")
+    # 同一事务中更新月度汇总
+    await refresh_rollup(db, [(row["line"], row["year"], row["month"])])
+    await db.commit()
+    await db.refresh(db_qa)   
+    await cache.invalidate("qa", _period(qa.year, qa.month))
+    await table_versions.bump("qa")
+    await _invalidate_summary({int(qa.year)})
     
     # 记录活动
     try:
-        activity = ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="CREATE",
@@ -44,67 +78,87 @@ async def create_qa(qa: QaCreate, db: Session = Depends(get_db), current_user: U
             after_data=qa.dict(),
             target="/quality"
         )
-        logger.info(f"数据变更记录成功: {activity.id} - {activity.title}")
     except Exception as e:
         logger.error(f"记录数据变更失败: {str(e)}")
     
     return db_qa
 
 @router.get("/", response_model=List[qa_schema], summary="Get QA entries by month")
-async def read_qas(month: str, db: Session = Depends(get_db)):
+async def read_qas(month: int, request: Request):
     year = datetime.now().year
-    qas = db.query(qa_model).filter(
-        qa_model.year == str(year),
-        qa_model.month == month
-    ).all()
-    return qas
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            qas = (await db.execute(select(qa_model).where(
+                qa_model.year == year,
+                qa_model.month == month
+            ))).scalars().all()
+            return [qa_schema.model_validate(item, from_attributes=True).model_dump(mode="json") for item in qas]
+
+    # 缓存中是已校验并转换好的数据；数据未变化时直接返回 304
+    key = CacheKey("qa", _period(year, month))
+    return await conditional_response(request, ("qa",), key.render(cache.prefix), lambda: cache.get_or_load(key, load))
+
+@router.get("/export", summary="导出GP12数据")
+async def export_qas(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    line: Optional[str] = None,
+    format: ExportFormat = "csv",
+    current_user: User = Depends(get_current_user)
+):
+    """按年（默认当年）、月、产线流式导出 GP12 数据（CSV / XLSX / NDJSON）"""
+    year = year or datetime.now().year
+    query = QA_EXPORT.select().where(qa_model.year == year)
+    if month:
+        query = query.where(qa_model.month == month)
+    if line:
+        query = query.where(qa_model.line == line)
+    # 与唯一约束 uq_qa_cell 的列顺序一致，按索引顺序读取
+    query = query.order_by(qa_model.year, qa_model.month, qa_model.line, qa_model.day, qa_model.scrapflag)
+    details = f"年份: {year}" + (f", 月份: {month}" if month else "") + (f", 产线: {line}" if line else "")
+    return export_response(QA_EXPORT, query, format, current_user, details)
+
+@router.post("/import", response_model=ImportSummary, summary="导入GP12数据（CSV / XLSX）")
+async def import_qas(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    """列: 产线、日期（或 年/月/日）、报废（可选）、数值；已有的格按值更新。有任何行错误时不导入"""
+    # 导入解析（CSV/XLSX）只有导入接口用到，首次导入时再加载，不拖慢启动
+    from services.imports import Gp12Import, record_import, run_import
+    spec = Gp12Import()
+    result = await run_import(db, spec, file)
+    if result.changed:
+        for year, month in result.periods:
+            await cache.invalidate("qa", _period(year, month))
+        await table_versions.bump("qa")
+        await _invalidate_summary({year for year, _ in result.periods})
+    await record_import(current_user, spec, result)
+    return result
 
 @router.put("/", summary="Update QA entries")
-async def update_qas(qas: List[QaUpdate], db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    updated_entries = []
-    created_entries = []
-    
-    for qa in qas:
-        db_qa = db.query(qa_model).filter(
-            qa_model.day == qa.day,
-            qa_model.month == qa.month,
-            qa_model.year == qa.year,
-            qa_model.line == qa.line,
-            qa_model.scrapflag == qa.scrapflag
-        ).first()
-        
-        if db_qa:
-            # 保存更新前的数据
-            before_data = {
-                "id": db_qa.id,
-                "day": db_qa.day,
-                "month": db_qa.month,
-                "year": db_qa.year,
-                "line": db_qa.line,
-                "value": db_qa.value,
-                "scrapflag": db_qa.scrapflag
-            }
-            
-            # 更新数据
-            for key, value in qa.dict().items():
-                setattr(db_qa, key, value)
-                
-            updated_entries.append({
-                "before": before_data,
-                "after": qa.dict()
-            })
-        else:
-            # 创建新记录
-            new_qa = qa_model(**qa.dict())
-            db.add(new_qa)
-            created_entries.append(qa.dict())
-    
-    db.commit()
+async def update_qas(qas: List[QaUpdate], db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    result = await bulk_upsert(
+        db, qa_model, [qa.to_row() for qa in qas],
+        key=("line", "year", "month", "day", "scrapflag"),
+        fields=("value",),
+    )
+    if not result.changed:
+        return {"message": "QA entries updated successfully"}
+    updated_entries = [{"before": before, "after": after} for before, after in result.updated]
+    created_entries = result.created
+    await refresh_rollup(db, [
+        (row["line"], row["year"], row["month"])
+        for row in [*created_entries, *(entry["after"] for entry in updated_entries)]
+    ])
+    
+    await db.commit()
+    for period in {_period(qa.year, qa.month) for qa in qas}:
+        await cache.invalidate("qa", period)
+    await table_versions.bump("qa")
+    await _invalidate_summary({int(qa.year) for qa in qas})
     
     # 记录更新活动
     if updated_entries:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="UPDATE",
@@ -118,8 +172,7 @@ async def update_qas(qas: List[QaUpdate], db: Session = Depends(get_db), current
     
     # 记录创建活动
     if created_entries:
-        ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="CREATE",
@@ -133,8 +186,8 @@ async def update_qas(qas: List[QaUpdate], db: Session = Depends(get_db), current
     return {"message": "QA entries updated successfully"}
 
 @router.delete("/{qa_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete a QA entry by ID")
-async def delete_qa(qa_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_qa = db.query(qa_model).filter(qa_model.id == qa_id).first()
+async def delete_qa(qa_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    db_qa = await db.get(qa_model, qa_id)
     if not db_qa:
         raise HTTPException(status_code=404, detail="QA entry not found")
     
@@ -150,12 +203,16 @@ async def delete_qa(qa_id: int, db: Session = Depends(get_db), current_user: Use
     }
     
     # 删除记录
-    db.delete(db_qa)
-    db.commit()
+    await db.delete(db_qa)
+    await db.flush()
+    await refresh_rollup(db, [(before_data["line"], before_data["year"], before_data["month"])])
+    await db.commit()
+    await cache.invalidate("qa", _period(before_data["year"], before_data["month"]))
+    await table_versions.bump("qa")
+    await _invalidate_summary({before_data["year"]})
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="DELETE",
@@ -171,16 +228,16 @@ async def delete_qa(qa_id: int, db: Session = Depends(get_db), current_user: Use
 # 以下是qad的相关端点
 
 @router.post("/qad/", response_model=qad_schema, status_code=status.HTTP_201_CREATED, summary="Create a new QAD entry")
-async def create_qad(qad: QadCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def create_qad(qad: QadCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     # 创建QAD记录
     db_qad = qad_model(**qad.dict())
     db.add(db_qad)
-    db.commit()
-    db.refresh(db_qad)
+    await db.commit()
+    await db.refresh(db_qad)
+    await cache.invalidate("qad", _period(qad.year, qad.month))
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="CREATE",
@@ -194,17 +251,22 @@ async def create_qad(qad: QadCreate, db: Session = Depends(get_db), current_user
     return db_qad
 
 @router.get("/qad/", response_model=List[qad_schema], summary="Get QAD entries by month")
-async def read_qads(month: str, db: Session = Depends(get_db)):
+async def read_qads(month: str):
     year = datetime.now().year
-    qads = db.query(qad_model).filter(
-        qad_model.year == str(year),
-        qad_model.month == month
-    ).all()
-    return qads
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            qads = (await db.execute(select(qad_model).where(
+                qad_model.year == str(year),
+                qad_model.month == month
+            ))).scalars().all()
+            return [qad_schema.model_validate(item, from_attributes=True).model_dump(mode="json") for item in qads]
+
+    return await cache.get_or_load(CacheKey("qad", _period(year, month)), load)
 
 @router.put("/qad/{qad_id}", response_model=qad_schema, summary="Update a QAD entry by ID")
-async def update_qad(qad_id: int, qad: QadUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_qad = db.query(qad_model).filter(qad_model.id == qad_id).first()
+async def update_qad(qad_id: int, qad: QadUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    db_qad = await db.get(qad_model, qad_id)
     if not db_qad:
         raise HTTPException(status_code=404, detail="QAD entry not found")
     
@@ -227,12 +289,13 @@ async def update_qad(qad_id: int, qad: QadUpdate, db: Session = Depends(get_db),
     for key, value in qad.dict().items():
         setattr(db_qad, key, value)
     
-    db.commit()
-    db.refresh(db_qad)
+    await db.commit()
+    await db.refresh(db_qad)
+    await cache.invalidate("qad", _period(before_data["year"], before_data["month"]))
+    await cache.invalidate("qad", _period(db_qad.year, db_qad.month))
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="UPDATE",
@@ -247,8 +310,8 @@ async def update_qad(qad_id: int, qad: QadUpdate, db: Session = Depends(get_db),
     return db_qad
 
 @router.delete("/qad/{qad_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete a QAD entry by ID")
-async def delete_qad(qad_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    db_qad = db.query(qad_model).filter(qad_model.id == qad_id).first()
+async def delete_qad(qad_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    db_qad = await db.get(qad_model, qad_id)
     if not db_qad:
         raise HTTPException(status_code=404, detail="QAD entry not found")
     
@@ -268,12 +331,12 @@ async def delete_qad(qad_id: int, db: Session = Depends(get_db), current_user: U
     }
     
     # 删除记录
-    db.delete(db_qad)
-    db.commit()
+    await db.delete(db_qad)
+    await db.commit()
+    await cache.invalidate("qad", _period(before_data["year"], before_data["month"]))
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="DELETE",
@@ -287,27 +350,26 @@ async def delete_qad(qad_id: int, db: Session = Depends(get_db), current_user: U
     return {"message": "QAD entry deleted successfully"}
 
 @router.get("/test-activity-record/", summary="Test activity record feature")
-async def test_activity_record(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def test_activity_record(db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """
     测试数据变更记录功能
     """
     try:
         # 创建一个测试QA记录
         test_qa = qa_model(
-            day="1",
-            month="1",
-            year="2023",
+            day=1,
+            month=1,
+            year=2023,
             line="TEST",
-            value="100",
+            value=100,
             scrapflag=False
         )
         db.add(test_qa)
-        db.commit()
-        db.refresh(test_qa)
+        await db.commit()
+        await db.refresh(test_qa)
         
         # 记录创建活动
-        create_activity = ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="CREATE",
@@ -328,12 +390,11 @@ async def test_activity_record(db: Session = Depends(get_db), current_user: User
             "value": test_qa.value
         }
         
-        test_qa.value = "200"
-        db.commit()
+        test_qa.value = 200
+        await db.commit()
         
         # 记录更新活动
-        update_activity = ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="UPDATE",
@@ -346,12 +407,11 @@ async def test_activity_record(db: Session = Depends(get_db), current_user: User
         )
         
         # 删除测试记录
-        db.delete(test_qa)
-        db.commit()
+        await db.delete(test_qa)
+        await db.commit()
         
         # 记录删除活动
-        delete_activity = ActivityService.record_data_change(
-            db=db,
+        await ActivityService.record_data_change(
             user=current_user,
             module="QA",
             action_type="DELETE",
@@ -362,8 +422,11 @@ async def test_activity_record(db: Session = Depends(get_db), current_user: User
             target="/quality"
         )
         
+        # 等待后台写入器落库后再读取
+        await activity_writer.flush()
+        
         # 获取所有活动记录
-        activities = db.query(Activity).order_by(Activity.created_at.desc()).limit(10).all()
+        activities = (await db.execute(select(Activity).order_by(Activity.created_at.desc()).limit(10))).scalars().all()
         
         activity_list = []
         for activity in activities:
@@ -379,47 +442,52 @@ async def test_activity_record(db: Session = Depends(get_db), current_user: User
 
 # KPI 数据相关端点
 @router.get("/kpi/", response_model=List[qa_kpi_schema], summary="获取KPI数据")
-async def get_kpi_data(month: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_kpi_data(month: int, request: Request, current_user: User = Depends(get_current_user)):
     year = datetime.now().year
-    kpi_data = db.query(qa_kpi_model).filter(
-        qa_kpi_model.year == year,
-        qa_kpi_model.month == month
-    ).all()
-    return kpi_data
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            kpi_data = (await db.execute(select(qa_kpi_model).where(
+                qa_kpi_model.year == year,
+                qa_kpi_model.month == month
+            ))).scalars().all()
+            return [qa_kpi_schema.model_validate(item, from_attributes=True).model_dump(mode="json") for item in kpi_data]
+
+    key = CacheKey("qa_kpi", _period(year, month))
+    return await conditional_response(request, ("qa_kpi",), key.render(cache.prefix), lambda: cache.get_or_load(key, load))
+
+async def _replace_kpi_month(db: AsyncSession, kpi_data: QaKpiBulkUpdate) -> list:
+    """
+    整月替换KPI数据，返回插入后的行（含ID）。
+    用一条批量 INSERT 写入再按月读回：逐个 db.add 的对象需要取回自增ID，会退化为每行一条 INSERT
+    """
+    period = (qa_kpi_model.year == kpi_data.year, qa_kpi_model.month == kpi_data.month)
+    await db.execute(delete(qa_kpi_model).where(*period))
+    if kpi_data.items:
+        await db.execute(insert(qa_kpi_model), [
+            {
+                "month": kpi_data.month,
+                "year": kpi_data.year,
+                "area": item.area,
+                "description": item.description,
+                "new_factory": item.new_factory,
+                "old_factory": item.old_factory,
+                "total": item.total,
+            }
+            for item in kpi_data.items
+        ])
+    return (await db.execute(select(qa_kpi_model).where(*period).order_by(qa_kpi_model.id))).scalars().all()
 
 @router.post("/kpi/", response_model=List[qa_kpi_schema], status_code=status.HTTP_201_CREATED, summary="创建KPI数据")
-async def create_kpi_data(kpi_data: QaKpiBulkUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    created_items = []
-    
-    # 先删除该月份的所有数据
-    db.query(qa_kpi_model).filter(
-        qa_kpi_model.year == kpi_data.year,
-        qa_kpi_model.month == kpi_data.month
-    ).delete()
-    
-    # 创建新数据
-    for item in kpi_data.items:
-        db_item = qa_kpi_model(
-            month=kpi_data.month,
-            year=kpi_data.year,
-            area=item.area,
-            description=item.description,
-            new_factory=item.new_factory,
-            old_factory=item.old_factory,
-            total=item.total
-        )
-        db.add(db_item)
-        created_items.append(db_item)
-    
-    db.commit()
-    
-    # 刷新所有项以获取ID
-    for item in created_items:
-        db.refresh(item)
+async def create_kpi_data(kpi_data: QaKpiBulkUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    # 删除该月份的所有数据后重新插入
+    created_items = await _replace_kpi_month(db, kpi_data)
+    await db.commit()
+    await cache.invalidate("qa_kpi", _period(kpi_data.year, kpi_data.month))
+    await table_versions.bump("qa_kpi")
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="CREATE",
@@ -438,13 +506,25 @@ async def create_kpi_data(kpi_data: QaKpiBulkUpdate, db: Session = Depends(get_d
     
     return created_items
 
+@router.post("/kpi/import", response_model=ImportSummary, summary="导入KPI数据（CSV / XLSX）")
+async def import_kpi_data(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
+    """列: 年、月、区域、描述、新厂、老厂、汇总；文件中出现的月份整体替换。有任何行错误时不导入"""
+    from services.imports import KpiImport, record_import, run_import
+    spec = KpiImport()
+    result = await run_import(db, spec, file)
+    for year, month in result.periods:
+        await cache.invalidate("qa_kpi", _period(year, month))
+    await table_versions.bump("qa_kpi")
+    await record_import(current_user, spec, result)
+    return result
+
 @router.put("/kpi/", response_model=List[qa_kpi_schema], summary="更新KPI数据")
-async def update_kpi_data(kpi_data: QaKpiBulkUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def update_kpi_data(kpi_data: QaKpiBulkUpdate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     # 获取原始数据用于比较
-    original_items = db.query(qa_kpi_model).filter(
+    original_items = (await db.execute(select(qa_kpi_model).where(
         qa_kpi_model.year == kpi_data.year,
         qa_kpi_model.month == kpi_data.month
-    ).all()
+    ))).scalars().all()
     
     original_data = [{
         "id": item.id,
@@ -455,36 +535,14 @@ async def update_kpi_data(kpi_data: QaKpiBulkUpdate, db: Session = Depends(get_d
         "total": item.total
     } for item in original_items]
     
-    # 删除现有数据
-    db.query(qa_kpi_model).filter(
-        qa_kpi_model.year == kpi_data.year,
-        qa_kpi_model.month == kpi_data.month
-    ).delete()
-    
-    # 创建新数据
-    created_items = []
-    for item in kpi_data.items:
-        db_item = qa_kpi_model(
-            month=kpi_data.month,
-            year=kpi_data.year,
-            area=item.area,
-            description=item.description,
-            new_factory=item.new_factory,
-            old_factory=item.old_factory,
-            total=item.total
-        )
-        db.add(db_item)
-        created_items.append(db_item)
-    
-    db.commit()
-    
-    # 刷新所有项以获取ID
-    for item in created_items:
-        db.refresh(item)
+    # 删除现有数据后重新插入
+    created_items = await _replace_kpi_month(db, kpi_data)
+    await db.commit()
+    await cache.invalidate("qa_kpi", _period(kpi_data.year, kpi_data.month))
+    await table_versions.bump("qa_kpi")
     
     # 记录活动
-    ActivityService.record_data_change(
-        db=db,
+    await ActivityService.record_data_change(
         user=current_user,
         module="QA",
         action_type="UPDATE",
@@ -505,37 +563,56 @@ async def update_kpi_data(kpi_data: QaKpiBulkUpdate, db: Session = Depends(get_d
     return created_items
 
 @router.get("/monthly", response_model=List[MonthlyTotalResponse])
-def get_monthly_totals(month: str, year: str, db: Session = Depends(get_db)):
+async def get_monthly_totals(month: str, year: str):
     """获取指定月份的月度总数"""
-    monthly_totals = db.query(MonthlyTotal).filter(
-        MonthlyTotal.month == month,
-        MonthlyTotal.year == year
-    ).all()
-    return monthly_totals
+    async def load():
+        async with AsyncSessionLocal() as db:
+            monthly_totals = (await db.execute(select(MonthlyTotal).where(
+                MonthlyTotal.month == month,
+                MonthlyTotal.year == year
+            ))).scalars().all()
+            return [MonthlyTotalResponse.model_validate(item, from_attributes=True).model_dump(mode="json") for item in monthly_totals]
+
+    return await cache.get_or_load(CacheKey("qa_monthly", _period(year, month)), load)
 
 @router.put("/monthly")
-def update_monthly_totals(monthly_totals: List[MonthlyTotalCreate], db: Session = Depends(get_db)):
+async def update_monthly_totals(monthly_totals: List[MonthlyTotalCreate], db: AsyncSession = Depends(get_async_db)):
     """更新月度总数"""
-    for total_data in monthly_totals:
-        # 查找是否已存在记录
-        existing = db.query(MonthlyTotal).filter(
-            MonthlyTotal.line == total_data.line,
-            MonthlyTotal.month == total_data.month,
-            MonthlyTotal.year == total_data.year
-        ).first()
-        
-        if existing:
-            # 更新现有记录
-            existing.amount = total_data.amount
-        else:
-            # 创建新记录
-            new_total = MonthlyTotal(
-                line=total_data.line,
-                month=total_data.month,
-                year=total_data.year,
-                amount=total_data.amount
-            )
-            db.add(new_total)
+    result = await bulk_upsert(
+        db, MonthlyTotal, [item.dict() for item in monthly_totals],
+        key=("line", "year", "month"),
+        fields=("amount",),
+    )
+    if not result.changed:
+        return {"message": "Monthly amounts updated successfully"}
+    
+    await db.commit()
+    for period in {_period(item.year, item.month) for item in monthly_totals}:
+        await cache.invalidate("qa_monthly", period)
+    # 比率只用到当年的月度总数
+    for year in {item.year for item in monthly_totals}:
+        await cache.invalidate("qa_summary", str(year))
+    return {"message": "Monthly amounts updated successfully"}
+
+@router.get("/summary", response_model=List[QaSummary], summary="GP12 按线/月汇总")
+async def get_qa_summary(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    line: Optional[str] = None,
+    by_line: bool = True,
+):
+    """
+    在数据库中按 线/月 汇总 GP12 与报废数，一年的图表只需一次请求
     
-    db.commit()
-    return {"message": "Monthly amounts updated successfully"}
\ No newline at end of file
+    - 每条线每月一行（by_line=false 时为全厂每月一行），传 month 只返回该月
+    - gp12_ratio / scrap_ratio: 相对 MonthlyTotal.amount 的比率，没有月度总数时为空
+    - ytd_*: 当年 1 月至该月累计
+    - last_year_* / *_yoy: 上年同月数值及同比变化率
+    """
+    year = year or datetime.now().year
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await qa_summary(db, year, month, line, by_line)
+
+    return await cache.get_or_load(CacheKey("qa_summary", str(year), f"{month}|{line}|{by_line}"), load)
\ No newline at end of file
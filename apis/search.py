@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from db.database import get_async_db
+from db.statement_timeout import time_budget
+from core.pagination import decode_cursor, encode_cursor
+from models.user import User
+from schemas.search import SearchResponse
+from services.search import SOURCES, search
+from apis.user import get_current_user
+
+router = APIRouter(
+    prefix="/search",
+    tags=["搜索"],
+    responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("search"))],
+)
+
+# 相关度排序只能按偏移翻页，限制最大深度
+MAX_OFFSET = 1000
+
+@router.get("/", response_model=SearchResponse, summary="跨模块全文检索")
+async def search_all(
+    q: str = Query(..., min_length=2, max_length=100, description="检索词，多个词用空格分隔，需全部命中"),
+    module: Optional[List[str]] = Query(None, description="限定模块，可重复传入"),
+    limit: int = Query(20, ge=1, le=50),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    在活动记录、日/周维护任务和事件中检索，结果按相关度排序
+
+    翻页时传入上一页返回的 next_cursor；最多翻到第 MAX_OFFSET 条。
+    """
+    unknown = set(module or []) - set(SOURCES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"未知模块: {', '.join(sorted(unknown))}")
+    offset = decode_cursor(cursor, ("offset",))["offset"] if cursor else 0
+    if not isinstance(offset, int) or not 0 <= offset < MAX_OFFSET:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+
+    hits, has_more, total = await search(db, q, module, limit, offset, include_total)
+    next_offset = offset + limit
+    return SearchResponse(
+        total=total,
+        items=hits,
+        next_cursor=encode_cursor({"offset": next_offset}) if has_more and next_offset < MAX_OFFSET else None
+    )
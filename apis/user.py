@@ -1,30 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Security 
-from sqlalchemy.orm  import Session 
+from sqlalchemy.ext.asyncio import AsyncSession 
 from typing import List, Optional 
 from schemas import user as user_schema 
 from services import user as user_service 
-from db.database  import get_db 
+from services.auth_cache import Principal, principal_cache
+from db.database  import get_async_db 
+from db.statement_timeout import time_budget
 from fastapi.security  import OAuth2PasswordBearer, OAuth2PasswordRequestForm 
 from datetime import timedelta 
 from fastapi.responses  import JSONResponse 
 from fastapi.encoders  import jsonable_encoder 
-import jwt
+import time
  
 router = APIRouter(
     prefix="/users",
     tags=["users"],
     responses={404: {"description": "Not found"}},
+    dependencies=[Depends(time_budget("users"))],
 )
  
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
  
 # 权限依赖项 
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # 快速路径：已验证过的 token 直接返回缓存的用户身份，不查库
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    import jwt  # 见 services/user.py：PyJWT 用到时再加载
     try:
         payload = user_service.decode_token(token) 
         username: str = payload.get("sub") 
@@ -39,17 +47,19 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
     except jwt.InvalidTokenError:
         raise credentials_exception 
     
-    user = db.query(user_service.User).filter(user_service.User.name  == username).first()
+    user = await user_service.get_user_by_name_service(db, username)
     if user is None:
         raise credentials_exception 
-    return user 
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload["exp"])
+    return principal
  
 @router.post("/token",  summary="Login and get token")
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(user_service.User).filter(user_service.User.name  == form_data.username).first() 
+    user = await user_service.get_user_by_name_service(db, form_data.username) 
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -67,6 +77,8 @@ async def login_for_access_token(
     access_token = user_service.create_access_token( 
         data={"sub": user.name},  expires_delta=access_token_expires 
     )
+    # 登录时顺便预热认证缓存，后续请求无需再查用户
+    principal_cache.put(access_token, Principal.from_user(user), time.time() + access_token_expires.total_seconds())
     
     return JSONResponse(
         content=jsonable_encoder({"access_token": access_token, "token_type": "bearer", "department": user.department.name }),
@@ -76,13 +88,13 @@ async def login_for_access_token(
 @router.post("/create",  response_model=user_schema.User, summary="Create user")
 async def create_user(
     user: user_schema.UserCreate,
-    db: Session = Depends(get_db)):
-    return user_service.create_user_service(db,  user)
+    db: AsyncSession = Depends(get_async_db)):
+    return await user_service.create_user_service(db,  user)
  
 @router.get("/{user_id}",  response_model=user_schema.User, summary="Get user by ID")
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schema.User = Depends(get_current_user)
 ):
     if current_user.id  != user_id and not current_user.is_admin: 
@@ -91,7 +103,7 @@ async def read_user(
             detail="You don't have permission to view this user."
         )
     
-    db_user = user_service.get_user_service(db,  user_id)
+    db_user = await user_service.get_user_service(db,  user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user 
@@ -100,16 +112,16 @@ async def read_user(
 async def read_users(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    users = user_service.get_users_service(db,  skip, limit)
+    users = await user_service.get_users_service(db,  skip, limit)
     return users 
  
 @router.put("/{user_id}",  response_model=user_schema.User, summary="Update user")
 async def update_user(
     user_id: int,
     user_update: user_schema.UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: user_schema.User = Depends(get_current_user)
 ):
     if current_user.id  != user_id and not current_user.is_admin: 
@@ -118,7 +130,7 @@ async def update_user(
             detail="You don't have permission to update this user."
         )
     
-    db_user = user_service.update_user_service(db,  user_id, user_update)
+    db_user = await user_service.update_user_service(db,  user_id, user_update)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user 
@@ -126,9 +138,9 @@ async def update_user(
 @router.delete("/{user_id}",  summary="Delete user")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    success = user_service.delete_user_service(db,  user_id)
+    success = await user_service.delete_user_service(db,  user_id)
     if not success:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+过载时的准入控制效果
+
+直接驱动 ASGI（不经过网络），下游用一个容量固定的“数据库”模拟连接池：
+POOL 个连接，每个请求占用一个连接 SERVICE_MS 毫秒，连接池满时等待，等待超过 POOL_TIMEOUT 秒报错（500），
+与 SQLAlchemy 连接池的行为一致。按固定速率（开环，默认为容量的 2 倍）发送 80% 读 / 10% 写 / 10% 批量读取，
+对比:
+- 无准入控制：请求全部堆在连接池前，延迟随时间线性增长，最后一起超时
+- 准入控制：超出部分立即返回 503，获准请求的延迟保持平稳，写入优先
+按时间窗口输出获准请求的 p99 以及各类结果计数。
+
+运行: python benchmarks/bench_admission.py [--seconds 6] [--overload 2.0]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp())
+
+from core.admission import AdmissionController, AdmissionMiddleware, RouteClass
+
+POOL = 10
+SERVICE_MS = 20
+POOL_TIMEOUT = 3.0
+WINDOWS = 3
+
+MIX = [("GET", "/qa/")] * 8 + [("PUT", "/qa/")] + [("GET", "/activities/")]
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.pool = asyncio.Semaphore(POOL)
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await asyncio.wait_for(self.pool.acquire(), POOL_TIMEOUT)
+        except asyncio.TimeoutError:
+            status = 500
+        else:
+            try:
+                # 批量读取更慢
+                await asyncio.sleep(SERVICE_MS / 1000 * (4 if scope["path"] == "/activities/" else 1))
+            finally:
+                self.pool.release()
+            status = 200
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def call(app, method: str, path: str):
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    started = time.perf_counter()
+    await app({"type": "http", "method": method, "path": path, "headers": []}, receive, send)
+    return status, time.perf_counter() - started
+
+
+async def run(app, rate: float, seconds: float):
+    rng = random.Random(1)
+    results = []
+    tasks = []
+    begin = time.perf_counter()
+
+    async def one(sent_at, method, path):
+        status, elapsed = await call(app, method, path)
+        results.append((sent_at, method, path, status, elapsed))
+
+    i = 0
+    while True:
+        now = time.perf_counter() - begin
+        if now >= seconds:
+            break
+        while i < now * rate:
+            method, path = rng.choice(MIX)
+            tasks.append(asyncio.create_task(one(now, method, path)))
+            i += 1
+        await asyncio.sleep(0.001)
+    await asyncio.gather(*tasks)
+    return results
+
+
+def p99(values):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(int(len(values) * 0.99), len(values) - 1)] * 1000
+
+
+def report(name: str, results, seconds: float):
+    window = seconds / WINDOWS
+    print(f"\n{name}")
+    header = "".join(f"{f'p99 {w * window:.0f}-{(w + 1) * window:.0f}s':>14}" for w in range(WINDOWS))
+    print(f"{'类别':<8}{'200':>7}{'503':>7}{'500':>7}{header}")
+    by_class = defaultdict(list)
+    for sent_at, method, path, status, elapsed in results:
+        kind = "write" if method != "GET" else ("bulk" if path == "/activities/" else "read")
+        by_class[kind].append((sent_at, status, elapsed))
+    for kind in ("write", "read", "bulk"):
+        rows = by_class[kind]
+        counts = {code: sum(1 for _, status, _ in rows if status == code) for code in (200, 503, 500)}
+        windows = "".join(
+            f"{p99([e for t, s, e in rows if s == 200 and w * window <= t < (w + 1) * window]):>14.0f}"
+            for w in range(WINDOWS)
+        )
+        print(f"{kind:<8}{counts[200]:>7}{counts[503]:>7}{counts[500]:>7}{windows}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=6)
+    parser.add_argument("--overload", type=float, default=2.0, help="发送速率 / 模拟数据库容量")
+    args = parser.parse_args()
+
+    # 平均服务时间 (0.9 x 1 + 0.1 x 4) x SERVICE_MS
+    capacity = POOL / (SERVICE_MS / 1000 * 1.3)
+    rate = capacity * args.overload
+    print(f"模拟数据库容量约 {capacity:.0f} 请求/秒，发送 {rate:.0f} 请求/秒，持续 {args.seconds:.0f}s（p99 单位 ms，只统计 200）")
+
+    report("无准入控制", asyncio.run(run(FakeDatabase(), rate, args.seconds)), args.seconds)
+
+    controller = AdmissionController(
+        max_concurrency=POOL,
+        classes=(RouteClass("write", 0, POOL, 50), RouteClass("read", 1, POOL * 3 // 4, 50), RouteClass("bulk", 2, 2, 5)),
+        queue_timeout=0.5,
+    )
+    app = AdmissionMiddleware(FakeDatabase(), controller, enabled=True)
+    report("准入控制", asyncio.run(run(app, rate, args.seconds)), args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+同步会话 vs 异步会话 并发吞吐量对比
+
+用 SQLite（同步: pysqlite / 异步: aiosqlite）作为本地替身，对比：
+- before: async def 路由里直接调用同步 Session（旧写法，会阻塞事件循环）
+- after:  apis/qa.py 中移植到 AsyncSession 后的 read_qas
+
+注意: 旧写法下并发数超过同步连接池容量（默认 5+10）时，会话在事件循环里同步等待连接，
+而持有连接的请求又无法推进到释放连接，整个进程会卡到 pool_timeout，因此默认并发取 8。
+
+运行: python benchmarks/bench_async_db.py [--rows 50000] [--concurrency 8] [--requests 128]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import itertools
+import logging
+import tempfile
+import time
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "datalink_bench_async.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_FILE}")
+
+import httpx
+from datetime import datetime
+from fastapi import FastAPI, Depends
+from sqlalchemy.orm import Session
+
+from db.database import Base, engine, async_engine, get_db
+from models.qa import Qa
+from apis import qa
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def seed(rows: int):
+    """生成 rows 条 GP12 数据，每个 (年, 月, 线, 日, 报废) 一格"""
+    Base.metadata.drop_all(bind=engine, tables=[Qa.__table__])
+    Base.metadata.create_all(bind=engine, tables=[Qa.__table__])
+    year = datetime.now().year
+    cells = itertools.product(range(year, year - 100, -1), range(1, 13), range(40), range(1, 29), (False, True))
+    data = [
+        {"line": f"L{line}", "day": day, "month": month, "year": y, "value": i % 97, "scrapflag": scrap}
+        for i, (y, month, line, day, scrap) in zip(range(rows), cells)
+    ]
+    with engine.begin() as conn:
+        conn.execute(Qa.__table__.insert(), data)
+
+
+def build_before_app() -> FastAPI:
+    """旧实现：async def + 同步 Session"""
+    app = FastAPI()
+
+    @app.get("/qa/")
+    async def read_qas(month: int, db: Session = Depends(get_db)):
+        year = datetime.now().year
+        return db.query(Qa).filter(Qa.year == year, Qa.month == month).all()
+
+    return app
+
+
+def build_after_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(qa.router)
+    return app
+
+
+async def run(app: FastAPI, concurrency: int, total: int):
+    transport = httpx.ASGITransport(app=app)
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            async with sem:
+                start = time.perf_counter()
+                r = await client.get("/qa/", params={"month": str(i % 12 + 1)})
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        # 预热
+        await one(0)
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    # 释放 aiosqlite 连接（其工作线程绑定在当前事件循环上）
+    await async_engine.dispose()
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=128)
+    args = parser.parse_args()
+
+    print(f"生成 {args.rows} 条数据 -> {DB_FILE}")
+    seed(args.rows)
+
+    for name, app in (("before (sync Session)", build_before_app()), ("after  (AsyncSession)", build_after_app())):
+        result = asyncio.run(run(app, args.concurrency, args.requests))
+        print(f"{name}: {result['rps']:8.1f} req/s  p50={result['p50']:7.1f}ms  p99={result['p99']:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+响应压缩：CPU 耗时 vs 节省字节（按实际接口的响应结构构造数据）
+
+- /activities/?limit=200: 活动记录，含完整的变更前后快照
+- /qa/?month=: 9 条产线 x 31 天 x 报废/非报废 的月度网格
+- /maint/issues?limit=500: 维护问题记录分页
+- /activities/export (NDJSON 流): 5000 条活动记录按 100 条一块流式压缩（每块 flush）
+
+对每种负载比较 gzip 1/5/9 与 brotli 1/4/6（未安装 brotli 时跳过），输出压缩后大小、压缩率、
+单次压缩 CPU 时间，以及在 2 Mbit/s 车间 Wi-Fi 上节省的传输时间。
+
+运行: python benchmarks/bench_compression.py [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+
+from core.compression import _Brotli, _Gzip, brotli
+
+# 车间 Wi-Fi 的有效带宽（字节/秒）
+WIFI_BYTES_PER_SECOND = 2_000_000 / 8
+
+
+def activity(i: int) -> dict:
+    before = [{"line": f"L{j}", "year": 2025, "month": 3, "day": i % 28 + 1, "value": str(j * 3), "scrapflag": False}
+              for j in range(9)]
+    after = [{**row, "value": str(int(row["value"]) + 1)} for row in before]
+    created = datetime(2025, 3, 1) + timedelta(minutes=i)
+    return {
+        "id": i, "title": "更新质量数据", "action": "更新了9条质量数据", "details": "月份: 3, 年份: 2025",
+        "type": "QA_UPDATE", "icon": "mdi-pencil", "color": "primary", "target": "/quality",
+        "changes": {"before": before, "after": after}, "userId": 3, "user": "张工", "department": "QA",
+        "timestamp": created.isoformat(), "time": "3 天前",
+    }
+
+
+def payloads():
+    activities = {
+        "total": 120000, "items": [activity(i) for i in range(200)],
+        "next_cursor": "eyJjcmVhdGVkX2F0Ijp7ImQiOiIyMDI1LTAzLTAxVDAzOjIwOjAwIn0sImlkIjoxOTl9", "total_is_estimate": True,
+    }
+    qa_grid = [
+        {"line": f"L{line}", "day": str(day), "month": "3", "year": "2025", "value": str((line * day) % 97),
+         "scrapflag": bool(flag), "id": line * 1000 + day * 2 + flag}
+        for line in range(1, 10) for day in range(1, 32) for flag in (0, 1)
+    ]
+    issues = {
+        "total": None, "next_cursor": None, "total_is_estimate": False,
+        "items": [
+            {"title": f"焊装机器人{i % 12}号焊枪堵丝", "wheres": f"焊装{i % 4}线", "content": "更换导电嘴，清理送丝管，检查送丝轮压力",
+             "degree": "中等" if i % 3 else "严重", "id": i, "date_time": (date(2025, 1, 1) + timedelta(days=i % 300)).isoformat(),
+             "user_id": i % 20, "solved": bool(i % 2)}
+            for i in range(500)
+        ],
+    }
+    return {
+        "/activities/?limit=200": orjson.dumps(activities),
+        "/qa/?month=": orjson.dumps(qa_grid),
+        "/maint/issues?limit=500": orjson.dumps(issues),
+    }
+
+
+def stream_chunks():
+    rows = [orjson.dumps(activity(i)) + b"\n" for i in range(5000)]
+    return [b"".join(rows[i:i + 100]) for i in range(0, len(rows), 100)]
+
+
+def codecs():
+    result = [(f"gzip-{level}", lambda level=level: _Gzip(level)) for level in (1, 5, 9)]
+    if brotli is not None:
+        result += [(f"br-{quality}", lambda quality=quality: _Brotli(quality)) for quality in (1, 4, 6)]
+    return result
+
+
+def compress_whole(factory, body: bytes) -> bytes:
+    compressor = factory()
+    return compressor.compress(body) + compressor.finish()
+
+
+def compress_stream(factory, chunks) -> bytes:
+    # 与中间件一致：每块压缩后 flush
+    compressor = factory()
+    out = [compressor.compress(chunk) + compressor.flush() for chunk in chunks[:-1]]
+    out.append(compressor.compress(chunks[-1]) + compressor.finish())
+    return b"".join(out)
+
+
+def cpu_ms(fn, repeat: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - started) / repeat * 1000
+
+
+def report(name: str, size: int, run, repeat: int) -> None:
+    print(f"\n{name}  原始 {size / 1024:.1f} KB，Wi-Fi 传输 {size / WIFI_BYTES_PER_SECOND * 1000:.0f} ms")
+    print(f"{'编码':<10}{'压缩后(KB)':>12}{'压缩率':>8}{'CPU(ms)':>10}{'节省传输(ms)':>14}{'每ms CPU节省(KB)':>18}")
+    for codec, factory in codecs():
+        compressed = len(run(factory))
+        cpu = cpu_ms(lambda: run(factory), repeat)
+        saved = size - compressed
+        print(f"{codec:<10}{compressed / 1024:>12.1f}{compressed / size:>8.1%}{cpu:>10.2f}"
+              f"{saved / WIFI_BYTES_PER_SECOND * 1000:>14.0f}{saved / 1024 / cpu:>18.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("未安装 brotli，只测试 gzip")
+    for name, body in payloads().items():
+        report(name, len(body), lambda factory, body=body: compress_whole(factory, body), args.repeat)
+    chunks = stream_chunks()
+    report("/activities/export (NDJSON 流, 每 100 条 flush)", sum(map(len, chunks)),
+           lambda factory: compress_stream(factory, chunks), max(1, args.repeat // 10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+GP12 存储布局对比：字符串列（旧） vs 整数/浮点列 + (line, year, month) 复合索引（新）
+
+在多年合成数据上分别执行：
+- month: 按年+月取一个月的数据（read_qas）
+- year_sum: 按年汇总每条线的值
+- year_range: 跨年范围查询（旧布局只能 CAST 后比较）
+
+运行: python benchmarks/bench_qa_storage.py [--years 6] [--lines 20] [--repeat 50]
+"""
+import sys
+import os
+import argparse
+import itertools
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "bench_qa_storage.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_FILE}")
+
+from sqlalchemy import Boolean, Column, Integer, MetaData, String, Table, cast, create_engine, func, select, Float
+
+from models.qa import Qa
+
+# 旧布局（迁移前）
+legacy_metadata = MetaData()
+legacy_qa = Table(
+    "qa_legacy", legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("line", String(20), index=True),
+    Column("day", String(10)),
+    Column("month", String(10)),
+    Column("year", String(10)),
+    Column("value", String(255)),
+    Column("scrapflag", Boolean),
+)
+
+
+def seed(engine, years: int, lines: int):
+    Qa.__table__.drop(engine, checkfirst=True)
+    legacy_qa.drop(engine, checkfirst=True)
+    Qa.__table__.create(engine)
+    legacy_qa.create(engine)
+    last_year = 2025
+    cells = itertools.product(
+        range(last_year - years + 1, last_year + 1), range(1, 13), range(lines), range(1, 29), (False, True)
+    )
+    typed = [
+        {"line": f"L{line}", "day": day, "month": month, "year": year, "value": float(i % 97), "scrapflag": scrap}
+        for i, (year, month, line, day, scrap) in enumerate(cells)
+    ]
+    legacy = [
+        {**row, "day": str(row["day"]), "month": str(row["month"]), "year": str(row["year"]), "value": str(int(row["value"]))}
+        for row in typed
+    ]
+    with engine.begin() as conn:
+        conn.execute(Qa.__table__.insert(), typed)
+        conn.execute(legacy_qa.insert(), legacy)
+        conn.exec_driver_sql("ANALYZE")
+    return len(typed), last_year
+
+
+def queries(last_year: int):
+    t, l = Qa.__table__.c, legacy_qa.c
+    first_year = last_year - 2
+    return {
+        "month": (
+            select(legacy_qa).where(l.year == str(last_year), l.month == "3"),
+            select(Qa.__table__).where(t.year == last_year, t.month == 3),
+        ),
+        "year_sum": (
+            select(l.line, func.sum(cast(l.value, Float))).where(l.year == str(last_year)).group_by(l.line),
+            select(t.line, func.sum(t.value)).where(t.year == last_year).group_by(t.line),
+        ),
+        "year_range": (
+            select(func.count()).where(cast(l.year, Integer).between(first_year, last_year), l.line == "L1"),
+            select(func.count()).where(t.year.between(first_year, last_year), t.line == "L1"),
+        ),
+    }
+
+
+def timed(engine, stmt, repeat: int) -> float:
+    with engine.connect() as conn:
+        conn.execute(stmt).all()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            conn.execute(stmt).all()
+        return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=6)
+    parser.add_argument("--lines", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    rows, last_year = seed(engine, args.years, args.lines)
+    print(f"生成 {rows} 条数据（{args.years} 年 x {args.lines} 条线）-> {DB_FILE}")
+    print(f"{'查询':<12}{'字符串列(ms)':>14}{'整数列(ms)':>12}{'加速':>8}")
+    for name, (legacy_stmt, typed_stmt) in queries(last_year).items():
+        before = timed(engine, legacy_stmt, args.repeat)
+        after = timed(engine, typed_stmt, args.repeat)
+        print(f"{name:<12}{before:>14.2f}{after:>12.2f}{before / after:>7.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
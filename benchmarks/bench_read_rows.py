@@ -0,0 +1,141 @@
+"""
+列表读取：ORM 实例 vs 只读行 DTO（services/list_views）
+
+对 50k 行的日维护任务、问题记录和活动记录分别执行：
+- orm: select(Model) -> ORM 实例（identity map）-> schema/to_dict -> orjson
+- rows: Core select(所需列) -> slots DTO -> orjson
+输出平均耗时与 tracemalloc 内存峰值。
+
+运行: python benchmarks/bench_read_rows.py [--rows 50000] [--repeat 3]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "bench_read_rows.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DB_FILE}")
+
+import orjson
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from db.database import Base
+from models.activity import Activity
+from models.maint import MaintDaily, MaintWeekly
+from models.user import User
+from schemas.maint_work import MaintDailyResponse, MaintWeeklyResponse
+from services.list_views import ACTIVITY_ROWS, MAINT_DAILY_ROWS, MAINT_WEEKLY_ROWS
+
+TABLES = [User.__table__, Activity.__table__, MaintDaily.__table__, MaintWeekly.__table__]
+
+
+def seed(rows: int):
+    engine = create_engine(f"sqlite:///{DB_FILE}")
+    Base.metadata.drop_all(engine, tables=TABLES)
+    Base.metadata.create_all(engine, tables=TABLES)
+    day = date(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(MaintDaily), [
+            {"date": day + timedelta(days=i % 365), "user_id": i % 20, "title": f"巡检 {i}", "wheres": "二号线冲压机",
+             "type": i % 3, "content_daily": "检查液压站油位并记录压力", "solved_flag": i % 2}
+            for i in range(rows)
+        ])
+        conn.execute(insert(MaintWeekly), [
+            {"DateTime": day + timedelta(days=i % 365), "user_id": i % 20, "title": f"问题 {i}", "wheres": "焊装",
+             "content": "机器人焊枪堵丝", "degree": "中等", "solved_flag": i % 2}
+            for i in range(rows)
+        ])
+        conn.execute(insert(Activity), [
+            {"title": "更新质量数据", "action": f"更新了L{i % 9}的GP12数据", "details": "共 3 条", "type": "QA_UPDATE",
+             "icon": "mdi-pencil", "color": "primary", "target": "/quality", "changes_before": {"value": i},
+             "changes_after": {"value": i + 1}, "user_name": "admin", "department": "QA",
+             "created_at": datetime(2025, 1, 1) + timedelta(minutes=i)}
+            for i in range(rows)
+        ])
+    engine.dispose()
+
+
+def cases():
+    async def orm_daily(db):
+        tasks = (await db.execute(select(MaintDaily).order_by(MaintDaily.date))).scalars().all()
+        return orjson.dumps([MaintDailyResponse.model_validate_from_orm(task).model_dump() for task in tasks])
+
+    async def rows_daily(db):
+        return orjson.dumps(await MAINT_DAILY_ROWS.fetch(db, MAINT_DAILY_ROWS.select().order_by(MaintDaily.date)))
+
+    async def orm_issues(db):
+        issues = (await db.execute(select(MaintWeekly).order_by(MaintWeekly.DateTime.desc()))).scalars().all()
+        return orjson.dumps([MaintWeeklyResponse.model_validate_from_orm(issue).model_dump() for issue in issues])
+
+    async def rows_issues(db):
+        return orjson.dumps(await MAINT_WEEKLY_ROWS.fetch(db, MAINT_WEEKLY_ROWS.select().order_by(MaintWeekly.DateTime.desc())))
+
+    order = (Activity.created_at.desc(), Activity.id.desc())
+
+    async def orm_activities(db):
+        activities = (await db.execute(select(Activity).order_by(*order))).scalars().all()
+        return orjson.dumps([activity.to_dict() for activity in activities])
+
+    async def rows_activities(db):
+        return orjson.dumps(await ACTIVITY_ROWS.fetch(db, ACTIVITY_ROWS.select().order_by(*order)))
+
+    return {
+        "/maint/daily": (orm_daily, rows_daily),
+        "/maint/issues": (orm_issues, rows_issues),
+        "/activities/": (orm_activities, rows_activities),
+    }
+
+
+async def run(engine, fn):
+    # 每次新会话，与请求一致
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        return await fn(db)
+
+
+async def measure(engine, fn, repeat: int):
+    await run(engine, fn)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = await run(engine, fn)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+
+    tracemalloc.start()
+    await run(engine, fn)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, body
+
+
+async def main_async(repeat: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{DB_FILE}")
+    try:
+        print(f"{'接口':<16}{'ORM(ms)':>10}{'行(ms)':>10}{'加速':>8}{'ORM峰值(MB)':>14}{'行峰值(MB)':>12}{'一致':>6}")
+        for name, (orm_fn, rows_fn) in cases().items():
+            orm_ms, orm_mb, orm_body = await measure(engine, orm_fn, repeat)
+            rows_ms, rows_mb, rows_body = await measure(engine, rows_fn, repeat)
+            same = orjson.loads(orm_body) == orjson.loads(rows_body)
+            print(f"{name:<16}{orm_ms:>10.0f}{rows_ms:>10.0f}{orm_ms / rows_ms:>7.1f}x{orm_mb:>14.1f}{rows_mb:>12.1f}{str(same):>6}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    print(f"生成 {args.rows} 行/表 -> {DB_FILE}")
+    asyncio.run(main_async(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
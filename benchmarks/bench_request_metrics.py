@@ -0,0 +1,87 @@
+"""
+请求指标中间件的单请求开销
+
+直接驱动 ASGI 应用（不经过网络和测试客户端），对同一个返回小 JSON 的路由分别测:
+- 无中间件
+- RequestMetricsMiddleware（只记指标）
+- RequestMetricsMiddleware + 请求日志（写入临时目录）
+输出每个请求的平均耗时与中间件带来的额外开销（微秒）。
+
+运行: python benchmarks/bench_request_metrics.py [--requests 20000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp())
+
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from core.request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+def build_app(metrics: bool, log_requests: bool = False) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.get("/qa/{qa_id}")
+    async def read(qa_id: int):
+        return {"id": qa_id, "line": "L1", "value": "12"}
+
+    if metrics:
+        app.add_middleware(RequestMetricsMiddleware, metrics=RequestMetrics(), log_requests=log_requests)
+    return app
+
+
+async def run(app, requests: int) -> float:
+    sent = asyncio.Event()
+
+    async def receive():
+        if sent.is_set():
+            await asyncio.Event().wait()
+        sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int) -> dict:
+        path = f"/qa/{i}"
+        return {"type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+                "headers": [], "http_version": "1.1", "scheme": "http", "server": ("bench", 80),
+                "client": ("127.0.0.1", 1), "root_path": ""}
+
+    for i in range(200):
+        sent.clear()
+        await app(scope(i), receive, send)
+    started = time.perf_counter()
+    for i in range(requests):
+        sent.clear()
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    cases = [
+        ("无中间件", build_app(False)),
+        ("指标", build_app(True)),
+        ("指标 + 请求日志", build_app(True, log_requests=True)),
+    ]
+    baseline = None
+    print(f"{'配置':<16}{'每请求(us)':>12}{'额外开销(us)':>14}")
+    for name, app in cases:
+        per_request = asyncio.run(run(app, args.requests))
+        baseline = per_request if baseline is None else baseline
+        print(f"{name:<16}{per_request:>12.1f}{per_request - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+列表接口序列化耗时对比（不含查库）：每 10k 行从 ORM 对象/缓存数据到响应字节
+
+- 旧: ORM 对象 -> schema/字典 -> FastAPI 按 response_model 再校验并转换 -> 标准库 json 编码
+- 新: 只读行（services/list_views）-> DTO / 缓存中的字典 -> validated_response() 直接由 orjson 编码
+
+运行: python benchmarks/bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_serialization.db')}")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from main import app
+from core.responses import validated_response
+from models.activity import Activity
+from models.maint import MaintDaily, MaintWeekly
+from schemas.activity import PaginatedActivityResponse
+from schemas.maint_work import MaintDailyResponse, MaintWeeklyResponse
+from services.list_views import ACTIVITY_ROWS, MAINT_DAILY_ROWS, MAINT_WEEKLY_ROWS
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if getattr(route, "path", None) == path and "GET" in route.methods:
+            return route.response_field
+    raise KeyError(path)
+
+
+def fixtures(rows: int):
+    day = date(2025, 1, 1)
+    daily = [
+        MaintDaily(id=i, date=day + timedelta(days=i % 365), user_id=i % 20, title=f"巡检 {i}", wheres="二号线冲压机",
+                   type=i % 3, content_daily="检查液压站油位并记录压力", solved_flag=i % 2)
+        for i in range(rows)
+    ]
+    issues = [
+        MaintWeekly(id=i, DateTime=day + timedelta(days=i % 365), user_id=i % 20, title=f"问题 {i}", wheres="焊装",
+                    content="机器人焊枪堵丝", degree="中等", solved_flag=i % 2)
+        for i in range(rows)
+    ]
+    activities = [
+        Activity(id=i, title="更新质量数据", action=f"更新了L{i % 9}的GP12数据", details="共 3 条", type="QA_UPDATE",
+                 icon="mdi-pencil", color="primary", target="/quality", changes_before={"value": i},
+                 changes_after={"value": i + 1}, user_id=1, user_name="admin", department="QA",
+                 created_at=datetime(2025, 1, 1) + timedelta(minutes=i))
+        for i in range(rows)
+    ]
+    # /qa/ 的缓存内容：已校验并 model_dump(mode="json") 的字典
+    qa_cached = [
+        {"line": f"L{i % 9}", "day": str(i % 28 + 1), "month": "3", "year": "2025",
+         "value": str(i % 97), "scrapflag": bool(i % 2), "id": i}
+        for i in range(rows)
+    ]
+    return daily, issues, activities, qa_cached
+
+
+def page(items):
+    # 维护列表的分页响应结构（见 core.pagination.keyset_page）
+    return {"total": None, "items": items, "next_cursor": None, "total_is_estimate": False}
+
+
+def cases(rows: int):
+    daily, issues, activities, qa_cached = fixtures(rows)
+    # 只读查询返回的行（按视图列顺序）
+    daily_rows = [
+        (t.title, t.wheres, t.content_daily, t.type, t.id, t.date, t.user_id, bool(t.solved_flag)) for t in daily
+    ]
+    issue_rows = [
+        (t.title, t.wheres, t.content, t.degree, t.id, t.DateTime, t.user_id, bool(t.solved_flag)) for t in issues
+    ]
+    activity_rows = [tuple(getattr(a, column.name) for column in ACTIVITY_ROWS.columns) for a in activities]
+
+    return {
+        "/maint/daily": (
+            response_field("/maint/daily"),
+            lambda: page([MaintDailyResponse.model_validate_from_orm(task) for task in daily]),
+            lambda: validated_response(page(MAINT_DAILY_ROWS.to_dtos(daily_rows))),
+        ),
+        "/maint/issues": (
+            response_field("/maint/issues"),
+            lambda: page([MaintWeeklyResponse.model_validate_from_orm(issue) for issue in issues]),
+            lambda: validated_response(page(MAINT_WEEKLY_ROWS.to_dtos(issue_rows))),
+        ),
+        "/activities/": (
+            response_field("/activities/"),
+            lambda: PaginatedActivityResponse(
+                total=rows, items=[activity.to_dict() for activity in activities], next_cursor=None, total_is_estimate=True
+            ),
+            lambda: validated_response({
+                "total": rows, "items": ACTIVITY_ROWS.to_dtos(activity_rows), "next_cursor": None, "total_is_estimate": True
+            }),
+        ),
+        "/qa/?month=": (
+            response_field("/qa/"),
+            lambda: qa_cached,
+            lambda: validated_response(qa_cached),
+        ),
+    }
+
+
+async def legacy(field, build) -> bytes:
+    content = await serialize_response(field=field, response_content=build())
+    return JSONResponse(content).body
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scale = 10000 / args.rows
+    print(f"{args.rows} 行/次，重复 {args.repeat} 次，结果折算为每 10k 行")
+    print(f"{'接口':<16}{'旧(ms)':>10}{'新(ms)':>10}{'加速':>8}{'内容一致':>10}")
+    for name, (field, build_legacy, fast) in cases(args.rows).items():
+        old_body = asyncio.run(legacy(field, build_legacy))
+        new_body = fast().body
+        same = json.loads(new_body) == json.loads(old_body)
+        before = timed(lambda: asyncio.run(legacy(field, build_legacy)), args.repeat) * scale
+        after = timed(fast, args.repeat) * scale
+        print(f"{name:<16}{before:>10.1f}{after:>10.1f}{before / after:>7.1f}x{str(same):>10}")
+
+
+if __name__ == "__main__":
+    main()
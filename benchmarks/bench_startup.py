@@ -0,0 +1,118 @@
+"""
+冷启动耗时：导入 main 的时间与进程启动到第一个请求返回的时间
+
+每轮都启动新的 Python 进程（不受本进程已导入模块影响）:
+- 导入耗时: python -c "import main"，在子进程内计时
+- 首个请求: 启动 python main.py（单 worker），轮询 GET /qa/?month=3 直到返回 200，
+  从创建进程开始计时，包含解释器启动、导入、lifespan（连接池预热、缓存、写入器）和第一次查询
+另外列出导入 main 后仍未加载的重依赖，确认它们保持按需加载。
+输出各项的中位数与最小值（毫秒），便于跨版本对比。
+
+运行: python benchmarks/bench_startup.py [--rounds 5]
+"""
+import sys
+import os
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "datalink_bench_startup.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+os.environ["LOG_DIR"] = tempfile.mkdtemp()
+
+import httpx
+
+# 应当按需加载、不随 import main 加载的模块
+LAZY_MODULES = ("jwt", "passlib", "redis", "services.imports")
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def seed() -> None:
+    from db.database import Base, engine
+    import models  # noqa: F401
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+
+def env(**extra) -> dict:
+    return dict(os.environ, REQUEST_LOG="false", PYTHONWARNINGS="ignore", **extra)
+
+
+def import_time():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], cwd=ROOT, env=env(), capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def first_request_time() -> float:
+    port = free_port()
+    # 复用一个客户端轮询：每次新建客户端都要加载证书，单核机器上会和服务进程抢 CPU
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, env=env(HOST="127.0.0.1", PORT=str(port), WORKERS="1"),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                if client.get("/qa/?month=3").status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError("服务启动失败")
+            if time.perf_counter() - started > 60:
+                raise RuntimeError("服务启动超时")
+            time.sleep(0.005)
+    finally:
+        client.close()
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    seed()
+    imports, loaded = [], set()
+    for _ in range(args.rounds):
+        seconds, modules = import_time()
+        imports.append(seconds)
+        loaded.update(modules)
+    first_requests = [first_request_time() for _ in range(args.rounds)]
+
+    print(f"{'项目':<14}{'中位数(ms)':>12}{'最小(ms)':>12}")
+    for name, samples in (("import main", imports), ("首个请求", first_requests)):
+        print(f"{name:<14}{statistics.median(samples) * 1000:>12.0f}{min(samples) * 1000:>12.0f}")
+    print("导入时已加载的按需模块: " + (", ".join(sorted(loaded)) or "无"))
+
+
+if __name__ == "__main__":
+    main()
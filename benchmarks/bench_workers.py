@@ -0,0 +1,160 @@
+"""
+不同 worker 数下的服务吞吐量
+
+用临时 SQLite 库生成一年的 GP12 数据，依次以 WORKERS=1/2/4/8 启动 python main.py（真实的 uvicorn
+多进程 + 网络），由多个客户端进程通过 HTTP 压测若干只读接口，输出每秒请求数和 p50/p99 延迟。
+吞吐量主要受 CPU 核数限制：worker 数超过核数后不会再提升（本机核数会一并打印）。
+
+进程内缓存不在 worker 间共享，这里只读不写，因此设置 ALLOW_LOCAL_CACHE_WITH_WORKERS=true；
+生产环境多 worker 需配置 REDIS_URL。
+
+运行: python benchmarks/bench_workers.py [--workers 1 2 4 8] [--clients 4] [--concurrency 16] [--seconds 10]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+import socket
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+DB_FILE = os.path.join(tempfile.gettempdir(), "datalink_bench_workers.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+import httpx
+
+PATHS = ("/qa/?month=3", "/qa/summary", "/qa/monthly?month=3&year={year}")
+
+
+def seed() -> None:
+    from db.database import Base, engine
+    from models.qa import Qa
+    from services.qa_rollup import _main as rebuild_rollup
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    year = datetime.now().year
+    data = [
+        {"line": f"L{line}", "day": day, "month": month, "year": year, "value": (month * day + line) % 97,
+         "scrapflag": scrap}
+        for month, line, day, scrap in itertools.product(range(1, 13), range(18), range(1, 29), (False, True))
+    ]
+    with engine.begin() as conn:
+        conn.execute(Qa.__table__.insert(), data)
+    engine.dispose()
+    asyncio.run(rebuild_rollup(year))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int, log_dir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        HOST="127.0.0.1",
+        PORT=str(port),
+        WORKERS=str(workers),
+        ALLOW_LOCAL_CACHE_WITH_WORKERS="true",
+        REQUEST_LOG="false",
+        LOG_DIR=log_dir,
+        DB_POOL_WARMUP="1",
+    )
+    env.pop("REDIS_URL", None)
+    server = subprocess.Popen(
+        [sys.executable, "main.py"], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            # 每个 worker 启动完成后才会接受连接，多请求几次让所有 worker 就绪并预热缓存
+            for _ in range(workers * 4):
+                for path in PATHS:
+                    httpx.get(f"http://127.0.0.1:{port}{path.format(year=datetime.now().year)}").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            if server.poll() is not None:
+                raise RuntimeError(f"服务启动失败（WORKERS={workers}）")
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"服务启动超时（WORKERS={workers}）")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+async def _client(port: int, concurrency: int, seconds: float):
+    year = datetime.now().year
+    urls = itertools.cycle([path.format(year=year) for path in PATHS])
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + seconds
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(next(urls))
+                if response.status_code != 200:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def client_process(args):
+    return asyncio.run(_client(*args))
+
+
+def measure(port: int, clients: int, concurrency: int, seconds: float):
+    with multiprocessing.get_context("spawn").Pool(clients) as pool:
+        results = pool.map(client_process, [(port, concurrency, seconds)] * clients)
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(error for _, error in results)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--clients", type=int, default=4, help="客户端进程数")
+    parser.add_argument("--concurrency", type=int, default=16, help="每个客户端进程的并发连接数")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    seed()
+    print(f"CPU 核数: {os.cpu_count()}，客户端: {args.clients} 进程 x {args.concurrency} 连接，每轮 {args.seconds:.0f}s")
+    print(f"{'WORKERS':>8}{'请求/秒':>12}{'p50(ms)':>10}{'p99(ms)':>10}{'错误':>8}")
+    log_dir = tempfile.mkdtemp()
+    for workers in args.workers:
+        port = free_port()
+        server = start_server(workers, port, log_dir)
+        try:
+            latencies, errors = measure(port, args.clients, args.concurrency, args.seconds)
+        finally:
+            stop_server(server)
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000
+        print(f"{workers:>8}{len(latencies) / args.seconds:>12.0f}{p50:>10.1f}{p99:>10.1f}{errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
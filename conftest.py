@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+# 测试不连接 MySQL：导入 db.database 前指向临时 SQLite 文件
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+# 请求日志等写到临时目录，不写入仓库中的 logs/
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp())
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def schema():
+    """按模型在测试库中建表，整个测试会话只建一次"""
+    import models
+    from db.database import engine
+
+    models.Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture
+def memory_db():
+    """
+    在独立的内存 SQLite（aiosqlite）上运行异步测试：memory_db([Qa, ...], test, **engine_options)
+
+    只建给出的模型对应的表；test(engine, db) 在一个 AsyncSession（expire_on_commit=False）中执行
+    """
+    import models
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    def run(tables, test, **engine_options):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://", **engine_options)
+            async with engine.begin() as conn:
+                await conn.run_sync(models.Base.metadata.create_all, tables=[model.__table__ for model in tables])
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as db:
+                    await test(engine, db)
+            finally:
+                await engine.dispose()
+
+        asyncio.run(main())
+    return run
+
+
+@pytest.fixture(scope="module")
+def client(schema):
+    """main.app 的测试客户端，跳过登录校验；模块结束时还原依赖覆盖，不影响其他模块"""
+    from fastapi.testclient import TestClient
+
+    import main
+    from apis.user import get_current_user
+
+    with patch.dict(main.app.dependency_overrides, {get_current_user: lambda: None}):
+        yield TestClient(main.app)
+
+
+@pytest.fixture
+def collect(client):
+    """沿 next_cursor 翻完所有页：collect(path, params) -> (各页条目的 title, 最后一页的响应)"""
+    def walk(path, params):
+        titles, cursor = [], None
+        while True:
+            data = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}).json()
+            titles += [item["title"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return titles, data
+    return walk
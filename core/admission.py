@@ -0,0 +1,225 @@
+"""
+准入控制中间件（纯 ASGI）：按接口类别限制并发，有界排队，排不上时立即返回 503
+
+- 按方法和路径分类（路由匹配之前判断）:
+  write: 非 GET 请求（PUT /qa/、/ehs/lwd、/maint/*、导入等）
+  bulk:  /activities 与 */export 等大批量读取
+  read:  其余 GET
+  /metrics、/monitor、文档页面和 OPTIONS 预检不受限制
+- 所有类别共用 ADMISSION_MAX_CONCURRENCY 个处理名额（默认等于连接池容量），各类另有并发上限；
+  名额释放时按 write > read > bulk 的顺序放行排队请求，早高峰的看板刷新不会挤掉写入
+- 每类排队长度有上限，排满立即拒绝；排队超过 ADMISSION_QUEUE_TIMEOUT 秒同样拒绝，
+  请求不会在连接池和线程池前越堆越多、最后一起超时。拒绝返回 503 + Retry-After
+- 名额一直占用到响应最后一块发出（流式导出包含整个传输过程）
+- 只在事件循环线程中使用，不加锁
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import orjson
+
+from core.config import (
+    ADMISSION_BULK_CONCURRENCY, ADMISSION_BULK_QUEUE_SIZE, ADMISSION_CONTROL, ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_READ_CONCURRENCY, ADMISSION_RETRY_AFTER,
+    ADMISSION_WRITE_CONCURRENCY,
+)
+from core.metrics import Histogram, prometheus_header, prometheus_histogram, prometheus_sample
+
+# 不受准入控制的路径（监控抓取、文档），以及按前缀/后缀归入批量读取的路径
+EXEMPT_PATHS = ("/metrics", "/monitor", "/docs", "/redoc", "/openapi.json")
+BULK_PREFIXES = ("/activities",)
+BULK_SUFFIXES = ("/export",)
+READ_METHODS = ("GET", "HEAD")
+
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    # 放行顺序，数字小的先放行
+    priority: int
+    concurrency: int
+    queue_size: int
+
+
+DEFAULT_CLASSES = (
+    RouteClass("write", 0, ADMISSION_WRITE_CONCURRENCY, ADMISSION_QUEUE_SIZE),
+    RouteClass("read", 1, ADMISSION_READ_CONCURRENCY, ADMISSION_QUEUE_SIZE),
+    RouteClass("bulk", 2, ADMISSION_BULK_CONCURRENCY, ADMISSION_BULK_QUEUE_SIZE),
+)
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """返回请求的类别，不受控制的请求返回 None"""
+    if method == "OPTIONS" or path.startswith(EXEMPT_PATHS):
+        return None
+    if method not in READ_METHODS:
+        return "write"
+    if path.startswith(BULK_PREFIXES) or path.rstrip("/").endswith(BULK_SUFFIXES):
+        return "bulk"
+    return "read"
+
+
+class Rejected(Exception):
+    """未获准入：reason 为 queue_full（排队已满）或 timeout（排队超时）"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int = ADMISSION_MAX_CONCURRENCY, classes=DEFAULT_CLASSES,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.classes: Dict[str, RouteClass] = {route_class.name: route_class for route_class in classes}
+        # 放行顺序
+        self._order = sorted(self.classes.values(), key=lambda route_class: route_class.priority)
+        self.active_total = 0
+        self.active: Dict[str, int] = {name: 0 for name in self.classes}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in self.classes}
+        self.admitted: Dict[str, int] = {name: 0 for name in self.classes}
+        self.rejected: Dict[Tuple[str, str], int] = {}
+        self.queue_wait: Dict[str, Histogram] = {name: Histogram(QUEUE_WAIT_BUCKETS) for name in self.classes}
+
+    def _has_capacity(self, route_class: RouteClass) -> bool:
+        return self.active_total < self.max_concurrency and self.active[route_class.name] < route_class.concurrency
+
+    def _grant(self, name: str) -> None:
+        self.active_total += 1
+        self.active[name] += 1
+        self.admitted[name] += 1
+
+    def _reject(self, name: str, reason: str) -> Rejected:
+        key = (name, reason)
+        self.rejected[key] = self.rejected.get(key, 0) + 1
+        return Rejected(reason)
+
+    def _wake(self) -> None:
+        # 按优先级把空出来的名额分给排队的请求；名额在这里就记到请求名下，被唤醒前不会被新请求抢走
+        for route_class in self._order:
+            waiters = self._waiters[route_class.name]
+            while waiters and self._has_capacity(route_class):
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    self._grant(route_class.name)
+                    waiter.set_result(None)
+
+    async def acquire(self, name: str) -> None:
+        route_class = self.classes[name]
+        waiters = self._waiters[name]
+        # 空闲时不排队；有排队的请求说明名额已满（释放时会立即分配），新请求排到后面
+        if not waiters and self._has_capacity(route_class):
+            self._grant(name)
+            self.queue_wait[name].observe(0)
+            return
+        if len(waiters) >= route_class.queue_size:
+            raise self._reject(name, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 超时/取消的同时已被放行：名额还回去
+                self.release(name)
+            else:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject(name, "timeout")
+        self.queue_wait[name].observe(time.perf_counter() - started)
+
+    def release(self, name: str) -> None:
+        self.active_total -= 1
+        self.active[name] -= 1
+        self._wake()
+
+    def status(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": self.active_total,
+            "classes": {
+                name: {
+                    "concurrency": route_class.concurrency,
+                    "queue_size": route_class.queue_size,
+                    "active": self.active[name],
+                    "queued": len(self._waiters[name]),
+                    "admitted": self.admitted[name],
+                    "rejected": {reason: count for (key, reason), count in self.rejected.items() if key == name},
+                    "queue_wait_seconds": self.queue_wait[name].snapshot(),
+                }
+                for name, route_class in self.classes.items()
+            },
+        }
+
+    def render(self) -> str:
+        lines = prometheus_header("datalink_admission_active", "gauge", "正在处理的受控请求数")
+        lines += [prometheus_sample("datalink_admission_active", count, {"class": name})
+                  for name, count in self.active.items()]
+        lines += prometheus_header("datalink_admission_queued", "gauge", "排队等待处理的请求数")
+        lines += [prometheus_sample("datalink_admission_queued", len(waiters), {"class": name})
+                  for name, waiters in self._waiters.items()]
+        lines += prometheus_header("datalink_admission_admitted_total", "counter", "获准处理的请求数")
+        lines += [prometheus_sample("datalink_admission_admitted_total", count, {"class": name})
+                  for name, count in self.admitted.items()]
+        lines += prometheus_header("datalink_admission_rejected_total", "counter", "被拒绝（503）的请求数")
+        lines += [prometheus_sample("datalink_admission_rejected_total", count, {"class": name, "reason": reason})
+                  for (name, reason), count in sorted(self.rejected.items())]
+        lines += prometheus_header("datalink_admission_queue_wait_seconds", "histogram", "排队等待时间（秒）")
+        for name, histogram in self.queue_wait.items():
+            lines += prometheus_histogram("datalink_admission_queue_wait_seconds", histogram, {"class": name})
+        return "\n".join(lines) + "\n"
+
+
+# 中间件实例由 Starlette 创建，控制器放在模块级（/metrics 与 /monitor/admission 读取）
+admission = AdmissionController()
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, controller: AdmissionController = admission, enabled: bool = ADMISSION_CONTROL,
+                 retry_after: int = ADMISSION_RETRY_AFTER):
+        self.app = app
+        self.controller = controller
+        self.enabled = enabled
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        name = classify(scope["method"], scope["path"]) if scope["type"] == "http" and self.enabled else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.controller.acquire(name)
+        except Rejected as e:
+            await self._overloaded(send, e.reason)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+    async def _overloaded(self, send, reason: str) -> None:
+        detail = "服务繁忙，请稍后重试" if reason == "queue_full" else "排队等待超时，请稍后重试"
+        body = orjson.dumps({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
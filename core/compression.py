@@ -0,0 +1,240 @@
+"""
+响应压缩中间件（纯 ASGI，支持流式响应）
+
+- 按 Accept-Encoding 协商：安装了 brotli 时优先 br，否则 gzip；都不接受时原样返回
+- 小于 COMPRESSION_MIN_SIZE 的响应不压缩；流式响应先缓冲到阈值再决定，
+  之后每个分块压缩后立即 flush，客户端可以边收边解析（NDJSON/CSV 导出）
+- 只压缩文本类内容（JSON/CSV/NDJSON/text）；已编码、304/204、HEAD 请求原样返回
+- 按路由关闭：端点函数加 @skip_compression
+- 压缩后的表示与原始字节不同，强 ETag 改为弱 ETag（If-None-Match 按弱比较仍可命中 304）
+- 较大的整块响应在线程中压缩，避免阻塞事件循环（zlib/brotli 压缩时释放 GIL）
+"""
+import zlib
+from typing import Callable, List, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+from core.config import BROTLI_QUALITY, COMPRESSION_MIN_SIZE, GZIP_LEVEL
+
+try:
+    import brotli
+except ImportError:  # brotli 为可选依赖
+    brotli = None
+
+# 可压缩的内容类型
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml", "text/",
+)
+# 超过该大小的整块响应放到线程中压缩
+THREAD_THRESHOLD = 256 * 1024
+
+# 压缩统计（中间件实例由 Starlette 创建，统计放在模块级）
+stats = {"responses": 0, "compressed": 0, "streamed": 0, "skipped_small": 0, "bytes_in": 0, "bytes_out": 0}
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """路由装饰器：该接口的响应不压缩"""
+    endpoint._skip_compression = True
+    return endpoint
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31: 带 gzip 头和校验
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._c = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def negotiate(accept_encoding: str, allow_brotli: bool = True) -> Optional[str]:
+    """按 Accept-Encoding（含 q 值）选择编码，br 优先"""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip()] = q
+    for coding in (("br", "gzip") if allow_brotli and brotli is not None else ("gzip",)):
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = GZIP_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _Responder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+    def compressor(self, encoding: str):
+        return _Brotli(self.brotli_quality) if encoding == "br" else _Gzip(self.gzip_level)
+
+
+class _Responder:
+    """单个响应的压缩状态"""
+
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start = None
+        self.passthrough = False
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+        self.compressor = None
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            if not self._eligible(message["status"], headers):
+                self.passthrough = True
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            await self._stream(body, more_body)
+            return
+
+        # 尚未决定：缓冲到阈值或响应结束
+        self.pending.append(body)
+        self.pending_size += len(body)
+        if not more_body:
+            await self._send_whole(b"".join(self.pending))
+        elif self.pending_size >= self.middleware.minimum_size:
+            await self._begin_stream()
+
+    def _eligible(self, status: int, headers: Headers) -> bool:
+        stats["responses"] += 1
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        # 可压缩类型的响应都标注 Vary，避免共享缓存把压缩版本发给不支持的客户端
+        MutableHeaders(raw=self.start["headers"]).add_vary_header("Accept-Encoding")
+        if getattr(self.scope.get("endpoint"), "_skip_compression", False):
+            return False
+        length = headers.get("content-length")
+        if length is not None and int(length) < self.middleware.minimum_size:
+            stats["skipped_small"] += 1
+            return False
+        return True
+
+    def _encoded_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return headers
+
+    async def _send_whole(self, body: bytes) -> None:
+        if len(body) < self.middleware.minimum_size:
+            stats["skipped_small"] += 1
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        compressor = self.middleware.compressor(self.encoding)
+
+        def compress() -> bytes:
+            return compressor.compress(body) + compressor.finish()
+
+        compressed = await anyio.to_thread.run_sync(compress) if len(body) >= THREAD_THRESHOLD else compress()
+        headers = self._encoded_headers()
+        headers["Content-Length"] = str(len(compressed))
+        self._count(len(body), len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _begin_stream(self) -> None:
+        stats["streamed"] += 1
+        self.compressor = self.middleware.compressor(self.encoding)
+        headers = self._encoded_headers()
+        del headers["Content-Length"]
+        await self._send(self.start)
+        body = b"".join(self.pending)
+        self.pending = []
+        await self._stream(body, True)
+
+    async def _stream(self, body: bytes, more_body: bool) -> None:
+        if more_body:
+            compressed = self.compressor.compress(body) + self.compressor.flush()
+        else:
+            compressed = self.compressor.compress(body) + self.compressor.finish()
+        self._count(len(body), len(compressed), count_response=not more_body)
+        if compressed or not more_body:
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    @staticmethod
+    def _count(size_in: int, size_out: int, count_response: bool = True) -> None:
+        stats["bytes_in"] += size_in
+        stats["bytes_out"] += size_out
+        if count_response:
+            stats["compressed"] += 1
+
+
+def status() -> dict:
+    saved = stats["bytes_in"] - stats["bytes_out"]
+    return {
+        "brotli_available": brotli is not None,
+        **stats,
+        "ratio": round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None,
+        "bytes_saved": saved,
+    }
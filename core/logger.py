@@ -0,0 +1,107 @@
+"""
+按用途分文件的日志：logs/<name>.log 记录全部级别，logs/<name>_error.log 只记录 ERROR 及以上
+
+    logger = get_logger("datalink_request")
+
+- 记录时只把日志放入队列，格式化和写文件在后台线程中完成，不阻塞事件循环（请求日志每个请求两行）；
+  后台线程连续写入、队列取空时才 flush，高并发时不会每行一次系统调用
+- 同名日志只配置一次；日志目录不可写时退回根日志（控制台）
+"""
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from core.config import LOG_BACKUP_COUNT, LOG_DIR, LOG_MAX_BYTES
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(filename)s:%(lineno)d | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _BufferedFileHandler(RotatingFileHandler):
+    """逐条写入时不 flush，由后台线程在队列取空时统一 flush"""
+
+    def flush(self) -> None:
+        pass
+
+    def sync(self) -> None:
+        super().flush()
+
+
+class _QueueHandler(QueueHandler):
+    """入队时不预先格式化、不复制记录，格式化全部留给后台线程（日志参数不应在记录后被修改）"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _Listener(QueueListener):
+    def dequeue(self, block: bool):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            self.sync()
+            return self.queue.get(block)
+
+    def sync(self) -> None:
+        for handler in self.handlers:
+            handler.sync()
+
+    def stop(self) -> None:
+        super().stop()
+        self.sync()
+
+
+_listeners = []
+
+
+def _restart_after_fork() -> None:
+    # 后台线程不会随 fork 复制，子进程中重新启动，否则日志只入队不写出
+    for listener in _listeners:
+        listener._thread = None
+        listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def flush_logs() -> None:
+    """写完所有队列中的日志（测试读取日志文件前调用）"""
+    for listener in _listeners:
+        listener.stop()
+        listener.start()
+
+
+def _file_handler(path: str, level: int) -> logging.Handler:
+    handler = _BufferedFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+    return handler
+
+
+def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
+    logger = logging.getLogger(name)
+    if getattr(logger, "_datalink_configured", False):
+        return logger
+    logger.setLevel(level)
+    try:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        handlers = (
+            _file_handler(os.path.join(LOG_DIR, f"{name}.log"), level),
+            _file_handler(os.path.join(LOG_DIR, f"{name}_error.log"), logging.ERROR),
+        )
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"无法写入日志目录 {LOG_DIR}: {e}")
+    else:
+        records = queue.SimpleQueue()
+        listener = _Listener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+        # 退出时写完队列中剩余的日志
+        atexit.register(listener.stop)
+        logger.addHandler(_QueueHandler(records))
+        logger.propagate = False
+    logger._datalink_configured = True
+    return logger
@@ -0,0 +1,65 @@
+import threading
+from bisect import bisect_left
+
+# 默认的耗时分桶（毫秒）
+DEFAULT_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """线程安全的固定分桶直方图（累计计数，与 Prometheus 语义一致）"""
+
+    def __init__(self, buckets=DEFAULT_MS_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, n in zip(self.buckets, counts):
+            running += n
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": count, "sum": round(total, 3)}
+
+
+# ---- Prometheus 文本格式 ----
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def prometheus_header(name: str, kind: str, help_text: str) -> list:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def prometheus_sample(name: str, value, labels: dict = None) -> str:
+    return f"{name}{_labels(labels or {})} {value}"
+
+
+def prometheus_histogram(name: str, histogram: Histogram, labels: dict = None) -> list:
+    """一个直方图的 _bucket / _sum / _count 行"""
+    snapshot = histogram.snapshot()
+    labels = labels or {}
+    lines = [prometheus_sample(f"{name}_bucket", count, {**labels, "le": bound})
+             for bound, count in snapshot["buckets"].items()]
+    lines.append(prometheus_sample(f"{name}_sum", snapshot["sum"], labels))
+    lines.append(prometheus_sample(f"{name}_count", snapshot["count"], labels))
+    return lines
@@ -0,0 +1,179 @@
+"""
+游标（keyset）分页工具
+
+- 游标是排序键的 base64 编码，对客户端不透明
+- 降序时下一页条件为 (k1, k2, ...) < 游标值，升序时为 > 游标值
+- 可空的排序列按 NULL 最小处理（与 MySQL / SQLite 的默认排序一致）：升序时 NULL 在最前，降序时在最后；
+  非空列的游标值为 NULL 时抛出 ValueError
+- 总数默认给估算值或不计算，需要精确值时由调用方显式请求
+"""
+import base64
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, false, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# 非 MySQL 时估算总数最多数到这里
+ESTIMATE_COUNT_CAP = 10000
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"d": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+        return datetime.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    payload = {key: _encode_value(value) for key, value in values.items()}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _valid_value(value, column) -> bool:
+    """游标值与排序列的类型一致；NULL 只允许出现在可空列上"""
+    if value is None:
+        return _nullable(column)
+    expected = column.type.python_type
+    if expected is date:
+        return isinstance(value, date) and not isinstance(value, datetime)
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def decode_cursor(cursor: str, keys: Sequence[str], columns: Optional[Sequence] = None) -> Dict[str, Any]:
+    """解码游标；给出 columns（与 keys 一一对应）时按列校验类型与是否可空，不合法的游标一律返回 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = {key: _decode_value(payload[key]) for key in keys}
+    except Exception:
+        values = None
+    if values is None or (columns is not None and not all(
+        _valid_value(values[key], column) for key, column in zip(keys, columns)
+    )):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+    return values
+
+
+def _nullable(column) -> bool:
+    # ORM 属性取其对应的 Column
+    return bool(getattr(getattr(column, "expression", column), "nullable", False))
+
+
+def _beyond(column, value, descending: bool):
+    """排在 value 之后的行，NULL 视为最小值"""
+    if value is None:
+        # 降序时 NULL 已在最后；升序时之后是所有非空值
+        return false() if descending else column.is_not(None)
+    if descending:
+        beyond = column < value
+        return or_(beyond, column.is_(None)) if _nullable(column) else beyond
+    return column > value
+
+
+def _keyset(columns: Sequence, values: Sequence, descending: bool):
+    for column, value in zip(columns, values):
+        if value is None and not _nullable(column):
+            raise ValueError(f"游标分页的排序列不能为 NULL: {column}")
+    clauses = []
+    for index, column in enumerate(columns):
+        equal = [columns[i].is_(None) if values[i] is None else columns[i] == values[i] for i in range(index)]
+        clauses.append(and_(*equal, _beyond(column, values[index], descending)))
+    return or_(*clauses)
+
+
+def keyset_before(columns: Sequence, values: Sequence):
+    """
+    降序排序下位于游标之后的行：按列依次展开为 OR 条件，MySQL 可以走复合索引的范围扫描
+
+    columns 的最后一列须唯一且非空；可空列的 NULL 按最小值处理，非空列的值为 None 时抛出 ValueError
+    """
+    return _keyset(columns, values, descending=True)
+
+
+def keyset_after(columns: Sequence, values: Sequence):
+    """升序排序下位于游标之后的行，对 columns / values 的要求同 keyset_before"""
+    return _keyset(columns, values, descending=False)
+
+
+async def exact_count(db: AsyncSession, stmt) -> int:
+    return (await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))).scalar_one()
+
+
+async def estimate_count(db: AsyncSession, stmt, cap: int = ESTIMATE_COUNT_CAP) -> int:
+    """
+    估算总数：MySQL 取 EXPLAIN 的扫描行数估计，不实际扫描；
+    其他数据库最多数 cap 行，结果不超过 cap
+    """
+    stmt = stmt.order_by(None)
+    bind = db.bind
+    if bind.dialect.name == "mysql":
+        try:
+            # 按驱动的位置参数执行，LIKE 中的 % 由驱动处理
+            compiled = stmt.compile(dialect=bind.dialect)
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            conn = await db.connection()
+            row = (await conn.exec_driver_sql(f"EXPLAIN {compiled}", params)).mappings().first()
+            if row is not None and row.get("rows") is not None:
+                return int(row["rows"])
+        except Exception as e:
+            logger.warning(f"EXPLAIN 估算行数失败，改为限量计数: {str(e)}")
+    return (await db.execute(select(func.count()).select_from(stmt.limit(cap).subquery()))).scalar_one()
+
+
+def next_cursor(rows: Sequence, limit: int, keys: Sequence[str]) -> Optional[str]:
+    """rows 多取一行用于判断是否还有下一页"""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor({key: getattr(last, key) for key in keys})
+
+
+async def keyset_page(
+    db: AsyncSession,
+    view,
+    query,
+    columns: Sequence,
+    keys: Sequence[str],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    include_total: bool = False,
+) -> Dict[str, Any]:
+    """
+    按 columns 排序的游标分页，返回 schemas.pagination.Page 结构的字典
+
+    view: db.readonly.RowView，query 为 view.select() 加上筛选条件；
+    keys 为 columns 在 DTO 上对应的字段名，最后一列应唯一（通常为 id）；
+    可空列按数据库默认顺序排序（NULL 最小），翻页条件与之一致
+    """
+    total = await exact_count(db, query) if include_total else None
+    page = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+    if cursor:
+        after = decode_cursor(cursor, keys, columns)
+        values = [after[key] for key in keys]
+        page = page.where(keyset_before(columns, values) if descending else keyset_after(columns, values))
+    items = await view.fetch(db, page.limit(limit + 1))
+    return {
+        "total": total,
+        "items": items[:limit],
+        "next_cursor": next_cursor(items, limit, keys),
+        "total_is_estimate": False,
+    }
@@ -0,0 +1,323 @@
+"""
+看板读缓存（read-through）
+
+- 键按 模块 + 周期 组织: {prefix}:{module}:{period}:{参数}
+- 共享存储: Redis（配置 REDIS_URL）；未配置或未安装 redis 时使用行为一致的进程内后端
+- 每个进程另有一层短 TTL 的本地缓存，写操作失效时通过 pub/sub 通知所有 worker 清理本地缓存
+- 过期后在 stale 窗口内先返回旧值，同时后台刷新（stale-while-revalidate）
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.config import REDIS_URL, CACHE_PREFIX, CACHE_DEFAULT_TTL, CACHE_STALE_TTL, CACHE_LOCAL_TTL
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = f"{CACHE_PREFIX}:cache:invalidate"
+
+
+class MemoryBackend:
+    """进程内后端，接口与 RedisBackend 一致，用于测试和未部署 Redis 的环境"""
+
+    def __init__(self):
+        self._data: Dict[str, tuple] = {}
+        self._subscribers: Dict[str, list] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expire_at = item
+        if expire_at <= time.time():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._data[key] = (value, time.time() + ttl)
+
+    async def delete_pattern(self, pattern: str) -> int:
+        keys = [key for key in self._data if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    async def publish(self, channel: str, message: str) -> None:
+        for callback in list(self._subscribers.get(channel, [])):
+            callback(message)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    async def unsubscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        if callback in self._subscribers.get(channel, []):
+            self._subscribers[channel].remove(callback)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisBackend:
+    """Redis 后端"""
+
+    def __init__(self, url: str):
+        # 只在配置了 REDIS_URL 时导入 redis 客户端（导入耗时约 60ms）
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self._pubsub = None
+        self._callbacks: Dict[str, list] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def delete_pattern(self, pattern: str) -> int:
+        keys = [key async for key in self._redis.scan_iter(match=pattern, count=500)]
+        if keys:
+            await self._redis.unlink(*keys)
+        return len(keys)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await self._redis.publish(channel, message)
+
+    async def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        # 所有频道共用一个 pubsub 连接，按频道分发
+        self._callbacks.setdefault(channel, []).append(callback)
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(channel)
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    for callback in list(self._callbacks.get(message["channel"], [])):
+                        callback(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"缓存失效订阅出错: {str(e)}")
+                await asyncio.sleep(1)
+
+    async def unsubscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        callbacks = self._callbacks.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks and self._pubsub is not None:
+            self._callbacks.pop(channel, None)
+            await self._pubsub.unsubscribe(channel)
+        if not self._callbacks:
+            if self._listener is not None:
+                self._listener.cancel()
+                self._listener = None
+            if self._pubsub is not None:
+                await self._pubsub.aclose()
+                self._pubsub = None
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """缓存键：模块 + 周期 + 参数"""
+    module: str
+    period: str = "all"
+    params: str = ""
+
+    def render(self, prefix: str) -> str:
+        return f"{prefix}:{self.module}:{self.period}:{self.params}"
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    fresh_until: float
+    expires_at: float
+
+
+class Cache:
+    """两级 read-through 缓存"""
+
+    def __init__(self, backend, prefix: str = CACHE_PREFIX, local_ttl: float = CACHE_LOCAL_TTL):
+        self.backend = backend
+        self.prefix = prefix
+        self.local_ttl = local_ttl
+        self.instance_id = uuid.uuid4().hex
+        self._local: Dict[str, _LocalEntry] = {}
+        self._inflight: Dict[str, tuple] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        # 每次失效递增，用于丢弃失效前发起、失效后才完成的加载结果
+        self._epoch = 0
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "invalidations": 0, "errors": 0}
+
+    # ---- 生命周期 ----
+    async def start(self) -> None:
+        await self.backend.subscribe(INVALIDATION_CHANNEL, self._on_invalidation)
+
+    async def close(self) -> None:
+        await self.backend.unsubscribe(INVALIDATION_CHANNEL, self._on_invalidation)
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.backend.close()
+
+    # ---- 读 ----
+    async def get_or_load(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float = CACHE_DEFAULT_TTL,
+        stale_ttl: float = CACHE_STALE_TTL,
+    ):
+        """
+        读取缓存，未命中时调用 loader 加载并写回
+
+        loader 会在请求结束后（后台刷新时）被调用，因此必须自行打开数据库会话，
+        返回值必须可被 json 序列化。
+        """
+        full_key = key.render(self.prefix)
+        entry = await self._lookup(full_key)
+        if entry is not None:
+            if time.time() < entry.fresh_until:
+                self.stats["hits"] += 1
+                return entry.value
+            # 已过期但仍在 stale 窗口内：先返回旧值，后台刷新
+            self.stats["stale_hits"] += 1
+            self._schedule_refresh(full_key, loader, ttl, stale_ttl)
+            return entry.value
+
+        self.stats["misses"] += 1
+        return await self._load(full_key, loader, ttl, stale_ttl)
+
+    async def _lookup(self, full_key: str) -> Optional[_LocalEntry]:
+        now = time.time()
+        entry = self._local.get(full_key)
+        if entry is not None and entry.expires_at > now:
+            return entry
+        try:
+            raw = await self.backend.get(full_key)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"读取缓存失败 {full_key}: {str(e)}")
+            return None
+        if raw is None:
+            self._local.pop(full_key, None)
+            return None
+        payload = json.loads(raw)
+        entry = _LocalEntry(
+            value=payload["v"],
+            fresh_until=payload["f"],
+            expires_at=min(now + self.local_ttl, payload["s"]),
+        )
+        self._local[full_key] = entry
+        return entry
+
+    async def _load(self, full_key, loader, ttl, stale_ttl):
+        # 同一个键同时只加载一次，避免缓存击穿；失效前发起的加载不与失效后的请求共享结果
+        inflight = self._inflight.get(full_key)
+        if inflight is not None and inflight[0] == self._epoch:
+            return await asyncio.shield(inflight[1])
+
+        epoch = self._epoch
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[full_key] = (epoch, future)
+        try:
+            value = await loader()
+            if epoch == self._epoch:
+                await self._store(full_key, value, ttl, stale_ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # 避免 "Future exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(full_key, (None, None))[1] is future:
+                del self._inflight[full_key]
+
+    def _schedule_refresh(self, full_key, loader, ttl, stale_ttl) -> None:
+        if full_key in self._refreshing or full_key in self._inflight:
+            return
+
+        async def _refresh():
+            try:
+                await self._load(full_key, loader, ttl, stale_ttl)
+            except Exception as e:
+                # 刷新失败时继续提供旧值，直到 stale 窗口结束
+                self.stats["errors"] += 1
+                logger.error(f"后台刷新缓存失败 {full_key}: {str(e)}")
+            finally:
+                self._refreshing.pop(full_key, None)
+
+        self._refreshing[full_key] = asyncio.create_task(_refresh())
+
+    async def _store(self, full_key, value, ttl, stale_ttl) -> None:
+        now = time.time()
+        fresh_until = now + ttl
+        stale_until = fresh_until + stale_ttl
+        self._local[full_key] = _LocalEntry(value, fresh_until, min(now + self.local_ttl, stale_until))
+        try:
+            payload = json.dumps({"v": value, "f": fresh_until, "s": stale_until}, ensure_ascii=False, default=str)
+            await self.backend.set(full_key, payload, ttl + stale_ttl)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"写入缓存失败 {full_key}: {str(e)}")
+
+    # ---- 失效 ----
+    async def invalidate(self, module: str, period: Optional[str] = None) -> None:
+        """使 模块（+周期）下的所有缓存失效，并通知其他 worker"""
+        pattern = f"{self.prefix}:{module}:{period if period is not None else '*'}:*"
+        self._drop_local(pattern)
+        self.stats["invalidations"] += 1
+        try:
+            await self.backend.delete_pattern(pattern)
+            await self.backend.publish(
+                INVALIDATION_CHANNEL,
+                json.dumps({"pattern": pattern, "origin": self.instance_id}),
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"缓存失效失败 {pattern}: {str(e)}")
+
+    def _on_invalidation(self, message: str) -> None:
+        data = json.loads(message)
+        if data.get("origin") != self.instance_id:
+            self._drop_local(data["pattern"])
+
+    def _drop_local(self, pattern: str) -> None:
+        self._epoch += 1
+        for full_key in [k for k in self._local if fnmatch.fnmatchcase(k, pattern)]:
+            del self._local[full_key]
+
+    def status(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "local_entries": len(self._local),
+            **self.stats,
+        }
+
+
+def create_backend(url: Optional[str] = REDIS_URL):
+    if url:
+        try:
+            return RedisBackend(url)
+        except ImportError:  # redis 为可选依赖
+            logger.warning("已配置 REDIS_URL 但未安装 redis 包，使用进程内缓存")
+    return MemoryBackend()
+
+
+cache = Cache(create_backend())
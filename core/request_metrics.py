@@ -0,0 +1,166 @@
+"""
+请求指标中间件（纯 ASGI）与 Prometheus 文本格式输出
+
+- 按 方法 + 路由模板（/qa/{qa_id}，不是实际路径）统计耗时直方图和响应大小直方图，
+  按 方法 + 路由模板 + 状态码 计数；未匹配任何路由的请求归入 <unmatched>，避免扫描类请求撑大序列数
+- 耗时从收到请求到响应体最后一块发出为止（流式导出包含整个传输过程）；响应大小为实际发出的字节数（压缩后）
+- 同时记录 开始处理 / 完成处理 两行请求日志到 logs/datalink_request.log（REQUEST_LOG=false 关闭）
+- 统计每个请求的 SQL 次数与数据库耗时（db/query_metrics），写入 Server-Timing 响应头并按路由汇总；
+  流式响应在响应头发出后执行的查询只计入指标；超出时间预算被中止的语句（db/statement_timeout）按路由计数
+- 每个请求只有两次计时、几次字典查找和计数，可以在生产环境常开
+"""
+import time
+from typing import Dict, Tuple
+
+from core.config import REQUEST_LOG
+from core.logger import get_logger
+from core.metrics import Histogram, prometheus_header, prometheus_histogram, prometheus_sample
+from db.query_metrics import QueryStats, begin_request, end_request
+
+logger = get_logger("datalink_request")
+
+# 耗时分桶（秒）与响应大小分桶（字节）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+UNMATCHED = "<unmatched>"
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.size: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.db_latency: Dict[Tuple[str, str], Histogram] = {}
+        self.n_plus_one: Dict[Tuple[str, str], int] = {}
+        self.db_timeouts: Dict[Tuple[str, str], int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, size: int, db: QueryStats) -> None:
+        # 只在事件循环线程中调用，计数不加锁；直方图自身线程安全
+        key = (method, route)
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.size[key] = Histogram(SIZE_BUCKETS)
+            self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+            self.db_latency[key] = Histogram(DB_LATENCY_BUCKETS)
+        latency.observe(seconds)
+        self.size[key].observe(size)
+        self.queries[key].observe(db.count)
+        self.db_latency[key].observe(db.duration_ms / 1000)
+        if db.repeated:
+            self.n_plus_one[key] = self.n_plus_one.get(key, 0) + len(db.repeated)
+        if db.timeouts:
+            self.db_timeouts[key] = self.db_timeouts.get(key, 0) + db.timeouts
+        counter = (method, route, status)
+        self.requests[counter] = self.requests.get(counter, 0) + 1
+
+    def render(self) -> str:
+        lines = prometheus_header("datalink_http_requests_in_flight", "gauge", "正在处理的请求数")
+        lines.append(prometheus_sample("datalink_http_requests_in_flight", self.in_flight))
+        lines += prometheus_header("datalink_http_requests_total", "counter", "按路由和状态码统计的请求数")
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(prometheus_sample(
+                "datalink_http_requests_total", count, {"method": method, "route": route, "status": status}
+            ))
+        lines += prometheus_header("datalink_http_request_duration_seconds", "histogram", "请求处理耗时（秒）")
+        for (method, route), histogram in sorted(self.latency.items()):
+            lines += prometheus_histogram(
+                "datalink_http_request_duration_seconds", histogram, {"method": method, "route": route}
+            )
+        lines += prometheus_header("datalink_http_response_size_bytes", "histogram", "响应体大小（字节，压缩后）")
+        for (method, route), histogram in sorted(self.size.items()):
+            lines += prometheus_histogram(
+                "datalink_http_response_size_bytes", histogram, {"method": method, "route": route}
+            )
+        lines += prometheus_header("datalink_db_queries_per_request", "histogram", "每个请求执行的 SQL 条数")
+        for (method, route), histogram in sorted(self.queries.items()):
+            lines += prometheus_histogram(
+                "datalink_db_queries_per_request", histogram, {"method": method, "route": route}
+            )
+        lines += prometheus_header("datalink_db_duration_seconds", "histogram", "每个请求的数据库耗时（秒）")
+        for (method, route), histogram in sorted(self.db_latency.items()):
+            lines += prometheus_histogram(
+                "datalink_db_duration_seconds", histogram, {"method": method, "route": route}
+            )
+        lines += prometheus_header("datalink_db_n_plus_one_total", "counter", "疑似 N+1 的重复语句数")
+        for (method, route), count in sorted(self.n_plus_one.items()):
+            lines.append(prometheus_sample("datalink_db_n_plus_one_total", count, {"method": method, "route": route}))
+        lines += prometheus_header("datalink_db_statement_timeouts_total", "counter", "超出时间预算被中止的语句数")
+        for (method, route), count in sorted(self.db_timeouts.items()):
+            lines.append(prometheus_sample(
+                "datalink_db_statement_timeouts_total", count, {"method": method, "route": route}
+            ))
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.latency.clear()
+        self.size.clear()
+        self.queries.clear()
+        self.db_latency.clear()
+        self.n_plus_one.clear()
+        self.db_timeouts.clear()
+
+
+# 中间件实例由 Starlette 创建，指标放在模块级
+request_metrics = RequestMetrics()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # /docs、/openapi.json 等 Starlette 路由没有 route，路径本身是固定的
+    return scope["path"] if "endpoint" in scope else UNMATCHED
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app, metrics: RequestMetrics = request_metrics, log_requests: bool = REQUEST_LOG):
+        self.app = app
+        self.metrics = metrics
+        self.log_requests = log_requests
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if self.log_requests:
+            client = scope.get("client")
+            logger.info(f"开始处理 {method} {scope['path']} - 客户端: {client[0] if client else '-'}")
+        status = 500
+        size = 0
+        finished = None
+        db, token = begin_request(f"{method} {scope['path']}")
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, size, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", f"{db.server_timing()}, app;dur={app_ms:.1f}".encode()),
+                ]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished = time.perf_counter()
+            await send(message)
+
+        self.metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_flight -= 1
+            elapsed = (finished or time.perf_counter()) - started
+            end_request(db, token)
+            self.metrics.observe(method, route_template(scope), status, elapsed, size, db)
+            if self.log_requests:
+                logger.info(f"完成处理 {method} {scope['path']} - 状态码: {status} - 处理时间: {elapsed:.3f}s")
@@ -0,0 +1,42 @@
+"""
+响应编码快速路径
+
+- 应用默认响应类为 ORJSONResponse（main.py），由 orjson 编码，date/datetime 直接输出 ISO 格式
+- validated_response(): 数据已经校验过（schema 实例、schema.model_dump() 的结果或由其写入的缓存）时
+  直接编码返回。路由返回 Response 实例时 FastAPI 跳过 response_model 的二次校验与转换，
+  response_model 仍用于生成接口文档，调用方需保证返回内容与其一致。
+- conditional_response(): 轮询接口的条件 GET，ETag 未变化时返回 304，不调用 load()
+"""
+from typing import Any, Awaitable, Callable, Mapping, Optional, Sequence
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from core.versions import table_versions
+
+
+def validated_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> ORJSONResponse:
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    elif isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        content = [item.model_dump() for item in content]
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
+
+
+async def conditional_response(
+    request: Request,
+    tables: Sequence[str],
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+) -> Response:
+    """
+    tables: 结果依赖的表；key: 决定结果的全部参数（含按当前日期推导的年份等隐含参数），
+    通常直接用缓存键。load() 返回已校验的数据，与 validated_response 相同
+    """
+    validators = await table_versions.validators(tables, f"{request.url.path}|{key}")
+    headers = validators.headers()
+    if validators.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        table_versions.stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    return validated_response(await load(), headers=headers)
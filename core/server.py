@@ -0,0 +1,35 @@
+"""
+服务进程入口：python main.py（Dockerfile 同样使用）
+
+- WORKERS>1 时由 uvicorn 启动多个 worker 进程（spawn，各自导入 main 并创建自己的引擎与连接池），
+  主进程只负责监听端口、分发连接和在 worker 异常退出时重启
+- 每个 worker 的 lifespan 负责启动/关闭各自的连接池、缓存订阅、活动日志写入器
+- 收到 SIGTERM/SIGINT 后停止接受新连接，最多等待 GRACEFUL_SHUTDOWN_TIMEOUT 秒让处理中的请求完成，
+  再执行 lifespan 关闭阶段（写完活动日志队列、关闭连接池）
+- 多 worker 时缓存与条件 GET 的表版本必须放在 Redis 中，否则一个 worker 的写入不会让其他 worker 的缓存失效
+"""
+from core.config import (
+    ALLOW_LOCAL_CACHE_WITH_WORKERS, GRACEFUL_SHUTDOWN_TIMEOUT, HOST, PORT, REDIS_URL, WORKERS,
+)
+
+
+def check_workers(workers: int = WORKERS) -> None:
+    if workers > 1 and not REDIS_URL and not ALLOW_LOCAL_CACHE_WITH_WORKERS:
+        raise SystemExit(
+            f"WORKERS={workers} 需要配置 REDIS_URL：进程内缓存和表版本不在 worker 之间共享，"
+            "写入后其他 worker 会继续返回旧数据（确认可以接受时设置 ALLOW_LOCAL_CACHE_WITH_WORKERS=true）"
+        )
+
+
+def run(app=None) -> None:
+    """app 为已创建的应用（python main.py 时传入）；多 worker 时各进程按导入路径重新导入 main"""
+    import uvicorn
+
+    check_workers()
+    uvicorn.run(
+        app if app is not None and WORKERS == 1 else "main:app",
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
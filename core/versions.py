@@ -0,0 +1,110 @@
+"""
+表版本水位与条件 GET（ETag / Last-Modified / 304）
+
+- 每张表一个版本水位（纳秒时间戳），写操作提交并失效缓存后调用 bump() 推进
+- 水位保存在缓存后端（配置 REDIS_URL 时为 Redis，各 worker 共享；否则为进程内）
+- 读接口的强 ETag = hash(接口路径 + 缓存键/查询参数 + 相关表水位)；
+  If-None-Match 命中时直接返回 304，不查库也不读缓存数据
+- 必须先读水位再加载数据：加载期间发生写入时，新数据配旧 ETag，客户端下次轮询会拿到 200，不会长期停留在旧数据
+- 水位按 ETAG_VERSION_TTL 过期后重新生成，ETag 随之改变（只会多返回一次 200）
+"""
+import hashlib
+import logging
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Sequence
+
+from core.config import CACHE_PREFIX, ETAG_VERSION_TTL
+from core.redis import cache
+
+logger = logging.getLogger(__name__)
+
+
+class TableVersions:
+    def __init__(self, backend, prefix: str = CACHE_PREFIX, ttl: float = ETAG_VERSION_TTL):
+        self.backend = backend
+        self.prefix = prefix
+        self.ttl = ttl
+        self.stats = {"bumps": 0, "checks": 0, "not_modified": 0, "errors": 0}
+
+    def _key(self, table: str) -> str:
+        return f"{self.prefix}:version:{table}"
+
+    async def bump(self, *tables: str) -> None:
+        """推进表的版本水位，在事务提交之后调用"""
+        for table in tables:
+            key = self._key(table)
+            try:
+                current = await self.backend.get(key)
+                # 时钟回拨时仍保证递增
+                version = max(time.time_ns(), int(current) + 1 if current else 0)
+                await self.backend.set(key, str(version), self.ttl)
+                self.stats["bumps"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"更新表版本失败 {table}: {str(e)}")
+
+    async def current(self, tables: Iterable[str]) -> Dict[str, int]:
+        """读取表的版本水位，没有记录时以当前时间初始化"""
+        versions = {}
+        for table in tables:
+            key = self._key(table)
+            raw = await self.backend.get(key)
+            if raw is None:
+                raw = str(time.time_ns())
+                await self.backend.set(key, raw, self.ttl)
+            versions[table] = int(raw)
+        return versions
+
+    async def validators(self, tables: Sequence[str], key: str) -> "Validators":
+        self.stats["checks"] += 1
+        try:
+            versions = await self.current(tables)
+        except Exception as e:
+            # 后端不可用时不做条件判断，按普通请求处理
+            self.stats["errors"] += 1
+            logger.error(f"读取表版本失败 {tables}: {str(e)}")
+            return Validators(None, None)
+        digest = hashlib.sha1(key.encode())
+        for table in sorted(versions):
+            digest.update(f"|{table}={versions[table]}".encode())
+        return Validators(f'"{digest.hexdigest()[:32]}"', max(versions.values()) / 1e9)
+
+    def status(self) -> dict:
+        return dict(self.stats)
+
+
+class Validators:
+    """一次读请求的 ETag 与最后修改时间（秒）"""
+
+    def __init__(self, etag: Optional[str], modified_at: Optional[float]):
+        self.etag = etag
+        self.modified_at = modified_at
+
+    def headers(self) -> Dict[str, str]:
+        if self.etag is None:
+            return {}
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        # 水位所在的这一秒内仍可能有写入，此时不给 Last-Modified，避免秒级精度导致误判未修改
+        if int(self.modified_at) < int(time.time()):
+            headers["Last-Modified"] = formatdate(int(self.modified_at), usegmt=True)
+        return headers
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        if self.etag is None:
+            return False
+        # 同时提供时只看 If-None-Match（RFC 9110 13.2.2）
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            return self.etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.modified_at) <= since < int(time.time())
+        return False
+
+
+table_versions = TableVersions(cache.backend)
@@ -1,15 +1,120 @@
+import asyncio
+import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from core.config import SQLALCHEMY_DATABASE_URL
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from core.config import (
+    SQLALCHEMY_DATABASE_URL, ASYNC_DATABASE_URL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING, DB_POOL_WARMUP,
+)
+from db.pool_metrics import PoolMetrics, timed_pool_class, attach_pool_events, pool_status
+from db.query_metrics import attach_query_events
+from db.statement_timeout import attach_statement_timeouts
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# 同步驱动 -> 异步驱动
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """把同步连接串转换为对应的异步驱动连接串"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"不支持的异步数据库类型: {backend}")
+    return parsed.set(drivername=_ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _pool_options(url: str, base_pool, metrics: PoolMetrics) -> dict:
+    """根据配置生成连接池参数；内存 SQLite 只能使用单连接池，不做定制"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": timed_pool_class(base_pool, metrics),
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+_ASYNC_URL = ASYNC_DATABASE_URL or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+sync_pool_metrics = PoolMetrics("sync")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_pool_options(SQLALCHEMY_DATABASE_URL, QueuePool, sync_pool_metrics))
+attach_pool_events(engine, sync_pool_metrics)
+attach_query_events(engine)
+attach_statement_timeouts(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 异步引擎，供 async def 路由使用，避免阻塞事件循环
+async_pool_metrics = PoolMetrics("async")
+async_engine = create_async_engine(_ASYNC_URL, **_pool_options(_ASYNC_URL, AsyncAdaptedQueuePool, async_pool_metrics))
+attach_pool_events(async_engine, async_pool_metrics)
+attach_query_events(async_engine)
+attach_statement_timeouts(async_engine)
+# expire_on_commit=False: 提交后仍可直接读取对象属性，不会触发隐式的懒加载 IO
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def _reset_pools_after_fork() -> None:
+    """
+    fork 出的子进程（gunicorn --preload 等）不能复用父进程连接池中的套接字：
+    丢弃继承来的连接池（close=False 不关闭父进程仍在使用的连接），子进程按需新建。
+    uvicorn --workers 以 spawn 方式启动 worker，每个进程导入时各自创建引擎，不受影响。
+    """
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+async def close_pools() -> None:
+    """进程退出前关闭连接池中的所有连接（lifespan 关闭阶段最后调用）"""
+    await async_engine.dispose()
+    await asyncio.to_thread(engine.dispose)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _warm_up_sync_pool(count: int) -> None:
+    conns = [engine.connect() for _ in range(count)]
+    for conn in conns:
+        conn.close()
+
+async def warm_up_pools(count: int = DB_POOL_WARMUP) -> None:
+    """启动时预先建立连接，避免第一波请求同时建连；同步、异步连接池并行建连，缩短启动时间"""
+    count = min(count, DB_POOL_SIZE)
+    if count <= 0:
+        return
+    async_conns = []
+
+    async def connect():
+        async_conns.append(await async_engine.connect().start())
+
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(_warm_up_sync_pool, count),
+            *(connect() for _ in range(count)),
+        )
+    finally:
+        for conn in async_conns:
+            await conn.close()
+
+def get_pool_status() -> dict:
+    return {
+        "sync": pool_status(engine),
+        "async": pool_status(async_engine),
+    }
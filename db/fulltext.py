@@ -0,0 +1,54 @@
+"""
+全文索引 DDL
+
+- MySQL: InnoDB FULLTEXT 索引 + ngram 分词（按二元组切分，支持中文）
+- SQLite: FTS5 外部内容表 <表名>_fts（trigram 分词），由触发器随源表增删改同步
+
+索引由数据库在每次写入时维护，路由、活动日志批量写入以及脚本写库都无需额外处理。
+新库由 python -m db.init_db 随建表（create_all）一起创建；已有数据库通过 alembic 迁移创建。
+"""
+from typing import Dict, List, Sequence
+
+from sqlalchemy import DDL, Table, event
+
+# 表名 -> 参与全文检索的列
+FULLTEXT_COLUMNS: Dict[str, Sequence[str]] = {}
+
+
+def fulltext_index_name(table_name: str) -> str:
+    return f"ft_{table_name}"
+
+
+def fts_table_name(table_name: str) -> str:
+    return f"{table_name}_fts"
+
+
+def mysql_fulltext_ddl(table_name: str, columns: Sequence[str]) -> str:
+    cols = ", ".join(f"`{c}`" for c in columns)
+    return f"CREATE FULLTEXT INDEX {fulltext_index_name(table_name)} ON `{table_name}` ({cols}) WITH PARSER ngram"
+
+
+def sqlite_fts_ddl(table_name: str, columns: Sequence[str]) -> List[str]:
+    """FTS5 表与同步触发器，每条一个语句"""
+    fts = fts_table_name(table_name)
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table_name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table_name} BEGIN {insert_new} END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table_name} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table_name} BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def fulltext_index(table: Table, columns: Sequence[str]) -> None:
+    """为模型表注册全文索引，随 create_all / drop_all 一起创建和删除"""
+    FULLTEXT_COLUMNS[table.name] = tuple(columns)
+    event.listen(table, "after_create", DDL(mysql_fulltext_ddl(table.name, columns)).execute_if(dialect="mysql"))
+    for statement in sqlite_fts_ddl(table.name, columns):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    # 触发器随源表一起删除，FTS 表需要单独删除
+    event.listen(table, "after_drop", DDL(f"DROP TABLE IF EXISTS {fts_table_name(table.name)}").execute_if(dialect="sqlite"))
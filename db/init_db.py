@@ -0,0 +1,40 @@
+"""
+新数据库建表
+
+    python -m db.init_db
+
+按当前模型建表（包括 db/fulltext.py 的全文索引），并把数据库标记为 Alembic 最新版本（stamp head），
+以后的结构变更照常 alembic upgrade head。历史迁移的初始版本为空，无法在空库上执行，新库需用此命令建表。
+已有表的数据库不做任何修改，请使用 alembic upgrade head。
+"""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def init_db(engine: Engine) -> bool:
+    """空库建表并标记为最新版本，返回是否建表；库中已有表时返回 False"""
+    import models  # noqa: F401  注册全部模型
+
+    if inspect(engine).get_table_names():
+        return False
+    with engine.begin() as connection:
+        models.Base.metadata.create_all(bind=connection)
+        config = Config(ALEMBIC_INI)
+        config.attributes["connection"] = connection
+        command.stamp(config, "head")
+    return True
+
+
+if __name__ == "__main__":
+    from db.database import engine
+
+    if init_db(engine):
+        print("建表完成，已标记为 Alembic 最新版本")
+    else:
+        print("数据库中已有表，未做修改；升级请执行 alembic upgrade head")
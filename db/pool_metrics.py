@@ -0,0 +1,77 @@
+import time
+import threading
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from core.metrics import Histogram
+
+
+class PoolMetrics:
+    """单个连接池的运行指标"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait_ms = Histogram()
+        self.connections_created = 0
+        self.invalidated = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+
+def timed_pool_class(base, metrics: PoolMetrics):
+    """生成记录取连接等待时间的连接池类
+
+    metrics 挂在类属性上，engine.dispose() 重建连接池时（self.__class__(...)）依然保留。
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.wait_ms.observe((time.perf_counter() - start) * 1000)
+
+    return type(f"Timed{base.__name__}", (base,), {"metrics": metrics, "_do_get": _do_get})
+
+
+def attach_pool_events(engine, metrics: PoolMetrics) -> None:
+    """统计新建与失效（如 MySQL gone away 被 pre-ping 发现）的连接数"""
+    target = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connections_created")
+
+    @event.listens_for(target, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidated")
+
+
+def pool_status(engine) -> dict:
+    """连接池当前状态 + 累计指标"""
+    pool = engine.pool
+    data = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        data.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        data.update({
+            "connections_created": metrics.connections_created,
+            "invalidated": metrics.invalidated,
+            "timeouts": metrics.timeouts,
+            "wait_ms": metrics.wait_ms.snapshot(),
+        })
+    return data
+
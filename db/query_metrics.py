@@ -0,0 +1,138 @@
+"""
+按请求统计 SQL：查询次数、数据库耗时、疑似 N+1、慢查询日志
+
+- 引擎事件（before/after_cursor_execute）计时，结果记入当前请求的 QueryStats（contextvar）；
+  异步引擎在 greenlet 中执行，SQLAlchemy 会把调用方的 context 带过去，线程池中的同步路由同样继承
+- 同一请求内同一条 SQL（参数不同）执行次数达到 DB_N_PLUS_ONE_THRESHOLD 时记为疑似 N+1，写入 DB 日志
+- 超过 DB_SLOW_QUERY_MS 的语句连同参数写入 logs/datalink_db.log
+- 不在请求中（后台写入器、启动预热）的查询只做慢查询检查
+- 统计用应用发出的原始语句（db/statement_timeout 之后加上的超时提示不计入语句文本）
+
+测试中断言查询次数:
+
+    with query_budget(3) as requests:
+        client.get("/qa/?month=3")
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from sqlalchemy import event
+
+from core.config import DB_N_PLUS_ONE_THRESHOLD, DB_SLOW_QUERY_MS
+from core.logger import get_logger
+
+logger = get_logger("datalink_db")
+
+# 慢查询日志中参数的最大长度
+MAX_PARAMETERS_LENGTH = 1000
+
+
+@dataclass
+class QueryStats:
+    """一个请求内的 SQL 统计"""
+    label: str = ""
+    count: int = 0
+    duration_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    # 疑似 N+1 的语句
+    repeated: List[str] = field(default_factory=list)
+    # 超出时间预算被中止的语句数
+    timeouts: int = 0
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.statements[statement] += 1
+        if self.statements[statement] == DB_N_PLUS_ONE_THRESHOLD:
+            self.repeated.append(statement)
+            logger.warning(f"疑似 N+1: {self.label} 中同一语句已执行 {DB_N_PLUS_ONE_THRESHOLD} 次: {statement}")
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("datalink_query_stats", default=None)
+
+# 请求结束时的回调（测试用），参数为该请求的 QueryStats
+completed_hooks: List[Callable[[QueryStats], None]] = []
+
+
+def current() -> Optional[QueryStats]:
+    """当前请求的统计，不在请求中时为 None"""
+    return _current.get()
+
+
+def begin_request(label: str):
+    """开始统计一个请求，返回 (stats, token)，结束时调用 end_request(token)"""
+    stats = QueryStats(label)
+    return stats, _current.set(stats)
+
+
+def end_request(stats: QueryStats, token) -> None:
+    _current.reset(token)
+    for hook in completed_hooks:
+        hook(stats)
+
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_PARAMETERS_LENGTH:
+        text = text[:MAX_PARAMETERS_LENGTH] + "..."
+    return text
+
+
+def attach_query_events(engine) -> None:
+    target = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(target, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append((time.perf_counter(), statement))
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started, statement = conn.info["query_started"].pop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, duration_ms)
+        if duration_ms >= DB_SLOW_QUERY_MS:
+            logger.warning(
+                f"慢查询 {duration_ms:.1f}ms" + (f" ({stats.label})" if stats else "")
+                + f": {statement} 参数: {_format_parameters(parameters)}"
+            )
+
+    @event.listens_for(target, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """统计代码块内（同一任务/线程）的查询"""
+    stats, token = begin_request(label)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, allow_repeated: bool = False) -> Iterator[List[QueryStats]]:
+    """测试辅助：代码块内完成的每个请求最多 max_queries 条 SQL，且没有疑似 N+1"""
+    requests: List[QueryStats] = []
+    completed_hooks.append(requests.append)
+    try:
+        yield requests
+    finally:
+        completed_hooks.remove(requests.append)
+    assert requests, "代码块内没有完成任何请求"
+    for stats in requests:
+        detail = "\n".join(f"  {count} x {statement}" for statement, count in stats.statements.most_common())
+        assert stats.count <= max_queries, f"{stats.label} 执行了 {stats.count} 条 SQL（预算 {max_queries}）:\n{detail}"
+        assert allow_repeated or not stats.repeated, f"{stats.label} 疑似 N+1:\n{detail}"
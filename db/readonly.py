@@ -0,0 +1,43 @@
+"""
+只读行视图：列表接口用 Core select() 只取需要的列，结果直接构造轻量 DTO
+
+不创建 ORM 实例、不进 identity map，也不再经 pydantic 转换；列名与响应字段的对应关系
+（如 DateTime -> date_time、solved_flag -> solved）在视图定义处声明一次。
+DTO 为 slots dataclass，orjson 可直接编码（配合 core.responses.validated_response）。
+"""
+from dataclasses import fields
+from itertools import starmap
+from typing import Any, Dict, Generic, Iterable, List, Type, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+class RowView(Generic[T]):
+    def __init__(self, dto: Type[T], columns: Dict[str, Any]):
+        """
+        columns: 结果列名 -> 列或 SQL 表达式，按 DTO 字段顺序排列；
+        DTO 定义 from_row(row) 时按行构造（可用到不属于 DTO 的列，如分页键），否则按位置构造
+        """
+        self.dto = dto
+        self.columns = [column.label(name) for name, column in columns.items()]
+        self._from_row = getattr(dto, "from_row", None)
+        if self._from_row is None:
+            names = [field.name for field in fields(dto)]
+            if names != list(columns):
+                raise ValueError(f"{dto.__name__} 字段 {names} 与视图列 {list(columns)} 不一致")
+
+    def select(self):
+        return select(*self.columns)
+
+    async def fetch(self, db: AsyncSession, stmt) -> List[T]:
+        """在会话的连接上按 Core 语句执行，跳过 ORM 的结果加载流程"""
+        conn = await db.connection()
+        return self.to_dtos((await conn.execute(stmt)).all())
+
+    def to_dtos(self, rows: Iterable) -> List[T]:
+        if self._from_row is not None:
+            return [self._from_row(row) for row in rows]
+        return list(starmap(self.dto, rows))
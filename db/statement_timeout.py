@@ -0,0 +1,132 @@
+"""
+请求时间预算 → 数据库端语句超时
+
+    router = APIRouter(prefix="/activities", dependencies=[Depends(time_budget("activities"))])
+
+- 预算按名称取 DB_TIME_BUDGETS，未配置时为 DB_TIME_BUDGET_DEFAULT；从路由依赖执行时（已通过准入控制）
+  开始计时，同一请求内的所有 SQL 共用一个截止时间（contextvar，线程池中的同步路由同样继承）
+- 每条语句执行前按剩余时间设置数据库端超时:
+  MySQL:  SELECT 加优化器提示 /*+ MAX_EXECUTION_TIME(ms) */（MySQL 只对只读 SELECT 生效）
+  SQLite: 连接上设置进度回调，超过截止时间即中断（SQLITE_INTERRUPT），作为本地替身；连接归还时清除
+- 被中止的语句转换为 QueryTimeout：会话照常回滚并立即把连接还回连接池（连接本身仍可用），接口返回 504，
+  次数计入当前请求的 QueryStats（/metrics 按路由汇总）并写入 logs/datalink_db.log
+- 不在请求中（后台写入器、启动预热、脚本）时没有预算，不设超时
+"""
+import sqlite3
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+
+from core.config import DB_TIME_BUDGET_DEFAULT, DB_TIME_BUDGETS
+from core.logger import get_logger
+from db import query_metrics
+
+logger = get_logger("datalink_db")
+
+# SQLite 每执行多少条虚拟机指令检查一次截止时间
+SQLITE_PROGRESS_STEPS = 10000
+# ER_QUERY_TIMEOUT: Query execution was interrupted, maximum statement execution time exceeded
+MYSQL_QUERY_TIMEOUT = 3024
+
+# (截止时间 time.monotonic(), 预算秒数)
+_budget: ContextVar[Optional[Tuple[float, float]]] = ContextVar("datalink_time_budget", default=None)
+
+
+class QueryTimeout(Exception):
+    """语句超出请求的时间预算，已被数据库中止"""
+
+    def __init__(self, budget: float):
+        super().__init__(f"数据库查询超出时间预算（{budget:g}s），已中止")
+        self.budget = budget
+
+
+def set_time_budget(seconds: float) -> None:
+    """为当前请求（及其派生的任务、线程）重新设置预算，0 表示不限制"""
+    _budget.set((time.monotonic() + seconds, seconds) if seconds > 0 else None)
+
+
+def time_budget(name: str):
+    """路由依赖：按名称设置当前请求的时间预算"""
+    seconds = DB_TIME_BUDGETS.get(name, DB_TIME_BUDGET_DEFAULT)
+
+    async def dependency():
+        set_time_budget(seconds)
+    return dependency
+
+
+async def query_timeout_handler(request: Request, exc: QueryTimeout) -> ORJSONResponse:
+    return ORJSONResponse(status_code=504, content={"detail": str(exc)})
+
+
+def _sqlite_connection(dbapi_connection) -> sqlite3.Connection:
+    # aiosqlite: SQLAlchemy 适配层 -> aiosqlite.Connection -> sqlite3.Connection；
+    # 进度回调在语句开始前设置，执行时只在 aiosqlite 的线程中调用
+    inner = getattr(dbapi_connection, "_connection", dbapi_connection)
+    return getattr(inner, "_conn", inner)
+
+
+def _is_timeout(dialect: str, error: BaseException, deadline: float) -> bool:
+    if dialect == "mysql":
+        return bool(getattr(error, "args", None)) and error.args[0] == MYSQL_QUERY_TIMEOUT
+    if dialect == "sqlite":
+        return isinstance(error, sqlite3.OperationalError) and str(error) == "interrupted" \
+            and time.monotonic() >= deadline
+    return False
+
+
+def with_max_execution_time(statement: str, deadline: float) -> str:
+    """SELECT 语句加上按剩余时间计算的 MAX_EXECUTION_TIME 提示（已过期时取 1ms，由数据库立即中止）"""
+    if statement[:6].upper() != "SELECT":
+        return statement
+    remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+    return f"SELECT /*+ MAX_EXECUTION_TIME({remaining_ms}) */{statement[6:]}"
+
+
+def attach_statement_timeouts(engine) -> None:
+    """在 attach_query_events 之后调用：SQL 统计记录的是加提示之前的语句"""
+    target = getattr(engine, "sync_engine", engine)
+    dialect = target.dialect.name
+
+    if dialect == "mysql":
+        @event.listens_for(target, "before_cursor_execute", retval=True)
+        def _max_execution_time(conn, cursor, statement, parameters, context, executemany):
+            budget = _budget.get()
+            if budget is not None:
+                statement = with_max_execution_time(statement, budget[0])
+            return statement, parameters
+
+    elif dialect == "sqlite":
+        @event.listens_for(target, "before_cursor_execute")
+        def _progress_deadline(conn, cursor, statement, parameters, context, executemany):
+            budget = _budget.get()
+            if budget is not None:
+                deadline = budget[0]
+                _sqlite_connection(conn.connection.dbapi_connection).set_progress_handler(
+                    lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS
+                )
+                conn.info["statement_deadline"] = True
+            elif conn.info.pop("statement_deadline", False):
+                _sqlite_connection(conn.connection.dbapi_connection).set_progress_handler(None, 0)
+
+        @event.listens_for(target, "checkin")
+        def _clear_deadline(dbapi_connection, connection_record):
+            if connection_record is not None and connection_record.info.pop("statement_deadline", False):
+                _sqlite_connection(dbapi_connection).set_progress_handler(None, 0)
+
+    @event.listens_for(target, "handle_error")
+    def _timeout(exception_context):
+        budget = _budget.get()
+        if budget is None or not _is_timeout(dialect, exception_context.original_exception, budget[0]):
+            return None
+        stats = query_metrics.current()
+        if stats is not None:
+            stats.timeouts += 1
+        logger.warning(
+            f"语句超出时间预算 {budget[1]:g}s 被中止" + (f" ({stats.label})" if stats else "")
+            + f": {exception_context.statement}"
+        )
+        return QueryTimeout(budget[1])
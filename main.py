@@ -1,17 +1,63 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from models import Base
-from apis import department, ehs, user, qa, event, maint_works, activity
+from apis import department, ehs, user, qa, event, maint_works, activity, monitor, search
+from db.database import warm_up_pools, close_pools
+from db.statement_timeout import QueryTimeout, query_timeout_handler
+from core.redis import cache
+from services.auth_cache import principal_cache
+from services.activity_writer import activity_writer
 from fastapi.middleware.cors import CORSMiddleware
+from core.compression import CompressionMiddleware
+from core.request_metrics import RequestMetricsMiddleware
+from core.admission import AdmissionMiddleware
+from core.logger import get_logger, flush_logs
 
-app = FastAPI()
+logger = get_logger("datalink_app")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 预热连接池
+    await warm_up_pools()
+    # 订阅缓存失效通知
+    await cache.start()
+    await principal_cache.start(cache.backend)
+    # 启动活动日志后台写入
+    await activity_writer.start()
+    logger.info(f"Datalink4TJ API 应用启动 - 进程: {os.getpid()}")
+    # 关闭阶段在处理中的请求结束（或超过 GRACEFUL_SHUTDOWN_TIMEOUT）后执行
+    yield
+    # 先写完队列中的活动日志，最后关闭连接池
+    await activity_writer.close()
+    await principal_cache.close()
+    await cache.close()
+    await close_pools()
+    logger.info(f"Datalink4TJ API 应用关闭 - 进程: {os.getpid()}")
+    # 多 worker 时子进程由 multiprocessing 以 os._exit 结束，不执行 atexit，在这里写完日志队列
+    flush_logs()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+# 超出时间预算被数据库中止的查询返回 504
+app.add_exception_handler(QueryTimeout, query_timeout_handler)
+
+# 准入控制在 CORS 内层：503 响应同样带 CORS 头，前端能读到状态码和 Retry-After
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
+# 响应压缩（gzip/brotli），在 CORS 外层
+app.add_middleware(CompressionMiddleware)
+# 请求耗时/状态码/响应大小指标与请求日志，在最外层（统计压缩后的实际字节数）
+app.add_middleware(RequestMetricsMiddleware)
 app.include_router(department.router)
 app.include_router(user.router)
 app.include_router(qa.router)
@@ -19,7 +65,11 @@ app.include_router(ehs.router)
 app.include_router(event.router)
 app.include_router(maint_works.router)
 app.include_router(activity.router)
+app.include_router(search.router)
+app.include_router(monitor.router)
+app.include_router(monitor.metrics_router)
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # HOST/PORT/WORKERS 等见 core/config.py
+    from core.server import run
+    run(app)
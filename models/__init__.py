@@ -1,11 +1,9 @@
+# 导入全部模型以注册到 Base.metadata（关系按类名解析）；导入时不访问数据库，新库由 python -m db.init_db 建表，之后由 Alembic 迁移维护
 from db.database import Base
 from models.user import User
 from models.ehs import Ehs
 from models.department import Department
-from models.qa import Qa, Qad
+from models.qa import Qa, Qad, QaMonthlyRollup
+from models.activity import Activity
 from models.event import Event
 from models.maint import MaintDaily, MaintWeekly
-from db.database import engine
-
-Base.metadata.create_all(bind=engine)
-
@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
+from db.fulltext import fulltext_index
 from datetime import datetime
 
 class Activity(Base):
     """活动记录模型"""
     
     __tablename__ = "activities"
+    # 列表按 (created_at, id) 倒序游标分页
+    __table_args__ = (
+        Index("ix_activities_created_at_id", "created_at", "id"),
+        Index("ix_activities_department_created_at_id", "department", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, comment="活动标题")
@@ -84,4 +90,8 @@ class Activity(Base):
                 return "昨天"
             return f"{days} 天前"
             
-        return dt.strftime("%Y-%m-%d") 
\ No newline at end of file
+        return dt.strftime("%Y-%m-%d") 
+
+
+# 用户名也参与检索，替代 user_name ILIKE '%x%'
+fulltext_index(Activity.__table__, ["title", "action", "details", "user_name"])
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Integer, UniqueConstraint
 from db.database import Base
 from datetime import datetime
 
 class Ehs(Base):
     __tablename__ = "ehs"
+    __table_args__ = (UniqueConstraint("year", "week", name="uq_ehs_year_week"),)
 
     id = Column(Integer, primary_key=True, index=True)  
     lwd = Column(Integer, nullable=False)  
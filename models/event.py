@@ -1,11 +1,20 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index
 from db.database import Base
+from db.fulltext import fulltext_index
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # 按部门筛选、按开始时间排序；即将到来的事件按开始时间范围查询
+        Index("ix_events_department_start_time", "department", "start_time"),
+        Index("ix_events_start_time", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     department = Column(String(255), nullable=False)  
     start_time = Column(Date, nullable=False)
-    end_time = Column(Date, nullable=True)
\ No newline at end of file
+    end_time = Column(Date, nullable=True)
+
+
+fulltext_index(Event.__table__, ["name", "department"])
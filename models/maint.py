@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Index
 from db.database import Base
+from db.fulltext import fulltext_index
 
 #日任务
 class MaintDaily(Base):
     __tablename__ ='maint_daily'
+    __table_args__ = (
+        # 按人员(+状态)筛选、按日期排序；只按日期筛选时走日期索引
+        Index("ix_maint_daily_user_solved_date", "user_id", "solved_flag", "date"),
+        Index("ix_maint_daily_date", "date"),
+    )
     id = Column(Integer, primary_key=True)
     date = Column(Date)
     user_id = Column(Integer)
@@ -17,6 +23,10 @@ class MaintDaily(Base):
  #周任务   
 class MaintWeekly(Base):
     __tablename__ ='maint_weekly'
+    __table_args__ = (
+        Index("ix_maint_weekly_user_solved_datetime", "user_id", "solved_flag", "DateTime"),
+        Index("ix_maint_weekly_datetime", "DateTime"),
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer)  
     DateTime = Column(Date)
@@ -26,3 +36,6 @@ class MaintWeekly(Base):
     degree = Column(String(255))
     solved_flag = Column(Integer)
 
+
+fulltext_index(MaintDaily.__table__, ["title", "wheres", "content_daily"])
+fulltext_index(MaintWeekly.__table__, ["title", "wheres", "content"])
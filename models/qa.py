@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
 from datetime import datetime
@@ -6,17 +6,23 @@ from datetime import datetime
 #质量GP12
 class Qa(Base):
     __tablename__ = "qa"
+    __table_args__ = (
+        # 每条线每天的 正常/报废 数据各一格；年、月在前，按月查询可直接走该索引
+        UniqueConstraint("year", "month", "line", "day", "scrapflag", name="uq_qa_cell"),
+        Index("ix_qa_line_year_month", "line", "year", "month"),
+    )
     id = Column(Integer, primary_key=True, index=True)
-    line = Column(String, index=True)
-    day = Column(String)
-    month = Column(String)
-    year = Column(String)
-    value = Column(String)
+    line = Column(String(20), index=True)
+    day = Column(Integer)
+    month = Column(Integer)
+    year = Column(Integer)
+    value = Column(Float)
     scrapflag = Column(Boolean, default=False)
 
 #质量杂项数据
 class Qad(Base):
     __tablename__ = "qad"
+    __table_args__ = (Index("ix_qad_year_month", "year", "month"),)
     id = Column(Integer, primary_key=True, index=True)
     month = Column(Integer)
     year = Column(Integer, default=datetime.now().year, nullable=False)
@@ -30,6 +36,7 @@ class Qad(Base):
 #质量KPI数据
 class QaKpi(Base):
     __tablename__ = "qa_kpi"
+    __table_args__ = (Index("ix_qa_kpi_year_month", "year", "month"),)
     id = Column(Integer, primary_key=True, index=True)
     month = Column(Integer)
     year = Column(Integer, default=datetime.now().year, nullable=False)
@@ -39,8 +46,28 @@ class QaKpi(Base):
     old_factory = Column(Float, default=0)  # 老厂数据
     total = Column(Float, default=0)  # 汇总数据
 
+#GP12 按线/月汇总，由 services/qa_rollup 随 qa 写入同步维护
+class QaMonthlyRollup(Base):
+    __tablename__ = "qa_monthly_rollup"
+    __table_args__ = (UniqueConstraint("year", "month", "line", name="uq_qa_monthly_rollup_period"),)
+    id = Column(Integer, primary_key=True, index=True)
+    line = Column(String(20), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False, default=0)  # GP12（非报废）合计
+    scrap_sum = Column(Float, nullable=False, default=0)  # 报废合计
+    cell_count = Column(Integer, nullable=False, default=0)  # 已填写的格数
+    scrap_count = Column(Integer, nullable=False, default=0)  # 已填写的报废格数
+    min_value = Column(Float)  # GP12 单日最小值
+    max_value = Column(Float)  # GP12 单日最大值
+
 class MonthlyTotal(Base):
     __tablename__ = "monthly_totals"
+    __table_args__ = (
+        UniqueConstraint("line", "year", "month", name="uq_monthly_totals_line_period"),
+        # GET /qa/monthly 只按年月查询
+        Index("ix_monthly_totals_year_month", "year", "month"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     line = Column(String(20), index=True)
@@ -1,5 +1,4 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 from db.database import Base
-from passlib.context import CryptContext
 
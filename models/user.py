@@ -1,9 +1,15 @@
 from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
+from functools import lru_cache
 from db.database import Base
-from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    # passlib/bcrypt 只在调用下面两个方法时加载，不拖慢启动
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -16,7 +22,7 @@ class User(Base):
     activities = relationship("Activity", back_populates="user")
 
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(password, self.password)
+        return pwd_context().verify(password, self.password)
 
     def set_password(self, password: str) -> None:
-        self.password = pwd_context.hash(password)
\ No newline at end of file
+        self.password = pwd_context().hash(password)
\ No newline at end of file
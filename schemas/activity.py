@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union
 from datetime import datetime
+from schemas.pagination import Page
 
 class ActivityBase(BaseModel):
     """活动基础模型"""
@@ -60,10 +61,9 @@ class ActivityResponse(BaseModel):
     class Config:
         orm_mode = True
 
-class PaginatedActivityResponse(BaseModel):
-    """分页的活动响应模型"""
+class PaginatedActivityResponse(Page[ActivityResponse]):
+    """分页的活动响应模型（总数默认为估算值，总是返回）"""
     total: int
-    items: List[ActivityResponse]
 
 class DataChangePayload(BaseModel):
     """数据变更负载"""
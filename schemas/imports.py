@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+
+class ImportSummary(BaseModel):
+    """批量导入成功后的汇总"""
+    filename: str
+    rows: int = Field(..., description="文件中的数据行数")
+    created: int
+    updated: int
+    unchanged: int
+    deleted: int = Field(0, description="按月整体替换时删除的原有行数（KPI）")
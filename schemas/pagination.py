@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """游标分页的通用响应结构"""
+    total: Optional[int] = Field(None, description="总数，仅在 include_total=true 时计算")
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+    total_is_estimate: bool = Field(False, description="total 是否为估算值")
@@ -1,8 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
 from datetime import datetime
 
+def _as_str(value) -> str:
+    """数据库中的整数/浮点数转换为接口使用的字符串，整数值不带小数点"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def parse_qa_value(value: str) -> Optional[float]:
+    """接口中的值转换为数值，空字符串表示未填写"""
+    value = value.strip()
+    return float(value) if value else None
+
 class QABase(BaseModel):
+    # 数据库中为整数/浮点数，接口保持字符串以兼容前端
     line: str
     day: str
     month: str
@@ -10,6 +24,38 @@ class QABase(BaseModel):
     value: str
     scrapflag: bool = False
 
+    @field_validator("day", "month", "year", "value", mode="before")
+    @classmethod
+    def _coerce_str(cls, value):
+        return _as_str(value)
+
+    @field_validator("day", "month", "year")
+    @classmethod
+    def _check_int(cls, value: str) -> str:
+        if not value.strip().isdigit():
+            raise ValueError("必须为整数")
+        return value
+
+    @field_validator("value")
+    @classmethod
+    def _check_number(cls, value: str) -> str:
+        try:
+            parse_qa_value(value)
+        except ValueError:
+            raise ValueError("必须为数字")
+        return value
+
+    def to_row(self) -> dict:
+        """转换为数据库列值"""
+        return {
+            "line": self.line,
+            "day": int(self.day),
+            "month": int(self.month),
+            "year": int(self.year),
+            "value": parse_qa_value(self.value),
+            "scrapflag": self.scrapflag,
+        }
+
 class QACreate(QABase):
     pass
 
@@ -43,10 +89,23 @@ class MonthlyTotalResponse(MonthlyTotalBase):
     class Config:
         orm_mode = True
 
-class QaCreate(BaseModel):
-    line: str
-    day: str
-    month: str
+class QaSummary(BaseModel):
+    """GP12 按线/月汇总"""
+    line: Optional[str] = None  # by_line=false 时为空（全厂）
+    year: int
+    month: int
+    gp12_total: float
+    scrap_total: float
+    amount: Optional[int] = None
+    gp12_ratio: Optional[float] = None
+    scrap_ratio: Optional[float] = None
+    ytd_gp12_total: float
+    ytd_scrap_total: float
+    last_year_gp12_total: Optional[float] = None
+    last_year_scrap_total: Optional[float] = None
+    gp12_yoy: Optional[float] = None
+    scrap_yoy: Optional[float] = None
+
+class QaCreate(QABase):
     year: str
-    value: str
     scrapflag: bool
\ No newline at end of file
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from schemas.pagination import Page
+
+
+class SearchHit(BaseModel):
+    """检索命中"""
+    module: str = Field(..., description="所属模块: activity / maint_daily / maint_weekly / event")
+    id: int = Field(..., description="记录ID")
+    title: str = Field(..., description="标题")
+    snippet: str = Field("", description="正文摘要")
+    occurred_at: Optional[str] = Field(None, description="记录日期/时间")
+    target: Optional[str] = Field(None, description="目标链接")
+    score: float = Field(0.0, description="相关度，越大越相关")
+
+
+class SearchResponse(Page[SearchHit]):
+    """分页的检索结果，按相关度排序"""
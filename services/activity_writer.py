@@ -0,0 +1,137 @@
+"""
+活动日志后台批量写入
+
+请求只把活动记录放入有界队列即返回，后台任务按条数或时间攒批，用一条多行 INSERT 写入。
+队列满时丢弃并计数，不阻塞业务请求；应用关闭时先写完队列中剩余的记录。
+同步模式或写入器未启动（脚本、未触发 lifespan 的测试）时直接写库。
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from core.config import ACTIVITY_QUEUE_SIZE, ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_INTERVAL, ACTIVITY_WRITER_SYNC
+from core.metrics import Histogram
+from core.versions import table_versions
+from db.database import AsyncSessionLocal
+from models.activity import Activity
+
+logger = logging.getLogger(__name__)
+
+# 关闭信号
+_STOP = object()
+
+
+class ActivityWriter:
+    def __init__(
+        self,
+        queue_size: int = ACTIVITY_QUEUE_SIZE,
+        batch_size: int = ACTIVITY_BATCH_SIZE,
+        flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+        sync: bool = ACTIVITY_WRITER_SYNC,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sync = sync
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.flush_ms = Histogram()
+        self.stats = {"written": 0, "dropped": 0, "failed": 0, "flushes": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._closing
+
+    # ---- 生命周期 ----
+    async def start(self) -> None:
+        if self.sync or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """停止接收并写完队列中剩余的记录"""
+        if not self.running:
+            return
+        # 此后的新记录直接写库
+        self._closing = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    # ---- 写入 ----
+    async def submit(self, values: Dict[str, Any]) -> None:
+        if not self.running:
+            await self._write([values])
+            return
+        try:
+            self._queue.put_nowait(values)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"活动日志队列已满，丢弃记录: {values.get('title')}")
+
+    async def flush(self) -> None:
+        """等待队列中已有的记录全部写入"""
+        if self.running:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            async with self.session_factory() as db:
+                await db.execute(insert(Activity), batch)
+                await db.commit()
+            self.stats["written"] += len(batch)
+            await table_versions.bump("activities")
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            logger.error(f"写入活动日志失败({len(batch)}条): {str(e)}")
+        finally:
+            self.stats["flushes"] += 1
+            self.flush_ms.observe((time.perf_counter() - started) * 1000)
+
+    def status(self) -> dict:
+        return {
+            "mode": "async" if self.running else "sync",
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            **self.stats,
+            "flush_ms": self.flush_ms.snapshot(),
+        }
+
+
+activity_writer = ActivityWriter()
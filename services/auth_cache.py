@@ -0,0 +1,109 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+from core.config import AUTH_CACHE_SIZE, CACHE_PREFIX
+
+if TYPE_CHECKING:
+    from models.user import User
+
+logger = logging.getLogger(__name__)
+
+AUTH_INVALIDATION_CHANNEL = f"{CACHE_PREFIX}:auth:invalidate"
+
+
+@dataclass(frozen=True)
+class DepartmentRef:
+    id: int
+    name: str
+
+
+@dataclass(frozen=True)
+class Principal:
+    """已认证用户的只读快照，属性与 User 模型一致，跨请求共享不会触发数据库访问"""
+    id: int
+    name: str
+    department_id: Optional[int]
+    department: Optional[DepartmentRef]
+
+    @classmethod
+    def from_user(cls, user: "User") -> "Principal":
+        department = user.department
+        return cls(
+            id=user.id,
+            name=user.name,
+            department_id=user.department_id,
+            department=DepartmentRef(department.id, department.name) if department else None,
+        )
+
+
+class PrincipalCache:
+    """有界 LRU 缓存：token -> (Principal, token 过期时间)"""
+
+    def __init__(self, maxsize: int = AUTH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._backend = None
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, token: str) -> Optional[Principal]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[token]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(token)
+        self.stats["hits"] += 1
+        return principal
+
+    def put(self, token: str, principal: Principal, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[token] = (principal, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _drop_user(self, user_id: int) -> None:
+        for token in [t for t, (p, _) in self._entries.items() if p.id == user_id]:
+            del self._entries[token]
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """用户被修改/删除时清除其所有 token，并通知其他 worker"""
+        self._drop_user(user_id)
+        self.stats["invalidations"] += 1
+        if self._backend is not None:
+            try:
+                await self._backend.publish(AUTH_INVALIDATION_CHANNEL, json.dumps({"user_id": user_id}))
+            except Exception as e:
+                logger.error(f"发布认证缓存失效失败: {str(e)}")
+
+    def _on_invalidation(self, message: str) -> None:
+        self._drop_user(json.loads(message)["user_id"])
+
+    async def start(self, backend) -> None:
+        """订阅其他 worker 的失效通知（复用读缓存的后端）"""
+        self._backend = backend
+        await backend.subscribe(AUTH_INVALIDATION_CHANNEL, self._on_invalidation)
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.unsubscribe(AUTH_INVALIDATION_CHANNEL, self._on_invalidation)
+            self._backend = None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def status(self) -> dict:
+        return {"entries": len(self._entries), "maxsize": self.maxsize, **self.stats}
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,100 @@
+"""
+表格类批量保存（GP12、LWD、月度总数）共用的集合式 upsert
+
+- 依赖自然键上的唯一约束
+- 一次查询取回已有行，值未变化的行直接跳过
+- 变化的行用一条多行 INSERT ... ON DUPLICATE KEY UPDATE（SQLite/PostgreSQL 为 ON CONFLICT DO UPDATE）写入，
+  两人同时保存同一格也不会产生重复行
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# 单条语句的行数上限，避免超出驱动的参数个数限制
+CHUNK_SIZE = 500
+
+
+@dataclass
+class UpsertResult:
+    created: List[Dict[str, Any]] = field(default_factory=list)
+    # (更新前, 更新后)
+    updated: List[Tuple[Dict[str, Any], Dict[str, Any]]] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated)
+
+
+def _chunks(items: Sequence, size: int = CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _upsert_statement(model, rows: List[Dict[str, Any]], key: Sequence[str], fields: Sequence[str], dialect: str):
+    if dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in fields})
+    if dialect in ("sqlite", "postgresql"):
+        module = sqlite if dialect == "sqlite" else postgresql
+        stmt = module.insert(model).values(rows)
+        return stmt.on_conflict_do_update(index_elements=list(key), set_={name: stmt.excluded[name] for name in fields})
+    raise NotImplementedError(f"不支持的数据库类型: {dialect}")
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model,
+    rows: Sequence[Dict[str, Any]],
+    key: Sequence[str],
+    fields: Sequence[str],
+) -> UpsertResult:
+    """
+    按自然键 key 批量插入或更新 rows，只写 fields 中发生变化的行
+
+    不提交事务，由调用方 commit。同一请求中重复的键以最后一行为准。
+    """
+    result = UpsertResult()
+    payload: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        payload[tuple(row[name] for name in key)] = row
+    if not payload:
+        return result
+
+    dialect = db.bind.dialect.name
+    columns = ["id", *key, *fields]
+
+    # 一次（分块）取回已有行
+    existing: Dict[tuple, Dict[str, Any]] = {}
+    for keys in _chunks(list(payload)):
+        stmt = select(*[getattr(model, name) for name in columns]).where(
+            tuple_(*[getattr(model, name) for name in key]).in_(keys)
+        )
+        for record in (await db.execute(stmt)).mappings():
+            existing[tuple(record[name] for name in key)] = dict(record)
+
+    changed_rows = []
+    for row_key, row in payload.items():
+        before = existing.get(row_key)
+        if before is None:
+            result.created.append(row)
+        elif any(before[name] != row[name] for name in fields):
+            result.updated.append((before, row))
+        else:
+            result.unchanged += 1
+            continue
+        changed_rows.append({name: row[name] for name in (*key, *fields)})
+
+    for chunk in _chunks(changed_rows):
+        await db.execute(_upsert_statement(model, chunk, key, fields, dialect))
+
+    logger.info(
+        f"批量保存 {model.__tablename__}: 新增 {len(result.created)}, 更新 {len(result.updated)}, 未变化 {result.unchanged}"
+    )
+    return result
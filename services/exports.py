@@ -0,0 +1,203 @@
+"""
+流式导出（CSV / XLSX / NDJSON）
+
+- 查询用服务端游标分批读取（yield_per），每批写成一块响应后即释放，内存占用与总行数无关
+- 响应体在接口返回后才开始生成，导出使用独立的数据库会话（请求的会话此时已关闭）
+- 导出结束（含客户端中途断开）后记录一条 EXPORT 活动，包含导出条数
+- CSV 带 UTF-8 BOM，Excel 直接打开不乱码；NDJSON 每行一个 JSON 对象，键为列名
+"""
+import csv
+import io
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Literal, Optional, Sequence
+from urllib.parse import quote
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from core.config import DB_TIME_BUDGETS, EXPORT_BATCH_SIZE
+from db.database import AsyncSessionLocal
+from db.statement_timeout import set_time_budget
+from models.activity import Activity
+from models.maint import MaintDaily, MaintWeekly
+from models.qa import Qa
+from services.activity_service import ActivityService
+from services.xlsx_stream import xlsx_chunks
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["csv", "xlsx", "ndjson"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "ndjson": "application/x-ndjson",
+}
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    key: str
+    label: str
+    column: Any
+    # JSON 列在 CSV/XLSX 中写成 JSON 文本
+    json: bool = False
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """一类导出：名称（用于文件名和活动记录）、所属模块、列"""
+    name: str
+    module: str
+    target: str
+    columns: Sequence[ExportColumn]
+
+    def select(self):
+        return select(*[column.column.label(column.key) for column in self.columns])
+
+
+ACTIVITY_EXPORT = ExportSpec("活动记录", "ACTIVITY", "/activities", [
+    ExportColumn("id", "ID", Activity.id),
+    ExportColumn("created_at", "时间", Activity.created_at),
+    ExportColumn("type", "类型", Activity.type),
+    ExportColumn("title", "标题", Activity.title),
+    ExportColumn("action", "操作", Activity.action),
+    ExportColumn("details", "详细信息", Activity.details),
+    ExportColumn("user_name", "用户", Activity.user_name),
+    ExportColumn("department", "部门", Activity.department),
+    ExportColumn("changes_before", "变更前", Activity.changes_before, json=True),
+    ExportColumn("changes_after", "变更后", Activity.changes_after, json=True),
+])
+
+QA_EXPORT = ExportSpec("GP12数据", "QA", "/quality", [
+    ExportColumn("year", "年", Qa.year),
+    ExportColumn("month", "月", Qa.month),
+    ExportColumn("day", "日", Qa.day),
+    ExportColumn("line", "产线", Qa.line),
+    ExportColumn("scrapflag", "报废", Qa.scrapflag),
+    ExportColumn("value", "数值", Qa.value),
+])
+
+MAINT_DAILY_EXPORT = ExportSpec("日维护任务", "MAINT", "/maint", [
+    ExportColumn("id", "ID", MaintDaily.id),
+    ExportColumn("date", "日期", MaintDaily.date),
+    ExportColumn("user_id", "人员ID", MaintDaily.user_id),
+    ExportColumn("title", "标题", MaintDaily.title),
+    ExportColumn("wheres", "位置", MaintDaily.wheres),
+    ExportColumn("type", "类型", MaintDaily.type),
+    ExportColumn("content_daily", "内容", MaintDaily.content_daily),
+    ExportColumn("solved_flag", "已解决", MaintDaily.solved_flag),
+])
+
+MAINT_WEEKLY_EXPORT = ExportSpec("周维护任务与问题记录", "MAINT", "/maint", [
+    ExportColumn("id", "ID", MaintWeekly.id),
+    ExportColumn("date_time", "日期", MaintWeekly.DateTime),
+    ExportColumn("user_id", "人员ID", MaintWeekly.user_id),
+    ExportColumn("title", "标题", MaintWeekly.title),
+    ExportColumn("wheres", "位置", MaintWeekly.wheres),
+    ExportColumn("content", "内容", MaintWeekly.content),
+    ExportColumn("degree", "严重程度", MaintWeekly.degree),
+    ExportColumn("solved_flag", "已解决", MaintWeekly.solved_flag),
+])
+
+
+async def stream_rows(stmt, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[Sequence[Sequence]]:
+    """服务端游标分批读取"""
+    # 导出的查询持续到传输结束，按 exports 预算计时（默认不限制），而不是所在路由的预算
+    set_time_budget(DB_TIME_BUDGETS["exports"])
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+
+
+def _json_converter(columns: Sequence[ExportColumn]) -> Optional[Callable[[Sequence], Sequence]]:
+    positions = [i for i, column in enumerate(columns) if column.json]
+    if not positions:
+        return None
+
+    def convert(row: Sequence) -> list:
+        row = list(row)
+        for i in positions:
+            if row[i] is not None:
+                row[i] = orjson.dumps(row[i]).decode()
+        return row
+    return convert
+
+
+async def _csv_chunks(spec: ExportSpec, batches) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.label for column in spec.columns])
+    yield ("\ufeff" + buffer.getvalue()).encode()
+    convert = _json_converter(spec.columns)
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(map(convert, batch) if convert else batch)
+        yield buffer.getvalue().encode()
+
+
+async def _ndjson_chunks(spec: ExportSpec, batches) -> AsyncIterator[bytes]:
+    keys = [column.key for column in spec.columns]
+    async for batch in batches:
+        yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in batch)
+
+
+async def _xlsx_chunks(spec: ExportSpec, batches) -> AsyncIterator[bytes]:
+    convert = _json_converter(spec.columns)
+    if convert:
+        batches = _mapped(batches, convert)
+    async for chunk in xlsx_chunks([column.label for column in spec.columns], batches):
+        yield chunk
+
+
+async def _mapped(batches, convert):
+    async for batch in batches:
+        yield [convert(row) for row in batch]
+
+
+WRITERS: Dict[str, Callable] = {"csv": _csv_chunks, "xlsx": _xlsx_chunks, "ndjson": _ndjson_chunks}
+
+
+def export_response(spec: ExportSpec, stmt, format: ExportFormat, user, details: str = "") -> StreamingResponse:
+    """
+    stmt: 由 spec.select() 加上筛选和排序得到的查询
+    details: 记录到 EXPORT 活动中的筛选条件说明
+    """
+    async def body():
+        rows = 0
+        completed = False
+
+        async def counted():
+            nonlocal rows
+            async for batch in stream_rows(stmt):
+                rows += len(batch)
+                yield batch
+
+        try:
+            async for chunk in WRITERS[format](spec, counted()):
+                yield chunk
+            completed = True
+        finally:
+            # 后台写入器运行时 submit 不会挂起，客户端断开（任务被取消）时也能记录
+            try:
+                await ActivityService.record_data_change(
+                    user=user,
+                    module=spec.module,
+                    action_type="EXPORT",
+                    title=f"导出{spec.name}",
+                    action=f"导出了{rows}条{spec.name}" + ("" if completed else "（未完成）"),
+                    details=f"格式: {format.upper()}" + (f", {details}" if details else ""),
+                    target=spec.target,
+                )
+            except Exception as e:
+                logger.error(f"记录导出活动失败: {str(e)}")
+
+    filename = f"{spec.name}_{datetime.now():%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[format], headers={
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+    })
@@ -0,0 +1,497 @@
+"""
+批量导入（CSV / XLSX）：GP12、LWD、质量 KPI
+
+- 上传文件按 IMPORT_CHUNK_ROWS 行分块读取；读取和校验在线程中执行，不阻塞事件循环
+- 每块按列整体校验（整数、数值、日期、布尔、已知产线），再做行内检查（日期是否存在、文件内重复）；
+  错误精确到 行号 + 列名，最多列出 IMPORT_MAX_ERRORS 条
+- 所有块在同一事务中批量写入；出现任何错误后停止写入、继续校验剩余行，最后整体回滚，不写入任何数据
+- 表头可以是列名，也可以是中文列名（与导出文件一致，导出的文件可以直接导回）
+- CSV 编码按 UTF-8（可带 BOM）识别，失败时按 GB18030（Excel 中文版默认另存的编码）
+"""
+import codecs
+import csv
+import io
+import logging
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from xml.etree.ElementTree import ParseError
+
+import anyio
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import DB_TIME_BUDGETS, IMPORT_CHUNK_ROWS, IMPORT_MAX_ERRORS, QA_LINES
+from db.statement_timeout import set_time_budget
+from models.ehs import Ehs
+from models.qa import Qa, QaKpi
+from models.user import User
+from services.activity_service import ActivityService
+from services.bulk_upsert import bulk_upsert
+from services.qa_rollup import refresh_rollup
+from services.xlsx_stream import iter_rows
+
+logger = logging.getLogger(__name__)
+
+# Excel 日期序列号的起点（已包含 1900 年闰年错误的修正）
+_EXCEL_EPOCH = date(1899, 12, 30)
+_DATE_PARTS = re.compile(r"[-/.年月日]")
+
+
+class ImportFileError(ValueError):
+    """整个文件无法导入：格式、编码不支持或缺少必需的列"""
+
+
+# ---- 单元格解析：失败时抛出 ValueError，消息直接返回给用户 ----
+def _blank(value) -> bool:
+    return value is None or isinstance(value, str) and not value.strip()
+
+
+def _number(value) -> float:
+    if isinstance(value, bool):
+        raise ValueError("必须为数字")
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        try:
+            number = float(str(value).strip().replace(",", ""))
+        except ValueError:
+            raise ValueError("必须为数字")
+    if number != number or number in (float("inf"), float("-inf")):
+        raise ValueError("必须为数字")
+    return number
+
+
+def number() -> Callable[[Any], float]:
+    return _number
+
+
+def integer(minimum: int, maximum: int) -> Callable[[Any], int]:
+    def parse(value) -> int:
+        try:
+            number = _number(value)
+        except ValueError:
+            raise ValueError("必须为整数")
+        if not number.is_integer():
+            raise ValueError("必须为整数")
+        if not minimum <= number <= maximum:
+            raise ValueError(f"必须在 {minimum} 到 {maximum} 之间")
+        return int(number)
+    return parse
+
+
+_TRUE = {"1", "true", "yes", "y", "是", "报废"}
+_FALSE = {"0", "false", "no", "n", "否"}
+
+
+def boolean() -> Callable[[Any], bool]:
+    def parse(value) -> bool:
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in _TRUE or isinstance(value, (int, float)) and value == 1:
+            return True
+        if text in _FALSE or isinstance(value, (int, float)) and value == 0:
+            return False
+        raise ValueError("必须为 是/否")
+    return parse
+
+
+def text(max_length: int) -> Callable[[Any], str]:
+    def parse(value) -> str:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        result = str(value).strip()
+        if len(result) > max_length:
+            raise ValueError(f"不能超过 {max_length} 个字符")
+        return result
+    return parse
+
+
+def calendar_date() -> Callable[[Any], date]:
+    """ISO / 2025/3/1 / 2025年3月1日 文本、日期单元格（Excel 序列号）"""
+    def parse(value) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if 1 <= value < 2958466:
+                return _EXCEL_EPOCH + timedelta(days=int(value))
+            raise ValueError("不是有效的日期")
+        # 去掉时间部分
+        parts = [part for part in _DATE_PARTS.split(str(value).strip().split()[0].split("T")[0]) if part]
+        try:
+            if len(parts) == 3:
+                return date(*map(int, parts))
+        except ValueError:
+            pass
+        raise ValueError("不是有效的日期")
+    return parse
+
+
+@dataclass(frozen=True)
+class ImportColumn:
+    key: str
+    parse: Callable[[Any], Any]
+    # 表头中可用的其它名称（中文列名）
+    labels: Tuple[str, ...] = ()
+    # 表头中必须有该列
+    required: bool = True
+    # 允许空单元格，空单元格取 default
+    nullable: bool = False
+    default: Any = None
+
+    def validate(self, values: Sequence) -> Tuple[List, List[Tuple[int, str]]]:
+        """整列解析，返回 (解析后的值, [(行下标, 错误信息)])"""
+        parsed = []
+        errors = []
+        parse = self.parse
+        for index, value in enumerate(values):
+            if _blank(value):
+                if not self.nullable:
+                    errors.append((index, "不能为空"))
+                parsed.append(self.default)
+                continue
+            try:
+                parsed.append(parse(value))
+            except ValueError as e:
+                errors.append((index, str(e)))
+                parsed.append(None)
+        return parsed, errors
+
+
+@dataclass
+class RowError:
+    row: int
+    column: Optional[str]
+    message: str
+
+
+@dataclass
+class ImportResult:
+    filename: str
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    error_count: int = 0
+    errors: List[RowError] = field(default_factory=list)
+    # 有数据变化的 (年, 月)；LWD 为 (年, None)，用于清理缓存
+    periods: Set[Tuple[int, Optional[int]]] = field(default_factory=set)
+
+    def add_errors(self, errors: Sequence[RowError]) -> None:
+        self.error_count += len(errors)
+        room = IMPORT_MAX_ERRORS - len(self.errors)
+        if room > 0:
+            self.errors.extend(errors[:room])
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+
+class ImportSpec:
+    """一类导入：名称（用于活动记录）、所属模块、列；每次导入创建一个实例（保存文件内去重状态）"""
+    name = ""
+    module = ""
+    target = ""
+    columns: Sequence[ImportColumn] = ()
+    # 文件内不允许重复的列组合
+    unique: Sequence[str] = ()
+
+    def __init__(self):
+        self._seen: Dict[tuple, int] = {}
+
+    def resolve_header(self, header: Sequence) -> Dict[str, Tuple[int, str]]:
+        """表头 -> {列名: (位置, 文件中的表头)}"""
+        names = {}
+        for column in self.columns:
+            for name in (column.key, *column.labels):
+                names[name.lower()] = column.key
+        positions = {}
+        for index, cell in enumerate(header):
+            if _blank(cell):
+                continue
+            key = names.get(str(cell).strip().lower())
+            if key and key not in positions:
+                positions[key] = (index, str(cell).strip())
+        missing = [column.labels[0] if column.labels else column.key
+                   for column in self.columns if column.required and column.key not in positions]
+        if missing:
+            raise ImportFileError(f"缺少列: {', '.join(missing)}")
+        return positions
+
+    async def prepare(self, db: AsyncSession) -> None:
+        """开始导入前加载校验所需的数据"""
+
+    def check(self, row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """单行的跨列检查，返回 (列名, 错误信息)；row 可以就地补全"""
+        return None
+
+    def validate(self, chunk: Sequence[Tuple[int, List]], positions: Dict[str, Tuple[int, str]]):
+        """校验一块数据，返回 (可写入的行, 行错误)"""
+        numbers = [number for number, _ in chunk]
+        headers = {key: header for key, (_, header) in positions.items()}
+        errors: List[RowError] = []
+        failed: Set[int] = set()
+        columns: Dict[str, List] = {}
+        for column in self.columns:
+            if column.key not in positions:
+                columns[column.key] = [column.default] * len(chunk)
+                continue
+            position = positions[column.key][0]
+            values = [row[position] if position < len(row) else None for _, row in chunk]
+            columns[column.key], column_errors = column.validate(values)
+            for index, message in column_errors:
+                errors.append(RowError(numbers[index], headers[column.key], message))
+                failed.add(index)
+
+        rows = []
+        keys = list(columns)
+        for index, values in enumerate(zip(*columns.values())):
+            if index in failed:
+                continue
+            row = dict(zip(keys, values))
+            problem = self.check(row)
+            if problem is None and self.unique:
+                unique = tuple(row[key] for key in self.unique)
+                first = self._seen.setdefault(unique, numbers[index])
+                if first != numbers[index]:
+                    problem = (None, f"与第 {first} 行重复")
+            if problem is not None:
+                column, message = problem
+                errors.append(RowError(numbers[index], headers.get(column, column), message))
+                continue
+            rows.append(row)
+        errors.sort(key=lambda error: error.row)
+        return rows, errors
+
+    async def write(self, db: AsyncSession, rows: List[Dict[str, Any]], result: ImportResult) -> None:
+        raise NotImplementedError
+
+    async def finish(self, db: AsyncSession, result: ImportResult) -> None:
+        """全部写入后、提交前执行"""
+
+
+class Gp12Import(ImportSpec):
+    name = "GP12数据"
+    module = "QA"
+    target = "/quality"
+    columns = (
+        ImportColumn("line", text(20), ("产线",)),
+        # 日期列或 年/月/日 三列
+        ImportColumn("date", calendar_date(), ("日期",), required=False, nullable=True),
+        ImportColumn("year", integer(2000, 2100), ("年",), required=False, nullable=True),
+        ImportColumn("month", integer(1, 12), ("月",), required=False, nullable=True),
+        ImportColumn("day", integer(1, 31), ("日",), required=False, nullable=True),
+        ImportColumn("scrapflag", boolean(), ("报废",), required=False, nullable=True, default=False),
+        # 空单元格表示未填写
+        ImportColumn("value", number(), ("数值",), nullable=True),
+    )
+    unique = ("line", "year", "month", "day", "scrapflag")
+
+    def __init__(self):
+        super().__init__()
+        self.lines: Set[str] = set()
+        self._groups: Set[Tuple[str, int, int]] = set()
+
+    def resolve_header(self, header):
+        positions = super().resolve_header(header)
+        if "date" not in positions and not {"year", "month", "day"} <= positions.keys():
+            raise ImportFileError("缺少列: 日期（或 年、月、日）")
+        return positions
+
+    async def prepare(self, db):
+        existing = (await db.execute(select(Qa.line).distinct())).scalars().all()
+        self.lines = {line for line in existing if line} | set(QA_LINES)
+
+    def check(self, row):
+        if not row["line"]:
+            return "line", "不能为空"
+        if self.lines and row["line"] not in self.lines:
+            return "line", f"未知产线 {row['line']}"
+        day = row.pop("date")
+        if day is None:
+            if None in (row["year"], row["month"], row["day"]):
+                return "date", "缺少日期"
+            try:
+                day = date(row["year"], row["month"], row["day"])
+            except ValueError:
+                return "day", f"{row['year']}-{row['month']} 没有 {row['day']} 日"
+        if not 2000 <= day.year <= 2100:
+            return "date", "年份必须在 2000 到 2100 之间"
+        row.update(year=day.year, month=day.month, day=day.day)
+        return None
+
+    async def write(self, db, rows, result):
+        upserted = await bulk_upsert(db, Qa, rows, key=self.unique, fields=("value",))
+        result.created += len(upserted.created)
+        result.updated += len(upserted.updated)
+        result.unchanged += upserted.unchanged
+        for row in [*upserted.created, *(after for _, after in upserted.updated)]:
+            self._groups.add((row["line"], row["year"], row["month"]))
+            result.periods.add((row["year"], row["month"]))
+
+    async def finish(self, db, result):
+        # 月度汇总与日数据在同一事务中更新
+        await refresh_rollup(db, sorted(self._groups))
+
+
+class LwdImport(ImportSpec):
+    name = "LWD数据"
+    module = "EHS"
+    target = "/ehs"
+    columns = (
+        ImportColumn("year", integer(2000, 2100), ("年",)),
+        ImportColumn("week", integer(1, 53), ("周",)),
+        ImportColumn("lwd", integer(0, 1_000_000), ("LWD",)),
+    )
+    unique = ("year", "week")
+
+    async def write(self, db, rows, result):
+        upserted = await bulk_upsert(db, Ehs, rows, key=self.unique, fields=("lwd",))
+        result.created += len(upserted.created)
+        result.updated += len(upserted.updated)
+        result.unchanged += upserted.unchanged
+        for row in [*upserted.created, *(after for _, after in upserted.updated)]:
+            result.periods.add((row["year"], None))
+
+
+class KpiImport(ImportSpec):
+    """与 PUT /qa/kpi/ 一致：文件中出现的每个月整体替换"""
+    name = "质量KPI数据"
+    module = "QA"
+    target = "/qa_others"
+    columns = (
+        ImportColumn("year", integer(2000, 2100), ("年",)),
+        ImportColumn("month", integer(1, 12), ("月",)),
+        ImportColumn("area", text(50), ("区域",)),
+        ImportColumn("description", text(255), ("描述", "KPI描述")),
+        ImportColumn("new_factory", number(), ("新厂",), required=False, nullable=True, default=0.0),
+        ImportColumn("old_factory", number(), ("老厂",), required=False, nullable=True, default=0.0),
+        ImportColumn("total", number(), ("汇总",), required=False, nullable=True, default=0.0),
+    )
+    unique = ("year", "month", "area", "description")
+
+    async def write(self, db, rows, result):
+        for period in sorted({(row["year"], row["month"]) for row in rows} - result.periods):
+            deleted = await db.execute(delete(QaKpi).where(QaKpi.year == period[0], QaKpi.month == period[1]))
+            result.deleted += deleted.rowcount or 0
+            result.periods.add(period)
+        await db.execute(insert(QaKpi), rows)
+        result.created += len(rows)
+
+
+# ---- 读取 ----
+def _csv_rows(file) -> Iterator[Tuple[int, List]]:
+    head = file.read(64 * 1024)
+    file.seek(0)
+    encoding = "utf-8-sig"
+    try:
+        # 末尾可能截断在多字节字符中间，不作为最终输入
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        encoding = "gb18030"
+    reader = csv.reader(io.TextIOWrapper(file, encoding=encoding, newline=""))
+    for number, row in enumerate(reader, 1):
+        yield number, row
+
+
+def _open_rows(upload: UploadFile) -> Iterator[Tuple[int, List]]:
+    extension = os.path.splitext(upload.filename or "")[1].lower()
+    if extension == ".csv":
+        return _csv_rows(upload.file)
+    if extension == ".xlsx":
+        return iter_rows(upload.file)
+    raise ImportFileError("只支持 .csv 和 .xlsx 文件")
+
+
+def _read_chunk(rows: Iterator[Tuple[int, List]], size: int) -> List[Tuple[int, List]]:
+    """读取下一块非空行"""
+    try:
+        chunk = []
+        while len(chunk) < size:
+            batch = list(islice(rows, size - len(chunk)))
+            if not batch:
+                break
+            chunk.extend(item for item in batch if not all(_blank(value) for value in item[1]))
+        return chunk
+    except (zipfile.BadZipFile, KeyError, ParseError) as e:
+        raise ImportFileError(f"不是有效的 xlsx 文件: {e}")
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"无法读取 CSV 文件: {e}")
+
+
+def _next_chunk(spec: ImportSpec, rows, positions):
+    chunk = _read_chunk(rows, IMPORT_CHUNK_ROWS)
+    return len(chunk), *spec.validate(chunk, positions)
+
+
+async def run_import(db: AsyncSession, spec: ImportSpec, upload: UploadFile) -> ImportResult:
+    """
+    导入上传的文件并提交；文件无法读取时返回 400，有行错误时回滚并返回 422（含错误列表）。
+    不记录活动：成功后由调用方调用 record_import 记录 UPLOAD 活动，并按 result.periods 处理缓存和表版本。
+    """
+    # 大文件导入按 imports 预算计时，不受所在路由的预算限制
+    set_time_budget(DB_TIME_BUDGETS["imports"])
+    result = ImportResult(filename=upload.filename or "")
+    try:
+        rows = _open_rows(upload)
+        header = await anyio.to_thread.run_sync(_read_chunk, rows, 1)
+        if not header:
+            raise ImportFileError("文件为空")
+        positions = spec.resolve_header(header[0][1])
+        await spec.prepare(db)
+        while True:
+            count, valid, errors = await anyio.to_thread.run_sync(_next_chunk, spec, rows, positions)
+            if not count:
+                break
+            result.rows += count
+            result.add_errors(errors)
+            # 出现错误后只继续校验，不再写入
+            if valid and not result.error_count:
+                await spec.write(db, valid, result)
+        if not result.rows:
+            raise ImportFileError("文件中没有数据行")
+    except ImportFileError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if result.error_count:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail={
+            "message": f"{result.error_count} 处错误，未导入任何数据",
+            "rows": result.rows,
+            "error_count": result.error_count,
+            "errors": [vars(error) for error in result.errors],
+        })
+
+    await spec.finish(db, result)
+    await db.commit()
+    return result
+
+
+async def record_import(user: User, spec: ImportSpec, result: ImportResult) -> None:
+    """记录一条汇总的 UPLOAD 活动（不记录逐行快照）"""
+    details = f"文件: {result.filename}, 新增: {result.created}, 更新: {result.updated}, 未变化: {result.unchanged}"
+    if result.deleted:
+        details += f", 替换删除: {result.deleted}"
+    try:
+        await ActivityService.record_data_change(
+            user=user,
+            module=spec.module,
+            action_type="UPLOAD",
+            title=f"导入{spec.name}",
+            action=f"导入了{result.rows}条{spec.name}",
+            details=details,
+            target=spec.target,
+        )
+    except Exception as e:
+        logger.error(f"记录导入活动失败: {str(e)}")
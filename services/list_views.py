@@ -0,0 +1,107 @@
+"""
+列表接口的只读行视图（字段与对应的响应 schema 一致）
+
+- MAINT_DAILY_ROWS  -> MaintDailyResponse
+- MAINT_WEEKLY_ROWS -> MaintWeeklyResponse
+- ACTIVITY_ROWS     -> ActivityResponse
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+
+from db.readonly import RowView
+from models.activity import Activity
+from models.maint import MaintDaily, MaintWeekly
+
+
+def _solved(column):
+    # 与 bool(solved_flag) 一致：NULL/0 为未解决
+    return func.coalesce(column, 0) != 0
+
+
+@dataclass(slots=True, frozen=True)
+class MaintDailyRow:
+    title: str
+    wheres: str
+    content_daily: str
+    type: Optional[int]
+    id: int
+    date: date
+    user_id: int
+    solved: bool
+
+
+@dataclass(slots=True, frozen=True)
+class MaintWeeklyRow:
+    title: str
+    wheres: str
+    content: str
+    degree: str
+    id: int
+    date_time: date
+    user_id: int
+    solved: bool
+
+
+@dataclass(slots=True, frozen=True)
+class ActivityRow:
+    id: int
+    title: str
+    action: str
+    details: Optional[str]
+    type: str
+    icon: Optional[str]
+    color: Optional[str]
+    target: Optional[str]
+    changes: Dict[str, Any]
+    userId: Optional[int]
+    user: Optional[str]
+    department: Optional[str]
+    timestamp: Optional[str]
+    time: Optional[str]
+
+    @classmethod
+    def from_row(cls, row) -> "ActivityRow":
+        """与 Activity.to_dict 相同的输出；按位置解包（列顺序见 ACTIVITY_ROWS），比按列名取值快"""
+        (id_, title, action, details, type_, icon, color, target,
+         changes_before, changes_after, user_id, user_name, department, created_at) = row
+        return cls(
+            id_, title, action, details, type_, icon, color, target,
+            {"before": changes_before, "after": changes_after},
+            user_id, user_name, department,
+            created_at.isoformat() if created_at else None,
+            Activity.format_time(created_at) if created_at else None,
+        )
+
+
+MAINT_DAILY_ROWS = RowView(MaintDailyRow, {
+    "title": MaintDaily.title,
+    "wheres": MaintDaily.wheres,
+    "content_daily": MaintDaily.content_daily,
+    "type": MaintDaily.type,
+    "id": MaintDaily.id,
+    "date": MaintDaily.date,
+    "user_id": MaintDaily.user_id,
+    "solved": _solved(MaintDaily.solved_flag),
+})
+
+MAINT_WEEKLY_ROWS = RowView(MaintWeeklyRow, {
+    "title": MaintWeekly.title,
+    "wheres": MaintWeekly.wheres,
+    "content": MaintWeekly.content,
+    "degree": MaintWeekly.degree,
+    "id": MaintWeekly.id,
+    "date_time": MaintWeekly.DateTime,
+    "user_id": MaintWeekly.user_id,
+    "solved": _solved(MaintWeekly.solved_flag),
+})
+
+# 包含游标分页键 created_at / id
+ACTIVITY_ROWS = RowView(ActivityRow, {
+    column: getattr(Activity, column) for column in (
+        "id", "title", "action", "details", "type", "icon", "color", "target",
+        "changes_before", "changes_after", "user_id", "user_name", "department", "created_at",
+    )
+})
@@ -0,0 +1,94 @@
+"""
+GP12 月度汇总表（qa_monthly_rollup）维护
+
+qa 的每次写入在同一事务中重算受影响的 (线, 年, 月) 汇总行：只聚合这些组的日数据（走
+ix_qa_line_year_month 索引），min/max 在删除、修改后也能保持正确。
+看板读汇总表，只需 线数 x 月数 行，不扫描日数据。
+
+全量重建（回填或修复）: python -m services.qa_rollup [--year 2025]
+"""
+import argparse
+import asyncio
+import logging
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.qa import Qa, QaMonthlyRollup
+from services.bulk_upsert import bulk_upsert
+
+logger = logging.getLogger(__name__)
+
+GROUP_KEY = ("year", "month", "line")
+AGGREGATE_FIELDS = ("value_sum", "scrap_sum", "cell_count", "scrap_count", "min_value", "max_value")
+
+
+def _aggregate_select():
+    is_scrap = Qa.scrapflag.is_(True)
+    gp12_value = case((is_scrap, None), else_=Qa.value)
+    return select(
+        Qa.year, Qa.month, Qa.line,
+        func.coalesce(func.sum(gp12_value), 0).label("value_sum"),
+        func.coalesce(func.sum(case((is_scrap, Qa.value), else_=None)), 0).label("scrap_sum"),
+        func.count(Qa.value).label("cell_count"),
+        func.count(case((is_scrap, Qa.value), else_=None)).label("scrap_count"),
+        func.min(gp12_value).label("min_value"),
+        func.max(gp12_value).label("max_value"),
+    ).where(
+        # 汇总表的 线/年/月 非空；与迁移回填一致，跳过无法归属的日数据（如迁移时无法解析的旧数据）
+        Qa.line.is_not(None), Qa.year.is_not(None), Qa.month.is_not(None),
+    ).group_by(Qa.year, Qa.month, Qa.line)
+
+
+async def refresh_rollup(db: AsyncSession, groups: Iterable[Tuple[str, int, int]]) -> None:
+    """
+    重算 (line, year, month) 组的汇总行，需在 qa 变更 flush 之后、commit 之前调用
+    """
+    keys = sorted({(year, month, line) for line, year, month in groups})
+    if not keys:
+        return
+    group_filter = tuple_(Qa.year, Qa.month, Qa.line).in_(keys)
+    rows = [dict(row) for row in (await db.execute(_aggregate_select().where(group_filter))).mappings()]
+    await bulk_upsert(db, QaMonthlyRollup, rows, GROUP_KEY, AGGREGATE_FIELDS)
+
+    # 数据已全部删除的组
+    emptied = set(keys) - {(row["year"], row["month"], row["line"]) for row in rows}
+    if emptied:
+        await db.execute(delete(QaMonthlyRollup).where(
+            tuple_(QaMonthlyRollup.year, QaMonthlyRollup.month, QaMonthlyRollup.line).in_(sorted(emptied))
+        ))
+
+
+async def rebuild_rollup(db: AsyncSession, year: Optional[int] = None) -> int:
+    """从日数据全量重建汇总（可限定年份），返回重建的行数"""
+    aggregate = _aggregate_select()
+    clear = delete(QaMonthlyRollup)
+    if year is not None:
+        aggregate = aggregate.where(Qa.year == year)
+        clear = clear.where(QaMonthlyRollup.year == year)
+    await db.execute(clear)
+    await db.execute(insert(QaMonthlyRollup).from_select([*GROUP_KEY, *AGGREGATE_FIELDS], aggregate))
+    await db.commit()
+    count_stmt = select(func.count(QaMonthlyRollup.id))
+    if year is not None:
+        count_stmt = count_stmt.where(QaMonthlyRollup.year == year)
+    return (await db.execute(count_stmt)).scalar_one()
+
+
+async def _main(year: Optional[int]) -> None:
+    from db.database import AsyncSessionLocal, async_engine
+
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await rebuild_rollup(db, year)
+    finally:
+        await async_engine.dispose()
+    print(f"重建 GP12 月度汇总完成: {count} 行" + (f"（{year} 年）" if year else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="重建 GP12 月度汇总表")
+    parser.add_argument("--year", type=int, default=None, help="只重建指定年份")
+    args = parser.parse_args()
+    asyncio.run(_main(args.year))
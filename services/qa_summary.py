@@ -0,0 +1,93 @@
+"""
+GP12 汇总：从月度汇总表 qa_monthly_rollup 读取各 线/月 的 GP12 与报废数（不扫描日数据），
+并计算年累计（YTD）、同比（YoY）以及相对 MonthlyTotal.amount 的比率。
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.qa import QaMonthlyRollup, MonthlyTotal
+
+
+def _ratio(part: float, whole) -> Optional[float]:
+    return round(part / whole, 6) if whole else None
+
+
+async def _grouped_totals(db: AsyncSession, years: List[int], max_month: Optional[int], line: Optional[str], by_line: bool):
+    """(线, 年, 月) -> (GP12 合计, 报废合计)"""
+    rollup = QaMonthlyRollup
+    keys = [rollup.line, rollup.year, rollup.month] if by_line else [rollup.year, rollup.month]
+    stmt = select(*keys, func.sum(rollup.value_sum), func.sum(rollup.scrap_sum)).where(
+        rollup.year.in_(years)
+    ).group_by(*keys)
+    if max_month is not None:
+        stmt = stmt.where(rollup.month <= max_month)
+    if line:
+        stmt = stmt.where(rollup.line == line)
+
+    totals: Dict[Tuple, Tuple[float, float]] = {}
+    for row in (await db.execute(stmt)).all():
+        row_line = row[0] if by_line else None
+        year, month, gp12_sum, scrap_sum = row[-4:]
+        totals[(row_line, year, month)] = (float(gp12_sum), float(scrap_sum))
+    return totals
+
+
+async def _monthly_amounts(db: AsyncSession, year: int, max_month: Optional[int], line: Optional[str], by_line: bool):
+    keys = [MonthlyTotal.line, MonthlyTotal.month] if by_line else [MonthlyTotal.month]
+    stmt = select(*keys, func.sum(MonthlyTotal.amount)).where(MonthlyTotal.year == year).group_by(*keys)
+    if max_month is not None:
+        stmt = stmt.where(MonthlyTotal.month <= max_month)
+    if line:
+        stmt = stmt.where(MonthlyTotal.line == line)
+    amounts = {}
+    for row in (await db.execute(stmt)).all():
+        row_line = row[0] if by_line else None
+        amounts[(row_line, row[-2])] = row[-1]
+    return amounts
+
+
+async def qa_summary(
+    db: AsyncSession,
+    year: int,
+    month: Optional[int] = None,
+    line: Optional[str] = None,
+    by_line: bool = True,
+) -> List[dict]:
+    """
+    返回 year 年每条线（by_line=False 时为全厂）每月一行的汇总；传 month 时只返回该月，
+    年累计仍从 1 月算起。
+    """
+    totals = await _grouped_totals(db, [year, year - 1], month, line, by_line)
+    amounts = await _monthly_amounts(db, year, month, line, by_line)
+
+    keys = {(key[0], key[2]) for key in totals if key[1] == year} | set(amounts)
+    ytd = defaultdict(lambda: [0.0, 0.0])
+    rows = []
+    for row_line, row_month in sorted(keys, key=lambda key: (key[0] or "", key[1])):
+        gp12_total, scrap_total = totals.get((row_line, year, row_month), (0.0, 0.0))
+        last_year = totals.get((row_line, year - 1, row_month))
+        amount = amounts.get((row_line, row_month))
+        ytd[row_line][0] += gp12_total
+        ytd[row_line][1] += scrap_total
+        if month is not None and row_month != month:
+            continue
+        rows.append({
+            "line": row_line,
+            "year": year,
+            "month": row_month,
+            "gp12_total": gp12_total,
+            "scrap_total": scrap_total,
+            "amount": amount,
+            "gp12_ratio": _ratio(gp12_total, amount),
+            "scrap_ratio": _ratio(scrap_total, amount),
+            "ytd_gp12_total": ytd[row_line][0],
+            "ytd_scrap_total": ytd[row_line][1],
+            "last_year_gp12_total": last_year[0] if last_year else None,
+            "last_year_scrap_total": last_year[1] if last_year else None,
+            "gp12_yoy": _ratio(gp12_total - last_year[0], last_year[0]) if last_year else None,
+            "scrap_yoy": _ratio(scrap_total - last_year[1], last_year[1]) if last_year else None,
+        })
+    return rows
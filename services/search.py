@@ -0,0 +1,156 @@
+"""
+跨模块全文检索：活动记录、日/周维护任务、事件
+
+- MySQL: MATCH ... AGAINST 布尔模式，每个检索词作为必须出现的短语（ngram 索引）
+- SQLite: FTS5 trigram 表 MATCH，按 bm25 排序；不足 3 个字的词无法走 trigram，退化为 LIKE
+- 其他数据库: ILIKE，相关度为 0
+
+每个模块各取前 offset + limit + 1 条后按相关度合并，因此不同模块的分数只是近似可比。
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.fulltext import FULLTEXT_COLUMNS, fts_table_name
+from models.activity import Activity
+from models.event import Event
+from models.maint import MaintDaily, MaintWeekly
+
+# MySQL ngram_token_size 默认为 2，更短的词不会被索引
+MIN_TERM_LENGTH = 2
+# SQLite trigram 分词的最短可检索长度
+TRIGRAM_LENGTH = 3
+MAX_TERMS = 8
+SNIPPET_LENGTH = 120
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    module: str
+    model: Any
+    title: str
+    occurred_at: str
+    # 固定跳转链接；为空时取记录自身的 target 列
+    target: Optional[str] = None
+
+    @property
+    def columns(self) -> Sequence[str]:
+        return FULLTEXT_COLUMNS[self.model.__tablename__]
+
+
+SOURCES: Dict[str, SearchSource] = {
+    source.module: source for source in (
+        SearchSource("activity", Activity, "title", "created_at"),
+        SearchSource("maint_daily", MaintDaily, "title", "date", "/maintenance"),
+        SearchSource("maint_weekly", MaintWeekly, "title", "DateTime", "/maintenance"),
+        SearchSource("event", Event, "name", "start_time", "/events"),
+    )
+}
+
+
+def parse_terms(q: str) -> List[str]:
+    """按空白切分检索词，去掉引号和过短的词"""
+    terms = []
+    for term in q.replace('"', " ").split():
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def _like_any(columns, term: str):
+    return or_(*[col.contains(term, autoescape=True) for col in columns])
+
+
+def _match_statement(dialect_name: str, source: SearchSource, terms: Sequence[str]):
+    """返回 (查询, 相关度表达式)，查询结果为 (模型对象, 相关度)"""
+    model = source.model
+    columns = [getattr(model, name) for name in source.columns]
+
+    if dialect_name == "mysql":
+        score = match(*columns, against=" ".join(f'+"{term}"' for term in terms)).in_boolean_mode()
+        return select(model, score.label("score")).where(score), score
+
+    if dialect_name == "sqlite":
+        fts_name = fts_table_name(model.__tablename__)
+        fts = table(fts_name, column("rowid"))
+        stmt = select(model).join(fts, fts.c.rowid == model.id)
+        indexed = [term for term in terms if len(term) >= TRIGRAM_LENGTH]
+        short = [term for term in terms if len(term) < TRIGRAM_LENGTH]
+        score = literal(0.0)
+        if indexed:
+            query = " ".join('"' + term + '"' for term in indexed)
+            stmt = stmt.where(literal_column(fts_name).match(query))
+            # bm25 越小越相关
+            score = -func.bm25(literal_column(fts_name))
+        if short:
+            stmt = stmt.where(and_(*[_like_any(columns, term) for term in short]))
+        return stmt.add_columns(score.label("score")), score
+
+    score = literal(0.0)
+    stmt = select(model, score.label("score")).where(
+        and_(*[or_(*[col.ilike(f"%{term}%") for col in columns]) for term in terms])
+    )
+    return stmt, score
+
+
+def _sort_time(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    return datetime.min
+
+
+def _to_hit(source: SearchSource, obj, score: float) -> Dict[str, Any]:
+    body = " / ".join(
+        str(getattr(obj, name)) for name in source.columns
+        if name != source.title and getattr(obj, name)
+    )
+    occurred_at = getattr(obj, source.occurred_at)
+    return {
+        "module": source.module,
+        "id": obj.id,
+        "title": getattr(obj, source.title),
+        "snippet": body[:SNIPPET_LENGTH],
+        "occurred_at": occurred_at.isoformat() if occurred_at else None,
+        "target": source.target or getattr(obj, "target", None),
+        "score": round(float(score or 0.0), 6),
+    }
+
+
+async def search(
+    db: AsyncSession,
+    q: str,
+    modules: Optional[Sequence[str]] = None,
+    limit: int = 20,
+    offset: int = 0,
+    include_total: bool = False,
+) -> Tuple[List[Dict[str, Any]], bool, Optional[int]]:
+    """
+    返回 (本页命中, 是否还有下一页, 总数)；总数仅在 include_total 时计算。
+    命中按相关度降序，相关度相同时较新的在前。
+    """
+    terms = parse_terms(q)
+    if not terms:
+        return [], False, 0 if include_total else None
+
+    dialect_name = db.bind.dialect.name
+    ranked, total = [], 0
+    for module in modules or SOURCES:
+        source = SOURCES[module]
+        stmt, score = _match_statement(dialect_name, source, terms)
+        occurred = getattr(source.model, source.occurred_at)
+        page = stmt.order_by(score.desc(), occurred.desc()).limit(offset + limit + 1)
+        for obj, row_score in (await db.execute(page)).all():
+            sort_key = (float(row_score or 0.0), _sort_time(getattr(obj, source.occurred_at)))
+            ranked.append((sort_key, _to_hit(source, obj, row_score)))
+        if include_total:
+            total += (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
+
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    page_hits = [hit for _, hit in ranked[offset:offset + limit + 1]]
+    return page_hits[:limit], len(page_hits) > limit, total if include_total else None
@@ -1,8 +1,9 @@
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models.user import User
-from schemas.user import UserCreate
-import jwt
+from schemas.user import UserCreate, UserUpdate
+from services.auth_cache import principal_cache
 import hashlib
 from typing import Optional
 from datetime import datetime, timedelta
@@ -22,11 +23,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
+    import jwt  # PyJWT 导入较慢（约 50ms），用到时再加载
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_token(token: str):
+    import jwt
     try:
         decoded_token = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return decoded_token
@@ -48,17 +51,36 @@ def verify_password(plain_password, hashed_password):
     md5_hash = hashlib.md5(plain_password.encode()).hexdigest()
     return md5_hash == hashed_password
 
-def delete_user_service(db: Session, user_id: int):
-    db_user = get_user_service(db, user_id)
+async def get_user_by_name_service(db: AsyncSession, name: str) -> Optional[User]:
+    # 预加载部门，避免在异步会话中触发懒加载
+    result = await db.execute(
+        select(User).options(selectinload(User.department)).where(User.name == name)
+    )
+    return result.scalars().first()
+
+async def delete_user_service(db: AsyncSession, user_id: int):
+    db_user = await get_user_service(db, user_id)
     if not db_user:
         return False
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+    await principal_cache.invalidate_user(user_id)
     return True
 
-def create_user_service(db: Session, user: UserCreate) -> User:
+async def update_user_service(db: AsyncSession, user_id: int, user_update: UserUpdate) -> Optional[User]:
+    db_user = await get_user_service(db, user_id)
+    if not db_user:
+        return None
+    db_user.name = user_update.name
+    db_user.department_id = user_update.department_id
+    await db.commit()
+    await db.refresh(db_user, attribute_names=["department"])
+    await principal_cache.invalidate_user(user_id)
+    return db_user
+
+async def create_user_service(db: AsyncSession, user: UserCreate) -> User:
     # 检查用户名是否已经存在
-    existing_user = db.query(User).filter(User.name == user.name).first()
+    existing_user = await get_user_by_name_service(db, user.name)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,16 +90,22 @@ def create_user_service(db: Session, user: UserCreate) -> User:
     hashed_password = get_password_hash(user.password)
     db_user = User(name=user.name, password=hashed_password, department_id=user.department_id)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user, attribute_names=["id", "department"])
     return db_user
 
 
 # 获取用户
-def get_user_service(db: Session, user_id: int) -> User:
-    return db.query(User).filter(User.id == user_id).first()
+async def get_user_service(db: AsyncSession, user_id: int) -> User:
+    result = await db.execute(
+        select(User).options(selectinload(User.department)).where(User.id == user_id)
+    )
+    return result.scalars().first()
 
 
 # 获取用户列表
-def get_users_service(db: Session, skip: int = 0, limit: int = 10) -> list[User]:
-    return db.query(User).options(joinedload(User.department)).offset(skip).limit(limit).all()
\ No newline at end of file
+async def get_users_service(db: AsyncSession, skip: int = 0, limit: int = 10) -> list[User]:
+    result = await db.execute(
+        select(User).options(selectinload(User.department)).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
\ No newline at end of file
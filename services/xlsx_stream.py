@@ -0,0 +1,261 @@
+"""
+流式 XLSX 读写（仅标准库）
+
+写：xlsx 是 zip 包；zipfile 写入不可 seek 的流时使用数据描述符，每个成员可以边写边输出。
+工作表按行写入后立即取走已压缩的字节，内存占用与总行数无关。
+超过 Excel 单表行数上限时自动续写到下一个工作表；workbook.xml 等清单在最后写入。
+字符串使用内联字符串（不建共享字符串表），日期时间按 ISO 文本写出。
+
+读：iter_rows() 用 iterparse 逐行解析第一个工作表，只有共享字符串表整体载入内存。
+单元格按类型返回 str / int / float / bool，日期单元格是 Excel 序列号（由调用方按列解释）。
+"""
+import io
+import math
+import posixpath
+import re
+import zipfile
+from datetime import date, datetime
+from typing import IO, AsyncIterator, Iterable, Iterator, List, Sequence, Tuple
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+# Excel 单个工作表的最大行数（含表头）
+MAX_SHEET_ROWS = 1_048_576
+
+# XML 1.0 不允许的控制字符
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Sink(io.RawIOBase):
+    """收集 zipfile 写出的字节，不可 seek"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref: str, value) -> str:
+    if value is None:
+        return ""
+    if value is True or value is False:
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int) or isinstance(value, float) and math.isfinite(value):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class XlsxStreamWriter:
+    def __init__(self, header: Sequence[str], max_rows: int = MAX_SHEET_ROWS):
+        self.header = list(header)
+        self.max_rows = max_rows
+        self._letters = [_column_letter(i) for i in range(len(self.header))]
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=5)
+        self._sheets = 0
+        self._sheet = None
+        self._row = 0
+
+    def _open_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.write(_SHEET_TAIL.encode())
+            self._sheet.close()
+        self._sheets += 1
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{self._sheets}.xml", "w", force_zip64=True)
+        self._row = 0
+        self._sheet.write((_SHEET_HEAD + self._row_xml(self.header)).encode())
+
+    def _row_xml(self, row: Iterable) -> str:
+        self._row += 1
+        number = self._row
+        cells = "".join(_cell(f"{letter}{number}", value) for letter, value in zip(self._letters, row))
+        return f'<row r="{number}">{cells}</row>'
+
+    def write_rows(self, rows: Iterable[Sequence]) -> bytes:
+        """写入一批数据行，返回目前已生成的 zip 字节"""
+        if self._sheet is None:
+            self._open_sheet()
+        parts = []
+        for row in rows:
+            if self._row >= self.max_rows:
+                self._sheet.write("".join(parts).encode())
+                parts = []
+                self._open_sheet()
+            parts.append(self._row_xml(row))
+        self._sheet.write("".join(parts).encode())
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """结束工作表并写入工作簿清单，返回剩余字节"""
+        if self._sheet is None:
+            self._open_sheet()
+        self._sheet.write(_SHEET_TAIL.encode())
+        self._sheet.close()
+        sheets = range(1, self._sheets + 1)
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheets
+            )
+            + "</Types>"
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="Sheet{i}" sheetId="{i}" r:id="rId{i}"/>' for i in sheets)
+            + "</sheets></workbook>"
+        ))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in sheets
+            )
+            + "</Relationships>"
+        ))
+        self._zip.close()
+        return self._sink.drain()
+
+
+async def xlsx_chunks(header: Sequence[str], batches: AsyncIterator[Sequence[Sequence]]) -> AsyncIterator[bytes]:
+    writer = XlsxStreamWriter(header)
+    async for batch in batches:
+        chunk = writer.write_rows(batch)
+        if chunk:
+            yield chunk
+    yield writer.close()
+
+
+# ---- 读取 ----
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)")
+
+
+def _column_index(ref: str) -> int:
+    index = 0
+    for char in _CELL_REF.match(ref).group(1):
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _first_sheet_path(archive: zipfile.ZipFile) -> str:
+    """按 workbook.xml 中的顺序取第一个工作表"""
+    with archive.open("xl/workbook.xml") as workbook:
+        for _, element in iterparse(workbook):
+            if element.tag == f"{_MAIN_NS}sheet":
+                rel_id = element.get(f"{_REL_NS}id")
+                break
+        else:
+            raise ValueError("工作簿中没有工作表")
+    with archive.open("xl/_rels/workbook.xml.rels") as rels:
+        for _, element in iterparse(rels):
+            if element.tag == f"{_PKG_REL_NS}Relationship" and element.get("Id") == rel_id:
+                target = element.get("Target")
+                return target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+    raise ValueError("找不到工作表文件")
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as source:
+        for _, element in iterparse(source):
+            if element.tag == f"{_MAIN_NS}si":
+                # 富文本由多个 <r><t> 组成
+                strings.append("".join(t.text or "" for t in element.iter(f"{_MAIN_NS}t")))
+                element.clear()
+    return strings
+
+
+def _cell_value(cell, shared: List[str]):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_MAIN_NS}t"))
+    value = cell.findtext(f"{_MAIN_NS}v")
+    if value is None:
+        return None
+    if kind == "s":
+        return shared[int(value)]
+    if kind == "b":
+        return value == "1"
+    if kind in ("str", "e"):
+        return value
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def iter_rows(file: IO[bytes]) -> Iterator[Tuple[int, List]]:
+    """
+    逐行返回第一个工作表的 (行号, 单元格值)；空单元格为 None，行尾空单元格省略，
+    完全为空的行 Excel 不写入文件，行号可能不连续
+    """
+    with zipfile.ZipFile(file) as archive:
+        shared = _shared_strings(archive)
+        with archive.open(_first_sheet_path(archive)) as sheet:
+            sheet_data = None
+            number = 0
+            for event, element in iterparse(sheet, events=("start", "end")):
+                if event == "start":
+                    if element.tag == f"{_MAIN_NS}sheetData":
+                        sheet_data = element
+                    continue
+                if element.tag != f"{_MAIN_NS}row":
+                    continue
+                number = int(element.get("r") or number + 1)
+                row: List = []
+                for cell in element.iter(f"{_MAIN_NS}c"):
+                    ref = cell.get("r")
+                    if ref:
+                        row.extend([None] * (_column_index(ref) - len(row)))
+                    row.append(_cell_value(cell, shared))
+                # 已处理的行从树中移除，内存占用与行数无关
+                sheet_data.clear()
+                yield number, row
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.pagination import encode_cursor, keyset_before
+from db.database import SessionLocal
+from models.activity import Activity
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(Activity).delete()
+    base = datetime(2025, 1, 1)
+    for i in range(25):
+        db.add(Activity(
+            title=f"t{i}", action="a", type="QA_UPDATE" if i % 2 else "EHS_CREATE",
+            user_name="admin", department="QA",
+            # 每 5 条共用同一时间，验证 id 作为次排序键
+            created_at=base + timedelta(minutes=i // 5),
+        ))
+    db.commit()
+    db.close()
+
+
+def test_cursor_walks_all_rows_newest_first(collect):
+    titles, last_page = collect("/activities/", {"limit": 4})
+    assert titles == [f"t{i}" for i in range(24, -1, -1)]
+    assert last_page["total_is_estimate"] is True
+
+
+def test_filters_apply_to_every_page(collect):
+    titles, _ = collect("/activities/", {"limit": 3, "type": "QA"})
+    assert titles == [f"t{i}" for i in range(23, 0, -2)]
+
+
+def test_exact_total_is_opt_in(client):
+    data = client.get("/activities/", params={"limit": 5, "type": "EHS", "include_total": True}).json()
+    assert data["total"] == 13 and data["total_is_estimate"] is False
+    assert len(data["items"]) == 5
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/activities/", params={"cursor": "not-a-cursor"}).status_code == 400
+    # 能解码但值不合法：id 为空、类型不对
+    for values in ({"created_at": None, "id": None}, {"created_at": 5, "id": "x"},
+                   {"created_at": datetime(2025, 1, 1), "id": True}):
+        assert client.get("/activities/", params={"cursor": encode_cursor(values)}).status_code == 400
+
+
+def test_keyset_rejects_null_sort_value():
+    with pytest.raises(ValueError, match="NULL"):
+        keyset_before([Activity.id], [None])
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.activity import Activity
+from models.user import User
+from services.activity_writer import ActivityWriter
+
+
+def row(i):
+    return {"title": f"t{i}", "action": "a", "type": "QA_CREATE", "user_name": "u"}
+
+
+@pytest.fixture
+def with_writer(memory_db):
+    """在内存 SQLite 上运行 test(writer, count, inserts)"""
+    def run(test, **options):
+        async def main(engine, db):
+            inserts = []
+            event.listen(
+                engine.sync_engine, "before_cursor_execute",
+                lambda *args: inserts.append(args[2]) if args[2].startswith("INSERT") else None,
+            )
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+            async def count():
+                async with session_factory() as db:
+                    return (await db.execute(select(func.count(Activity.id)))).scalar()
+
+            await test(ActivityWriter(session_factory=session_factory, **options), count, inserts)
+
+        memory_db([User, Activity], main, poolclass=StaticPool)
+    return run
+
+
+def test_size_based_flush_uses_multi_row_insert(with_writer):
+    async def check(writer, count, inserts):
+        await writer.start()
+        for i in range(10):
+            await writer.submit(row(i))
+        await writer.flush()
+        assert await count() == 10
+        assert len(inserts) == 2
+        assert writer.status()["written"] == 10
+        await writer.close()
+
+    with_writer(check, batch_size=5, flush_interval=60)
+
+
+def test_time_based_flush(with_writer):
+    async def check(writer, count, inserts):
+        await writer.start()
+        await writer.submit(row(1))
+        await asyncio.sleep(0.2)
+        assert await count() == 1
+        await writer.close()
+
+    with_writer(check, batch_size=100, flush_interval=0.05)
+
+
+def test_close_drains_queue(with_writer):
+    async def check(writer, count, inserts):
+        await writer.start()
+        for i in range(7):
+            await writer.submit(row(i))
+        await writer.close()
+        assert await count() == 7
+        assert len(inserts) == 1
+
+    with_writer(check, batch_size=100, flush_interval=60)
+
+
+def test_full_queue_drops_records(with_writer):
+    async def check(writer, count, inserts):
+        await writer.start()
+        for i in range(5):
+            await writer.submit(row(i))
+        assert writer.status()["dropped"] == 3
+        await writer.close()
+        assert await count() == 2
+
+    with_writer(check, queue_size=2, batch_size=100, flush_interval=60)
+
+
+def test_sync_mode_writes_immediately(with_writer):
+    async def check(writer, count, inserts):
+        await writer.start()
+        await writer.submit(row(1))
+        assert await count() == 1
+        assert writer.status()["mode"] == "sync"
+
+    with_writer(check, sync=True)
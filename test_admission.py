@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from core.admission import AdmissionController, AdmissionMiddleware, RouteClass, classify
+
+CLASSES = (
+    RouteClass("write", 0, 2, 2),
+    RouteClass("read", 1, 2, 2),
+    RouteClass("bulk", 2, 1, 1),
+)
+
+
+@pytest.mark.parametrize("method,path,expected", [
+    ("PUT", "/qa/", "write"),
+    ("PUT", "/ehs/lwd", "write"),
+    ("POST", "/maint/daily", "write"),
+    ("DELETE", "/maint/weekly/3", "write"),
+    ("GET", "/qa/", "read"),
+    ("GET", "/maint/daily", "read"),
+    ("GET", "/activities/", "bulk"),
+    ("GET", "/qa/export", "bulk"),
+    ("GET", "/maint/weekly/export", "bulk"),
+    ("GET", "/metrics", None),
+    ("GET", "/monitor/db-pool", None),
+    ("OPTIONS", "/qa/", None),
+])
+def test_classify(method, path, expected):
+    assert classify(method, path) == expected
+
+
+class Gate:
+    """ASGI 应用：每个请求等到 release() 才返回，记录完成顺序"""
+
+    def __init__(self):
+        self.release_event = asyncio.Event()
+        self.started = []
+        self.finished = []
+
+    def release(self):
+        self.release_event.set()
+
+    async def __call__(self, scope, receive, send):
+        self.started.append(scope["path"])
+        await self.release_event.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+        self.finished.append(scope["path"])
+
+
+async def call(app, method: str, path: str):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "headers": []}, receive, send)
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        gate = Gate()
+        controller = AdmissionController(max_concurrency=10, classes=CLASSES, queue_timeout=5)
+        app = AdmissionMiddleware(gate, controller, enabled=True, retry_after=3)
+        # bulk 并发 1 + 排队 1，第三个立即拒绝
+        running = [asyncio.create_task(call(app, "GET", f"/activities/{i}")) for i in range(2)]
+        await settle()
+        status, headers = await call(app, "GET", "/activities/9")
+        assert (status, headers[b"retry-after"]) == (503, b"3")
+        assert controller.status()["classes"]["bulk"]["queued"] == 1
+        # 读接口不受批量读取排队影响
+        read = asyncio.create_task(call(app, "GET", "/qa/"))
+        await settle()
+        assert "/qa/" in gate.started
+        gate.release()
+        assert [status for status, _ in await asyncio.gather(*running, read)] == [200, 200, 200]
+        assert controller.rejected == {("bulk", "queue_full"): 1}
+        assert controller.active_total == 0
+
+    asyncio.run(scenario())
+
+
+def test_writes_are_admitted_before_queued_reads():
+    async def scenario():
+        gate = Gate()
+        controller = AdmissionController(max_concurrency=1, classes=CLASSES, queue_timeout=5)
+        app = AdmissionMiddleware(gate, controller, enabled=True)
+        first = asyncio.create_task(call(app, "GET", "/qa/first"))
+        await settle()
+        # 名额已满：先排队一个批量读取和一个读，再来一个写入
+        queued = [asyncio.create_task(call(app, method, path))
+                  for method, path in (("GET", "/activities/"), ("GET", "/qa/second"), ("PUT", "/qa/"))]
+        await settle()
+        gate.release()
+        await asyncio.gather(first, *queued)
+        assert gate.started == ["/qa/first", "/qa/", "/qa/second", "/activities/"]
+
+    asyncio.run(scenario())
+
+
+def test_queue_deadline():
+    async def scenario():
+        gate = Gate()
+        controller = AdmissionController(max_concurrency=1, classes=CLASSES, queue_timeout=0.05)
+        app = AdmissionMiddleware(gate, controller, enabled=True)
+        first = asyncio.create_task(call(app, "PUT", "/qa/"))
+        await settle()
+        status, _ = await call(app, "PUT", "/ehs/lwd")
+        assert status == 503
+        assert controller.rejected == {("write", "timeout"): 1}
+        assert controller.status()["classes"]["write"]["queued"] == 0
+        gate.release()
+        assert (await first)[0] == 200
+        assert controller.active_total == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_metrics_are_exported():
+    client = TestClient(main.app)
+    assert client.get("/monitor/admission").json()["classes"]["write"]["concurrency"] > 0
+    assert 'datalink_admission_admitted_total{class="read"}' in client.get("/metrics").text
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from core.redis import MemoryBackend
+from services.auth_cache import DepartmentRef, Principal, PrincipalCache
+
+
+def make_principal(user_id, name="u"):
+    return Principal(id=user_id, name=name, department_id=1, department=DepartmentRef(1, "QA"))
+
+
+def test_hit_until_token_expiry():
+    cache = PrincipalCache(maxsize=10)
+    cache.put("t1", make_principal(1), time.time() + 60)
+    cache.put("t2", make_principal(2), time.time() - 1)
+    assert cache.get("t1").department.name == "QA"
+    assert cache.get("t2") is None
+    assert cache.status()["entries"] == 1
+
+
+def test_lru_eviction():
+    cache = PrincipalCache(maxsize=2)
+    expires = time.time() + 60
+    cache.put("a", make_principal(1), expires)
+    cache.put("b", make_principal(2), expires)
+    cache.get("a")
+    cache.put("c", make_principal(3), expires)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_invalidate_user_across_workers():
+    async def main():
+        backend = MemoryBackend()
+        worker_a, worker_b = PrincipalCache(), PrincipalCache()
+        await worker_a.start(backend)
+        await worker_b.start(backend)
+        expires = time.time() + 60
+        for cache in (worker_a, worker_b):
+            cache.put("t1", make_principal(1), expires)
+            cache.put("t1-2", make_principal(1), expires)
+            cache.put("t2", make_principal(2), expires)
+        await worker_a.invalidate_user(1)
+        for cache in (worker_a, worker_b):
+            assert cache.get("t1") is None and cache.get("t1-2") is None
+            assert cache.get("t2") is not None
+        await worker_a.close()
+        await worker_b.close()
+
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+from sqlalchemy import event, select
+
+from models.qa import Qa
+from services.bulk_upsert import bulk_upsert
+
+QA_KEY = ("line", "year", "month", "day", "scrapflag")
+
+
+def cell(day, value, scrapflag=False):
+    return {"line": "L1", "year": 2025, "month": 3, "day": day, "value": float(value), "scrapflag": scrapflag}
+
+
+def test_insert_update_and_skip_unchanged(memory_db):
+    async def check(engine, db):
+        result = await bulk_upsert(db, Qa, [cell(1, 5), cell(1, 2, True), cell(2, 7)], QA_KEY, ("value",))
+        await db.commit()
+        assert len(result.created) == 3 and not result.updated
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        result = await bulk_upsert(db, Qa, [cell(1, 5), cell(1, 3, True), cell(3, 1)], QA_KEY, ("value",))
+        await db.commit()
+        assert result.unchanged == 1
+        assert [(before["value"], after["value"]) for before, after in result.updated] == [(2, 3)]
+        assert [row["day"] for row in result.created] == [3]
+        # 一次查询 + 一次多行写入
+        assert len([s for s in statements if s.startswith(("SELECT", "INSERT"))]) == 2
+
+        rows = (await db.execute(select(Qa.day, Qa.scrapflag, Qa.value).order_by(Qa.day, Qa.scrapflag))).all()
+        assert rows == [(1, False, 5), (1, True, 3), (2, False, 7), (3, False, 1)]
+
+    memory_db([Qa], check)
+
+
+def test_nothing_written_when_unchanged(memory_db):
+    async def check(engine, db):
+        await bulk_upsert(db, Qa, [cell(1, 5)], QA_KEY, ("value",))
+        await db.commit()
+        result = await bulk_upsert(db, Qa, [cell(1, 5), cell(1, 5)], QA_KEY, ("value",))
+        assert not result.changed and result.unchanged == 1
+
+    memory_db([Qa], check)
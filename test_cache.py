@@ -0,0 +1,107 @@
+import asyncio
+
+from core.redis import Cache, CacheKey, MemoryBackend
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Loader:
+    """记录调用次数的加载函数"""
+
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.value
+
+
+def test_read_through_hits_after_first_load():
+    async def main():
+        cache = Cache(MemoryBackend())
+        loader = Loader([{"line": "L1", "value": "5"}])
+        key = CacheKey("qa", "2025-3")
+        first = await cache.get_or_load(key, loader)
+        second = await cache.get_or_load(key, loader)
+        assert first == second == loader.value
+        assert loader.calls == 1
+        assert cache.stats["misses"] == 1 and cache.stats["hits"] == 1
+    run(main())
+
+
+def test_invalidation_is_scoped_to_module_and_period():
+    async def main():
+        cache = Cache(MemoryBackend())
+        march, april = Loader("march"), Loader("april")
+        await cache.get_or_load(CacheKey("qa", "2025-3"), march)
+        await cache.get_or_load(CacheKey("qa", "2025-4"), april)
+        await cache.invalidate("qa", "2025-3")
+        await cache.get_or_load(CacheKey("qa", "2025-3"), march)
+        await cache.get_or_load(CacheKey("qa", "2025-4"), april)
+        assert march.calls == 2
+        assert april.calls == 1
+    run(main())
+
+
+def test_invalidation_is_published_to_other_workers():
+    async def main():
+        backend = MemoryBackend()
+        worker_a, worker_b = Cache(backend), Cache(backend)
+        await worker_a.start()
+        await worker_b.start()
+        key = CacheKey("ehs", "2025", "lwd")
+        await worker_b.get_or_load(key, Loader("old"))
+        # worker_b 本地缓存中已有旧值，worker_a 的失效需要通过 pub/sub 清理它
+        await worker_a.invalidate("ehs", "2025")
+        assert await worker_b.get_or_load(key, Loader("new")) == "new"
+        await worker_a.close()
+        await worker_b.close()
+    run(main())
+
+
+def test_stale_value_is_served_while_revalidating():
+    async def main():
+        cache = Cache(MemoryBackend(), local_ttl=0)
+        key = CacheKey("events", "all")
+        await cache.get_or_load(key, Loader("v1"), ttl=0, stale_ttl=60)
+        slow = Loader("v2", delay=0.05)
+        # 已过期：立即返回旧值，后台刷新
+        assert await cache.get_or_load(key, slow, ttl=60, stale_ttl=60) == "v1"
+        assert cache.stats["stale_hits"] == 1
+        await asyncio.sleep(0.1)
+        assert slow.calls == 1
+        assert await cache.get_or_load(key, slow, ttl=60, stale_ttl=60) == "v2"
+    run(main())
+
+
+def test_concurrent_misses_load_once():
+    async def main():
+        cache = Cache(MemoryBackend())
+        loader = Loader("value", delay=0.05)
+        key = CacheKey("qa_kpi", "2025-3")
+        results = await asyncio.gather(*(cache.get_or_load(key, loader) for _ in range(10)))
+        assert results == ["value"] * 10
+        assert loader.calls == 1
+    run(main())
+
+
+def test_failed_refresh_keeps_serving_stale_value():
+    async def main():
+        cache = Cache(MemoryBackend(), local_ttl=0)
+        key = CacheKey("qa_monthly", "2025-3")
+        await cache.get_or_load(key, Loader("v1"), ttl=0, stale_ttl=60)
+
+        async def broken():
+            raise RuntimeError("db down")
+
+        assert await cache.get_or_load(key, broken) == "v1"
+        await asyncio.sleep(0.01)
+        assert await cache.get_or_load(key, broken) == "v1"
+        assert cache.stats["errors"] >= 1
+    run(main())
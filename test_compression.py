@@ -0,0 +1,85 @@
+import gzip
+import zlib
+
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from core.compression import CompressionMiddleware, negotiate, skip_compression
+
+ROWS = [{"id": i, "title": f"巡检 {i}", "content": "检查液压站油位并记录压力"} for i in range(200)]
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+
+@app.get("/big")
+async def big():
+    return ORJSONResponse(ROWS, headers={"ETag": '"v1"'})
+
+
+@app.get("/small")
+async def small():
+    return {"ok": True}
+
+
+@app.get("/raw")
+@skip_compression
+async def raw():
+    return ROWS
+
+
+@app.get("/stream")
+async def stream(rows: int = 200):
+    async def lines():
+        for row in ROWS[:rows]:
+            yield orjson.dumps(row) + b"\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+client = TestClient(app)
+
+
+def test_gzip_whole_response():
+    response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # 压缩后强 ETag 变为弱 ETag
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.json() == ROWS
+    assert int(response.headers["content-length"]) < len(orjson.dumps(ROWS)) / 3
+
+
+def test_brotli_preferred_and_q_values():
+    assert negotiate("gzip, br") == "br"
+    assert negotiate("gzip, br;q=0") == "gzip"
+    assert negotiate("identity") is None
+    assert negotiate("*") == "br"
+    assert negotiate("br", allow_brotli=False) is None
+    response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == ROWS
+
+
+def test_small_opted_out_and_identity_pass_through():
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    raw = client.get("/raw", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in raw.headers and raw.json() == ROWS
+    plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.headers["etag"] == '"v1"'
+
+
+def test_streaming_is_compressed_chunk_by_chunk():
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        compressed = b"".join(response.iter_raw())
+    decoder = zlib.decompressobj(31)
+    lines = (decoder.decompress(compressed) + decoder.flush()).splitlines()
+    assert [orjson.loads(line) for line in lines] == ROWS
+    assert gzip.decompress(compressed).count(b"\n") == len(ROWS)
+
+    # 总大小不到阈值的流式响应不压缩
+    short = client.get("/stream", params={"rows": 2}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in short.headers and len(short.text.splitlines()) == 2
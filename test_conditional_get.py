@@ -0,0 +1,74 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from core.redis import MemoryBackend, cache
+from core.versions import TableVersions, table_versions
+from db.database import SessionLocal
+from models.qa import Qa
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(Qa).delete()
+    db.add(Qa(line="L1", year=time.localtime().tm_year, month=3, day=1, value="5", scrapflag=False))
+    db.commit()
+    db.close()
+
+
+def test_if_none_match_returns_304_without_loading(client):
+    first = client.get("/qa/", params={"month": 3})
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    loads = (cache.stats["hits"], cache.stats["misses"], cache.stats["stale_hits"])
+    again = client.get("/qa/", params={"month": 3}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    # 304 不读缓存数据，也不查库
+    assert (cache.stats["hits"], cache.stats["misses"], cache.stats["stale_hits"]) == loads
+
+    # 参数不同 ETag 不同
+    other = client.get("/qa/", params={"month": 4}, headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+def test_write_path_changes_etag(client):
+    etag = client.get("/events/", params={"department": "ETAG"}).headers["etag"]
+    assert client.get("/events/", params={"department": "ETAG"}, headers={"If-None-Match": etag}).status_code == 304
+
+    created = client.post("/events/", json={
+        "name": "月度评审", "department": "ETAG",
+        "start_time": "2025-03-01", "end_time": "2025-03-02",
+    })
+    assert created.status_code == 200
+    changed = client.get("/events/", params={"department": "ETAG"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert [event["name"] for event in changed.json()] == ["月度评审"]
+
+
+def test_validators():
+    async def main():
+        versions = TableVersions(MemoryBackend())
+        first = await versions.validators(["qa"], "k")
+        assert (await versions.validators(["qa"], "k")).etag == first.etag
+        assert (await versions.validators(["qa"], "k2")).etag != first.etag
+        assert first.not_modified(f'W/{first.etag}, "other"', None)
+        assert first.not_modified("*", None)
+        assert not first.not_modified('"other"', None)
+        await versions.bump("qa")
+        assert (await versions.validators(["qa", "ehs"], "k")).etag != first.etag
+        assert (await versions.validators(["qa"], "k")).etag != first.etag
+
+        # 修改发生在当前这一秒内时不给 Last-Modified，也不按 If-Modified-Since 判断
+        current = await versions.validators(["qa"], "k")
+        assert "Last-Modified" not in current.headers()
+        assert not current.not_modified(None, formatdate(time.time(), usegmt=True))
+        old = type(current)(current.etag, time.time() - 10)
+        assert old.headers()["Last-Modified"] == formatdate(int(old.modified_at), usegmt=True)
+        assert old.not_modified(None, formatdate(time.time() - 5, usegmt=True))
+        assert not old.not_modified(None, formatdate(time.time() - 60, usegmt=True))
+    asyncio.run(main())
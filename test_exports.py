@@ -0,0 +1,144 @@
+import csv
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+import orjson
+import pytest
+from sqlalchemy import create_engine
+
+from db.database import Base, SessionLocal
+from models.activity import Activity
+from models.qa import Qa
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(Qa).filter(Qa.year == 2031).delete()
+    for day in range(1, 4):
+        db.add(Qa(line="L1", year=2031, month=5, day=day, value=day * 1.5, scrapflag=False))
+    db.add(Qa(line="L2", year=2031, month=5, day=1, value=7, scrapflag=True))
+    db.commit()
+    db.close()
+
+
+def test_csv_ndjson_and_xlsx_contain_the_same_rows(client):
+    params = {"year": 2031, "month": 5}
+    response = client.get("/qa/export", params={**params, "format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    assert response.content.startswith("﻿".encode())
+    rows = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert rows[0] == ["年", "月", "日", "产线", "报废", "数值"]
+    assert rows[1:] == [
+        ["2031", "5", "1", "L1", "False", "1.5"], ["2031", "5", "2", "L1", "False", "3.0"],
+        ["2031", "5", "3", "L1", "False", "4.5"], ["2031", "5", "1", "L2", "True", "7.0"],
+    ]
+
+    lines = client.get("/qa/export", params={**params, "format": "ndjson", "line": "L2"}).text.splitlines()
+    assert [orjson.loads(line) for line in lines] == [
+        {"year": 2031, "month": 5, "day": 1, "line": "L2", "scrapflag": True, "value": 7.0}
+    ]
+
+    xlsx = zipfile.ZipFile(io.BytesIO(client.get("/qa/export", params={**params, "format": "xlsx"}).content))
+    assert xlsx.testzip() is None
+    sheet = xlsx.read("xl/worksheets/sheet1.xml").decode()
+    assert sheet.count("<row ") == 5 and "<v>4.5</v>" in sheet and '<c r="E5" t="b"><v>1</v></c>' in sheet
+
+
+def test_export_records_activity(client):
+    client.get("/qa/export", params={"year": 2031, "line": "L1"})
+    db = SessionLocal()
+    try:
+        activity = db.query(Activity).filter(Activity.type == "QA_EXPORT").order_by(Activity.id.desc()).first()
+    finally:
+        db.close()
+    assert activity.action == "导出了3条GP12数据"
+    assert activity.details == "格式: CSV, 年份: 2031, 产线: L1"
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get("/activities/export", params={"format": "pdf"}).status_code == 422
+
+
+# 在子进程中直接驱动 ASGI 应用（测试客户端会缓冲整个响应体），导出后比较峰值 RSS
+EXPORT_SCRIPT = r"""
+import asyncio, resource, sys, time
+import main
+from db.database import async_engine
+from services.auth_cache import Principal, principal_cache
+
+# 独立进程没有测试夹具：预先放入已验证的 token，请求照常经过 get_current_user
+principal_cache.put("export-test", Principal(id=1, name="export", department_id=None, department=None), time.time() + 600)
+
+async def export(query):
+    size = 0
+    scope = {"type": "http", "method": "GET", "path": "/qa/export", "raw_path": b"/qa/export",
+             "query_string": query.encode(), "headers": [(b"authorization", b"Bearer export-test")],
+             "http_version": "1.1", "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+
+    received = asyncio.Event()
+
+    async def receive():
+        # 第一次返回请求体，之后一直等待（客户端未断开）
+        if received.is_set():
+            await asyncio.Event().wait()
+        received.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await main.app(scope, receive, send)
+    return size
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def run():
+    try:
+        await export("year=2030&month=1&line=L1&format=" + sys.argv[1])
+        before = peak_mb()
+        size = await export("year=2030&format=" + sys.argv[1])
+        print(size, before, peak_mb())
+    finally:
+        await async_engine.dispose()
+
+asyncio.run(run())
+"""
+
+
+def test_million_row_export_keeps_rss_bounded():
+    path = os.path.join(tempfile.mkdtemp(), "export.db")
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    conn = sqlite3.connect(path)
+    # 12 月 x 1345 条线 x 31 天 x 正常/报废 > 1M 行
+    conn.executemany(
+        "INSERT INTO qa (line, year, month, day, value, scrapflag) VALUES (?, 2030, ?, ?, ?, ?)",
+        ((f"L{line}", month, day, day * 1.5, flag)
+         for month in range(1, 13) for line in range(1345) for day in range(1, 32) for flag in (0, 1)),
+    )
+    conn.commit()
+    assert conn.execute("SELECT count(*) FROM qa").fetchone()[0] >= 1_000_000
+    conn.close()
+
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{path}", "ACTIVITY_WRITER_SYNC": "1"}
+    for format in ("csv", "ndjson", "xlsx"):
+        result = subprocess.run(
+            [sys.executable, "-c", EXPORT_SCRIPT, format], env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=300,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+        size, before, after = map(float, result.stdout.split()[-3:])
+        # 导出内容 20-80MB，峰值 RSS 增长应与行数无关（实测 < 2MB）
+        assert size > 20_000_000
+        assert after - before < 40, (format, before, after)
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+
+from db.database import SessionLocal
+from db.readonly import RowView
+from models.maint import MaintDaily, MaintWeekly
+from schemas.maint_work import MaintDailyResponse, MaintWeeklyResponse
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(MaintDaily).delete()
+    db.query(MaintWeekly).delete()
+    for i in range(3):
+        db.add(MaintDaily(date=date(2025, 3, i + 1), user_id=1, title=f"巡检{i}", wheres="二号线", type=1, content_daily="c", solved_flag=i % 2))
+        db.add(MaintWeekly(DateTime=date(2025, 3, i + 1), user_id=1, title=f"问题{i}", wheres="焊装", content="c", degree="中等", solved_flag=0))
+    db.commit()
+    db.close()
+
+
+def expected(schema, model, order):
+    db = SessionLocal()
+    try:
+        return [schema.model_validate_from_orm(row).model_dump(mode="json") for row in db.query(model).order_by(*order)]
+    finally:
+        db.close()
+
+
+def test_fast_path_matches_response_model(client):
+    daily = client.get("/maint/daily").json()["items"]
+    assert daily == expected(MaintDailyResponse, MaintDaily, (MaintDaily.date.asc(), MaintDaily.id.asc()))
+    issues = client.get("/maint/issues").json()["items"]
+    assert issues == expected(MaintWeeklyResponse, MaintWeekly, (MaintWeekly.DateTime.desc(), MaintWeekly.id.desc()))
+    assert client.get("/maint/weekly", params={"user_id": 2}).json()["items"] == []
+
+
+def test_row_view_declares_renames_once(client):
+    db = SessionLocal()
+    try:
+        db.add(MaintWeekly(DateTime=date(2025, 4, 1), user_id=9, title="t", wheres="w", content="c", degree="d", solved_flag=None))
+        db.commit()
+    finally:
+        db.close()
+    rows = client.get("/maint/issues", params={"user_id": 9}).json()["items"]
+    assert rows == [{"title": "t", "wheres": "w", "content": "c", "degree": "d", "id": rows[0]["id"],
+                     "date_time": "2025-04-01", "user_id": 9, "solved": False}]
+
+    @dataclass(slots=True)
+    class Pair:
+        a: int
+        b: int
+
+    try:
+        RowView(Pair, {"b": MaintDaily.id, "a": MaintDaily.user_id})
+    except ValueError:
+        return
+    raise AssertionError("视图列与 DTO 字段顺序不一致时应报错")
@@ -0,0 +1,159 @@
+import csv
+import io
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from db.database import SessionLocal
+from models.activity import Activity
+from models.ehs import Ehs
+from models.qa import Qa, QaKpi, QaMonthlyRollup
+from services.xlsx_stream import XlsxStreamWriter, iter_rows
+
+LINES = [f"L{i}" for i in range(1, 10)]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(Qa).filter(Qa.year.in_([2032, 2033, 2034])).delete()
+    db.query(QaKpi).filter(QaKpi.year == 2032).delete()
+    db.query(Ehs).filter(Ehs.year == 2032).delete()
+    # 已知产线
+    for line in LINES:
+        db.add(Qa(line=line, year=2033, month=1, day=1, value=1, scrapflag=False))
+    db.commit()
+    db.close()
+
+
+def csv_file(rows, encoding="utf-8-sig") -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode(encoding)
+
+
+def xlsx_file(header, rows) -> bytes:
+    writer = XlsxStreamWriter(header)
+    return writer.write_rows(rows) + writer.close()
+
+
+@pytest.fixture
+def upload(client):
+    def post(path, name, content):
+        return client.post(path, files={"file": (name, content)})
+    return post
+
+
+def last_activity(type_):
+    db = SessionLocal()
+    try:
+        return db.query(Activity).filter(Activity.type == type_).order_by(Activity.id.desc()).first()
+    finally:
+        db.close()
+
+
+def test_gp12_csv_import_upserts_and_updates_rollup(upload):
+    content = csv_file([
+        ["产线", "日期", "报废", "数值"],
+        ["L1", "2032-03-01", "否", "12"],
+        ["L1", "2032/3/2", "", "8.5"],
+        ["L1", "2032-03-01", "是", "2"],
+        ["L2", "2032-03-01", "0", ""],
+    ])
+    response = upload("/qa/import", "gp12.csv", content)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"filename": "gp12.csv", "rows": 4, "created": 4, "updated": 0, "unchanged": 0, "deleted": 0}
+
+    # 再次导入：一格更新，其余未变化；年/月/日 列与 GB18030 编码
+    content = csv_file([["line", "year", "month", "day", "scrapflag", "value"],
+                        ["L1", 2032, 3, 1, "False", "13"], ["L1", 2032, 3, 2, "False", "8.5"]], encoding="gb18030")
+    assert upload("/qa/import", "gp12.csv", content).json()["updated"] == 1
+
+    db = SessionLocal()
+    try:
+        rollup = db.query(QaMonthlyRollup).filter_by(line="L1", year=2032, month=3).one()
+        assert (rollup.value_sum, rollup.scrap_sum) == (21.5, 2)
+    finally:
+        db.close()
+
+    activity = last_activity("QA_UPLOAD")
+    assert activity.action == "导入了2条GP12数据"
+    assert activity.details == "文件: gp12.csv, 新增: 0, 更新: 1, 未变化: 1"
+
+
+def test_exported_xlsx_imports_back(client, upload):
+    exported = client.get("/qa/export", params={"year": 2032, "month": 3, "format": "xlsx"}).content
+    assert [row for _, row in iter_rows(io.BytesIO(exported))][0] == ["年", "月", "日", "产线", "报废", "数值"]
+    response = upload("/qa/import", "gp12.xlsx", exported)
+    assert response.status_code == 200, response.text
+    assert response.json()["unchanged"] == 4
+
+
+def test_row_errors_are_reported_and_nothing_is_written(upload):
+    content = xlsx_file(["产线", "年", "月", "日", "数值"], [
+        ["L3", 2032, 4, 1, 5],
+        ["L3", 2032, 2, 30, 5],
+        ["ZZ", 2032, 4, 2, 3],
+        ["L3", 2032, 13, 3, 1],
+        ["L3", 2032, 4, 1, 6],
+        ["L3", 2032, 4, 4, "abc"],
+    ])
+    response = upload("/qa/import", "bad.xlsx", content)
+    assert response.status_code == 422
+    detail = response.json()["detail"]
+    assert detail["error_count"] == 5
+    assert detail["errors"] == [
+        {"row": 3, "column": "日", "message": "2032-2 没有 30 日"},
+        {"row": 4, "column": "产线", "message": "未知产线 ZZ"},
+        {"row": 5, "column": "月", "message": "必须在 1 到 12 之间"},
+        {"row": 6, "column": None, "message": "与第 2 行重复"},
+        {"row": 7, "column": "数值", "message": "必须为数字"},
+    ]
+    db = SessionLocal()
+    try:
+        assert db.query(Qa).filter_by(year=2032, month=4).count() == 0
+    finally:
+        db.close()
+
+
+def test_unreadable_files_are_rejected(upload):
+    assert upload("/qa/import", "gp12.txt", b"x").status_code == 400
+    assert upload("/qa/import", "gp12.xlsx", b"not a zip").status_code == 400
+    response = upload("/qa/import", "gp12.csv", csv_file([["产线", "数值"], ["L1", "1"]]))
+    assert response.status_code == 400 and "日期" in response.json()["detail"]
+
+
+def test_lwd_and_kpi_import(upload):
+    response = upload("/ehs/lwd/import", "lwd.csv", csv_file([["年", "周", "LWD"], [2032, 1, 10], [2032, 2, 11]]))
+    assert response.json()["created"] == 2
+
+    db = SessionLocal()
+    db.add(QaKpi(year=2032, month=5, area="旧", description="旧指标", new_factory=1, old_factory=1, total=2))
+    db.commit()
+    db.close()
+    content = csv_file([["年", "月", "区域", "描述", "新厂", "老厂", "汇总"],
+                        [2032, 5, "新厂", "客户投诉", 1, "", 1], [2032, 5, "汇总", "客户投诉", 1, 0, 1]])
+    response = upload("/qa/kpi/import", "kpi.csv", content)
+    assert response.json()["created"] == 2 and response.json()["deleted"] == 1
+    db = SessionLocal()
+    try:
+        assert sorted(row.area for row in db.query(QaKpi).filter_by(year=2032, month=5)) == ["新厂", "汇总"]
+    finally:
+        db.close()
+    assert last_activity("QA_UPLOAD").details.endswith("替换删除: 1")
+
+
+def test_year_of_gp12_imports_in_seconds(upload):
+    start = date(2034, 1, 1)
+    rows = [
+        [line, (start + timedelta(days=offset)).isoformat(), flag, (offset * 7 + i) % 100]
+        for offset in range(365) for i, line in enumerate(LINES) for flag in ("否", "是")
+    ]
+    content = xlsx_file(["产线", "日期", "报废", "数值"], rows)
+    started = time.perf_counter()
+    response = upload("/qa/import", "year.xlsx", content)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == len(rows) == 6570
+    assert elapsed < 10
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+import pytest
+
+from core.pagination import encode_cursor
+from db.database import SessionLocal
+from models.maint import MaintDaily, MaintWeekly
+
+
+@pytest.fixture(scope="module", autouse=True)
+def seed(schema):
+    db = SessionLocal()
+    db.query(MaintDaily).delete()
+    db.query(MaintWeekly).delete()
+    base = date(2025, 3, 1)
+    for i in range(20):
+        # 每 4 条共用同一日期，验证 id 作为次排序键
+        day = base + timedelta(days=i // 4)
+        db.add(MaintDaily(date=day, user_id=1, title=f"d{i}", wheres="w", type=i % 2, content_daily="c", solved_flag=0))
+        db.add(MaintWeekly(DateTime=day, user_id=1, title=f"w{i}", wheres="w", content="c",
+                           degree="严重" if i % 3 == 0 else "中等", solved_flag=i % 2))
+    db.commit()
+    db.close()
+
+
+def test_daily_cursor_walks_all_rows_in_date_order(collect):
+    titles, last_page = collect("/maint/daily", {"limit": 3})
+    assert titles == [f"d{i}" for i in range(20)]
+    assert last_page["total"] is None and last_page["total_is_estimate"] is False
+
+    titles, _ = collect("/maint/daily", {"limit": 3, "order": "desc"})
+    assert titles == [f"d{i}" for i in range(19, -1, -1)]
+
+
+def test_daily_filters_by_date_range_and_type(client, collect):
+    params = {"limit": 2, "start_date": "2025-03-02", "end_date": "2025-03-03", "type": 1, "include_total": True}
+    titles, _ = collect("/maint/daily", params)
+    assert titles == ["d5", "d7", "d9", "d11"]
+    assert client.get("/maint/daily", params=params).json()["total"] == 4
+
+
+def test_issues_default_newest_first_with_degree_filter(collect):
+    titles, _ = collect("/maint/issues", {"limit": 2, "degree": "严重"})
+    assert titles == [f"w{i}" for i in (18, 15, 12, 9, 6, 3, 0)]
+    titles, _ = collect("/maint/weekly", {"limit": 4, "solved": True, "end_date": "2025-03-02"})
+    assert titles == ["w1", "w3", "w5", "w7"]
+
+
+def test_limit_is_bounded(client):
+    assert client.get("/maint/daily", params={"limit": 0}).status_code == 422
+    assert client.get("/maint/issues", params={"limit": 10000}).status_code == 422
+
+
+@pytest.mark.parametrize("path,key", [("/maint/daily", "date"), ("/maint/weekly", "date_time"),
+                                      ("/maint/issues", "date_time")])
+def test_malformed_cursor_is_rejected(client, path, key):
+    for values in ({key: None, "id": None}, {key: "2025-03-01", "id": 1}, {key: date(2025, 3, 1), "id": "x"}):
+        assert client.get(path, params={"cursor": encode_cursor(values)}).status_code == 400
+    # 日期为空、id 合法的游标属于正常翻页（NULL 日期的行）
+    assert client.get(path, params={"cursor": encode_cursor({key: None, "id": 1})}).status_code == 200
+
+
+def test_null_dates_are_paged_across_page_boundaries(collect):
+    # 3 条无日期 + 3 条有日期，limit=2 时 NULL 与非 NULL 跨页相接
+    db = SessionLocal()
+    base = date(2025, 4, 1)
+    for i, day in enumerate([None, None, None, base, base, base + timedelta(days=1)]):
+        db.add(MaintDaily(date=day, user_id=2, title=f"nd{i}", wheres="w", type=0, content_daily="c", solved_flag=0))
+        db.add(MaintWeekly(DateTime=day, user_id=2, title=f"nw{i}", wheres="w", content="c", degree="中等", solved_flag=0))
+    db.commit()
+    try:
+        # NULL 按最小值排序：升序在最前，降序在最后
+        titles, _ = collect("/maint/daily", {"limit": 2, "user_id": 2})
+        assert titles == [f"nd{i}" for i in range(6)]
+        titles, _ = collect("/maint/daily", {"limit": 2, "user_id": 2, "order": "desc"})
+        assert titles == ["nd5", "nd4", "nd3", "nd2", "nd1", "nd0"]
+        titles, _ = collect("/maint/weekly", {"limit": 2, "user_id": 2})
+        assert titles == [f"nw{i}" for i in range(6)]
+        titles, _ = collect("/maint/issues", {"limit": 2, "user_id": 2})
+        assert titles == ["nw5", "nw4", "nw3", "nw2", "nw1", "nw0"]
+    finally:
+        db.query(MaintDaily).filter(MaintDaily.user_id == 2).delete()
+        db.query(MaintWeekly).filter(MaintWeekly.user_id == 2).delete()
+        db.commit()
+        db.close()
@@ -0,0 +1,60 @@
+from sqlalchemy import delete, select
+
+from models.qa import Qa, QaMonthlyRollup
+from services.bulk_upsert import bulk_upsert
+from services.qa_rollup import rebuild_rollup, refresh_rollup
+
+QA_KEY = ("line", "year", "month", "day", "scrapflag")
+
+
+def cell(line, day, value, scrapflag=False, month=3):
+    return {"line": line, "year": 2025, "month": month, "day": day, "value": value, "scrapflag": scrapflag}
+
+
+async def snapshot(db):
+    rows = (await db.execute(select(QaMonthlyRollup).order_by(QaMonthlyRollup.line, QaMonthlyRollup.month))).scalars()
+    return [
+        (r.line, r.month, r.value_sum, r.scrap_sum, r.cell_count, r.scrap_count, r.min_value, r.max_value)
+        for r in rows
+    ]
+
+
+async def save(db, rows):
+    """模拟 update_qas：批量保存后在同一事务中刷新汇总"""
+    await bulk_upsert(db, Qa, rows, QA_KEY, ("value",))
+    await refresh_rollup(db, [(row["line"], row["year"], row["month"]) for row in rows])
+    await db.commit()
+
+
+def test_incremental_rollup_matches_rebuild(memory_db):
+    async def check(engine, db):
+        await save(db, [cell("L1", 1, 5), cell("L1", 2, 9), cell("L1", 1, 2, True), cell("L2", 1, 4, month=4)])
+        assert await snapshot(db) == [
+            ("L1", 3, 14, 2, 3, 1, 5, 9),
+            ("L2", 4, 4, 0, 1, 0, 4, 4),
+        ]
+
+        # 修改最大值、删除某组全部数据后，min/max 与计数仍然正确
+        await save(db, [cell("L1", 2, 1), cell("L1", 3, None)])
+        await db.execute(delete(Qa).where(Qa.line == "L2"))
+        await refresh_rollup(db, [("L2", 2025, 4)])
+        await db.commit()
+        incremental = await snapshot(db)
+        assert incremental == [("L1", 3, 6, 2, 3, 1, 1, 5)]
+
+        await rebuild_rollup(db)
+        assert await snapshot(db) == incremental
+
+    memory_db([Qa, QaMonthlyRollup], check)
+
+
+def test_rebuild_skips_rows_without_line_year_or_month(memory_db):
+    async def check(engine, db):
+        await save(db, [cell("L1", 1, 5), cell("L1", 2, 3)])
+        # 迁移时无法解析年份的旧数据
+        db.add(Qa(line="L1", year=None, month=3, day=4, value=7, scrapflag=False))
+        await db.commit()
+        assert await rebuild_rollup(db) == 1
+        assert await snapshot(db) == [("L1", 3, 8, 0, 2, 0, 3, 5)]
+
+    memory_db([Qa, QaMonthlyRollup], check)
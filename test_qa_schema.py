@@ -0,0 +1,29 @@
+import pytest
+from pydantic import ValidationError
+
+import models  # noqa: F401  注册全部模型（关系按类名解析）
+from models.qa import Qa as QaModel
+from schemas.qa import Qa, QaUpdate
+
+
+def test_typed_row_serialises_as_legacy_strings():
+    row = QaModel(id=1, line="L1", day=3, month=3, year=2025, value=5.0, scrapflag=False)
+    assert Qa.model_validate(row, from_attributes=True).model_dump() == {
+        "id": 1, "line": "L1", "day": "3", "month": "3", "year": "2025", "value": "5", "scrapflag": False,
+    }
+    row.value = 2.5
+    assert Qa.model_validate(row, from_attributes=True).value == "2.5"
+    row.value = None
+    assert Qa.model_validate(row, from_attributes=True).value == ""
+
+
+def test_string_payload_converts_to_columns():
+    payload = QaUpdate(line="L1", day="03", month="3", year="2025", value=" ", scrapflag=True)
+    assert payload.to_row() == {"line": "L1", "day": 3, "month": 3, "year": 2025, "value": None, "scrapflag": True}
+
+
+def test_invalid_numbers_are_rejected():
+    with pytest.raises(ValidationError):
+        QaUpdate(line="L1", day="x", month="3", year="2025", value="5")
+    with pytest.raises(ValidationError):
+        QaUpdate(line="L1", day="1", month="3", year="2025", value="abc")
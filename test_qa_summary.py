@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+
+from models.qa import Qa, MonthlyTotal, QaMonthlyRollup
+from services.qa_rollup import rebuild_rollup
+from services.qa_summary import qa_summary
+
+
+def cells():
+    rows = []
+    for year, base in ((2024, 10), (2025, 20)):
+        for month in (1, 2):
+            for day in (1, 2):
+                rows.append(Qa(line="L1", year=year, month=month, day=day, value=base, scrapflag=False))
+                rows.append(Qa(line="L1", year=year, month=month, day=day, value=1, scrapflag=True))
+                rows.append(Qa(line="L2", year=year, month=month, day=day, value=base * 2, scrapflag=False))
+    # 未填写的格不计入
+    rows.append(Qa(line="L2", year=2025, month=2, day=3, value=None, scrapflag=True))
+    return rows
+
+
+@pytest.fixture
+def run(memory_db):
+    """在写入了 cells() 和月度总数、重建过汇总的内存库上运行 check(engine, db)"""
+    def run_check(check):
+        async def main(engine, db):
+            db.add_all(cells())
+            db.add_all([
+                MonthlyTotal(line="L1", year=2025, month=1, amount=400),
+                MonthlyTotal(line="L2", year=2025, month=1, amount=800),
+            ])
+            await db.commit()
+            await rebuild_rollup(db)
+            await check(engine, db)
+
+        memory_db([Qa, MonthlyTotal, QaMonthlyRollup], main)
+    return run_check
+
+
+def test_per_line_monthly_summary(run):
+    async def check(engine, db):
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        rows = await qa_summary(db, 2025)
+        # 只读汇总表和月度总数，不扫描日数据
+        assert len(statements) == 2 and not any("FROM qa " in sql or "FROM qa\n" in sql for sql in statements)
+        assert [(r["line"], r["month"]) for r in rows] == [("L1", 1), ("L1", 2), ("L2", 1), ("L2", 2)]
+        l1_feb = rows[1]
+        assert l1_feb["gp12_total"] == 40 and l1_feb["scrap_total"] == 2
+        assert l1_feb["ytd_gp12_total"] == 80 and l1_feb["ytd_scrap_total"] == 4
+        assert l1_feb["last_year_gp12_total"] == 20 and l1_feb["gp12_yoy"] == 1.0
+        assert l1_feb["amount"] is None and l1_feb["gp12_ratio"] is None
+        l1_jan = rows[0]
+        assert l1_jan["amount"] == 400 and l1_jan["gp12_ratio"] == 0.1 and l1_jan["scrap_ratio"] == 0.005
+
+    run(check)
+
+
+def test_plant_wide_single_month(run):
+    async def check(engine, db):
+        rows = await qa_summary(db, 2025, month=2, by_line=False)
+        assert len(rows) == 1
+        row = rows[0]
+        assert row["line"] is None and row["month"] == 2
+        assert row["gp12_total"] == 120 and row["ytd_gp12_total"] == 240
+        assert row["scrap_yoy"] == 0.0
+
+    run(check)
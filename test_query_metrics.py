@@ -0,0 +1,94 @@
+import os
+import re
+
+import pytest
+from sqlalchemy import select
+
+from core.config import LOG_DIR
+from core.logger import flush_logs
+from db import query_metrics
+from db.database import SessionLocal
+from db.query_metrics import query_budget, track_queries
+from models.qa import Qa, QaKpi
+
+pytestmark = pytest.mark.usefixtures("schema")
+
+
+def db_log() -> str:
+    flush_logs()
+    with open(os.path.join(LOG_DIR, "datalink_db.log"), encoding="utf-8") as f:
+        return f.read()
+
+
+# 各接口每次请求的 SQL 条数上限（读接口首次请求未命中缓存）
+BUDGETS = [
+    ("GET", "/qa/?month=3", None, 1),
+    ("GET", "/qa/kpi/?month=3", None, 1),
+    ("GET", "/ehs/lwd", None, 1),
+    ("GET", "/events/", None, 1),
+    ("GET", "/activities/?limit=20", None, 2),
+    ("GET", "/maint/daily?limit=20", None, 1),
+    ("GET", "/maint/issues?limit=20", None, 1),
+    ("PUT", "/qa/", [{"line": "QM", "year": "2035", "month": "1", "day": str(day), "value": "1"} for day in range(1, 11)], 6),
+    ("PUT", "/ehs/lwd", [{"year": 2035, "week": week, "lwd": week} for week in range(1, 11)], 3),
+]
+
+
+@pytest.mark.parametrize("method,path,body,budget", BUDGETS, ids=[f"{m} {p}" for m, p, _, _ in BUDGETS])
+def test_endpoint_query_budget(client, method, path, body, budget):
+    with query_budget(budget):
+        response = client.request(method, path, json=body)
+    assert response.status_code < 400, response.text
+
+
+def test_kpi_save_does_not_reload_rows_one_by_one(client):
+    items = [{"year": 2035, "month": 2, "area": "新厂", "description": f"指标{i}", "new_factory": i, "total": i}
+             for i in range(8)]
+    # 查原数据、删除、批量插入、读回、活动记录
+    with query_budget(5) as requests:
+        response = client.put("/qa/kpi/", json={"year": 2035, "month": 2, "items": items})
+    assert response.status_code == 200
+    assert all(item["id"] for item in response.json())
+    assert sum(count for statement, count in requests[0].statements.items() if statement.startswith("INSERT INTO qa_kpi")) == 1
+
+
+def test_server_timing_header(client):
+    response = client.get("/qa/kpi/?month=4")
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(r'db;dur=\d+\.\d;desc="\d+ queries", app;dur=\d+\.\d', timing)
+    assert "datalink_db_queries_per_request_count" in client.get("/metrics").text
+
+
+def test_repeated_statements_are_flagged_as_n_plus_one():
+    session = SessionLocal()
+    try:
+        with track_queries("N+1 测试") as stats:
+            for day in range(1, 7):
+                session.execute(select(Qa).where(Qa.day == day)).all()
+    finally:
+        session.close()
+    assert stats.count == 6
+    assert len(stats.repeated) == 1 and stats.repeated[0].startswith("SELECT qa.id")
+    assert "疑似 N+1: N+1 测试 中同一语句已执行 5 次: SELECT qa.id" in db_log()
+
+    # query_budget 对重复语句报错（不经过 HTTP，直接模拟一个请求）
+    with pytest.raises(AssertionError, match="疑似 N\\+1"):
+        with query_budget(100):
+            session = SessionLocal()
+            stats, token = query_metrics.begin_request("GET /fake")
+            try:
+                for day in range(1, 7):
+                    session.execute(select(Qa).where(Qa.day == day)).all()
+            finally:
+                query_metrics.end_request(stats, token)
+                session.close()
+
+
+def test_slow_queries_are_logged_with_parameters(monkeypatch):
+    monkeypatch.setattr(query_metrics, "DB_SLOW_QUERY_MS", 0)
+    session = SessionLocal()
+    try:
+        session.execute(select(QaKpi).where(QaKpi.description == "慢查询参数")).all()
+    finally:
+        session.close()
+    assert re.search(r"慢查询 \d+\.\dms: SELECT qa_kpi\.id.* 参数: \('慢查询参数',\)", db_log(), re.S)
@@ -0,0 +1,127 @@
+"""
+查询计划回归测试：对各路由的热点查询执行 EXPLAIN，出现全表扫描即失败
+
+默认在 conftest 指定的 SQLite 上运行；DATABASE_URL 指向 MySQL 测试库时检查 MySQL 的执行计划。
+SQLite 下不执行 ANALYZE：小数据量的统计信息会让优化器直接选择全表扫描，掩盖缺失的索引。
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from core.pagination import keyset_after, keyset_before
+from db.database import SessionLocal, engine
+from models.activity import Activity
+from models.ehs import Ehs
+from models.event import Event
+from models.maint import MaintDaily, MaintWeekly
+from models.qa import MonthlyTotal, Qa, Qad, QaKpi, QaMonthlyRollup
+from models.user import User
+
+TODAY = date(2025, 3, 15)
+NOW = datetime(2025, 3, 15, 8, 0)
+
+# 名称 -> 与路由一致的 WHERE / ORDER BY
+HOT_QUERIES = {
+    "maint_daily_by_user_solved": select(MaintDaily).where(
+        MaintDaily.user_id == 3, MaintDaily.date >= TODAY, MaintDaily.solved_flag == 0
+    ).order_by(MaintDaily.date.asc()),
+    "maint_daily_by_user": select(MaintDaily).where(MaintDaily.user_id == 3).order_by(MaintDaily.date.asc()),
+    "maint_daily_since": select(MaintDaily).where(MaintDaily.date >= TODAY).order_by(MaintDaily.date.asc()),
+    "maint_daily_next_page": select(MaintDaily).where(
+        MaintDaily.user_id == 3, MaintDaily.date.between(TODAY - timedelta(days=30), TODAY),
+        keyset_after([MaintDaily.date, MaintDaily.id], [TODAY - timedelta(days=7), 100]),
+    ).order_by(MaintDaily.date.asc(), MaintDaily.id.asc()).limit(101),
+    "maint_issues_next_page": select(MaintWeekly).where(
+        MaintWeekly.degree == "1", keyset_before([MaintWeekly.DateTime, MaintWeekly.id], [TODAY, 100])
+    ).order_by(MaintWeekly.DateTime.desc(), MaintWeekly.id.desc()).limit(101),
+    "maint_weekly_by_user": select(MaintWeekly).where(MaintWeekly.user_id == 3).order_by(MaintWeekly.DateTime.asc()),
+    "maint_issues_by_user_solved": select(MaintWeekly).where(
+        MaintWeekly.user_id == 3, MaintWeekly.solved_flag == 0
+    ).order_by(MaintWeekly.DateTime.desc()),
+    "events_by_department": select(Event).where(Event.department == "QA").order_by(Event.start_time).limit(10),
+    "events_upcoming": select(Event).where(Event.start_time >= TODAY).order_by(Event.start_time).limit(10),
+    "activities_latest": select(Activity).order_by(Activity.created_at.desc(), Activity.id.desc()).limit(11),
+    "activities_by_department": select(Activity).where(Activity.department == "QA").order_by(
+        Activity.created_at.desc(), Activity.id.desc()
+    ).limit(11),
+    "activities_recent_days": select(Activity).where(Activity.created_at >= NOW - timedelta(days=7)).order_by(
+        Activity.created_at.desc(), Activity.id.desc()
+    ).limit(11),
+    "activities_next_page": select(Activity).where(
+        keyset_before([Activity.created_at, Activity.id], [NOW, 500])
+    ).order_by(Activity.created_at.desc(), Activity.id.desc()).limit(11),
+    "qa_month": select(Qa).where(Qa.year == 2025, Qa.month == 3),
+    "qa_line_month": select(Qa).where(Qa.line == "L1", Qa.year == 2025, Qa.month == 3),
+    "qa_rollup_years": select(QaMonthlyRollup).where(QaMonthlyRollup.year.in_([2024, 2025])),
+    "qad_month": select(Qad).where(Qad.year == 2025, Qad.month == 3),
+    "qa_kpi_month": select(QaKpi).where(QaKpi.year == 2025, QaKpi.month == 3),
+    "monthly_totals_month": select(MonthlyTotal).where(MonthlyTotal.month == 3, MonthlyTotal.year == 2025),
+    "ehs_year": select(Ehs).where(Ehs.year == 2025),
+    "user_by_name": select(User).where(User.name == "admin"),
+}
+
+
+# 热点查询涉及的每张表 -> 第 i 行测试数据
+SEED_ROWS = 500
+SEED = {
+    MaintDaily: lambda i: MaintDaily(
+        date=TODAY - timedelta(days=i % 60), user_id=i % 7, title="t", wheres="w", type=1, content_daily="c",
+        solved_flag=i % 2,
+    ),
+    MaintWeekly: lambda i: MaintWeekly(
+        user_id=i % 7, DateTime=TODAY - timedelta(days=i % 60), title="t", wheres="w", content="c", degree="1",
+        solved_flag=i % 2,
+    ),
+    Event: lambda i: Event(name=f"e{i}", department=f"D{i % 5}", start_time=TODAY - timedelta(days=i % 60)),
+    Activity: lambda i: Activity(
+        title="t", action="a", type="QA_UPDATE", department=f"D{i % 5}", created_at=NOW - timedelta(minutes=i),
+    ),
+    Qa: lambda i: Qa(line=f"P{i}", year=2025, month=3, day=1, value=1, scrapflag=False),
+    QaMonthlyRollup: lambda i: QaMonthlyRollup(
+        line=f"P{i}", year=2025, month=3, value_sum=0, scrap_sum=0, cell_count=0, scrap_count=0,
+    ),
+    Qad: lambda i: Qad(year=2020 + i % 6, month=i % 12 + 1, supplier_defect=0),
+    QaKpi: lambda i: QaKpi(year=2020 + i % 6, month=i % 12 + 1, area="a"),
+    MonthlyTotal: lambda i: MonthlyTotal(line=f"P{i}", year=2025, month=3, amount=0),
+    Ehs: lambda i: Ehs(year=1900 + i // 52, week=i % 52 + 1, lwd=0),
+    User: lambda i: User(name=f"plan{i}", password="x"),
+}
+
+
+def _seed():
+    """逐表检查：其他测试模块已写入数据的表不再补充，空表写入 SEED_ROWS 行"""
+    db = SessionLocal()
+    try:
+        for model, row in SEED.items():
+            if db.query(model).first() is None:
+                db.add_all(row(i) for i in range(SEED_ROWS))
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="module")
+def conn(schema):
+    _seed()
+    with engine.connect() as connection:
+        yield connection
+
+
+def _full_scans(conn, stmt):
+    """返回执行计划中做全表扫描的表"""
+    dialect = conn.dialect
+    if dialect.name == "mysql":
+        compiled = stmt.compile(dialect=dialect)
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = conn.exec_driver_sql(f"EXPLAIN {compiled}", params).mappings().all()
+        return [row["table"] for row in plan if row["type"] == "ALL"]
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    # SQLite: "SCAN t" 为全表扫描，"SCAN t USING INDEX ..." 为按索引顺序扫描
+    return [row[-1] for row in plan if row[-1].startswith("SCAN ") and "USING" not in row[-1]]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(conn, name):
+    assert _full_scans(conn, HOT_QUERIES[name]) == []
@@ -0,0 +1,58 @@
+import os
+import re
+
+from core.config import LOG_DIR
+from core.logger import flush_logs
+from core.request_metrics import request_metrics
+
+
+def sample(text: str, name: str, **labels) -> float:
+    """取一个样本值；标签按输出顺序给出"""
+    series = name
+    if labels:
+        series += "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.M)
+    assert match, f"{series} not found"
+    return float(match.group(1))
+
+
+def setup_module():
+    request_metrics.reset()
+
+
+def test_requests_are_counted_by_route_template(client):
+    for activity_id in (987654, 987655):
+        assert client.get(f"/activities/{activity_id}").status_code == 404
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert sample(text, "datalink_http_requests_total", method="GET", route="/activities/{activity_id}", status=404) == 2
+    assert sample(text, "datalink_http_requests_total", method="GET", route="<unmatched>", status=404) == 2
+    assert "/activities/987654" not in text and "/no/such/path" not in text
+    assert sample(text, "datalink_http_request_duration_seconds_count",
+                  method="GET", route="/activities/{activity_id}") == 2
+    assert sample(text, "datalink_http_request_duration_seconds_bucket",
+                  method="GET", route="/activities/{activity_id}", le="+Inf") == 2
+    # /metrics 自身正在处理
+    assert sample(text, "datalink_http_requests_in_flight") == 1
+    assert "# TYPE datalink_http_request_duration_seconds histogram" in text
+
+
+def test_response_size_is_bytes_sent(client):
+    request_metrics.reset()
+    body = client.get("/monitor/cache", headers={"Accept-Encoding": "identity"}).content
+    text = client.get("/metrics").text
+    assert sample(text, "datalink_http_response_size_bytes_sum", method="GET", route="/monitor/cache") == len(body)
+    assert sample(text, "datalink_http_requests_in_flight") == 1
+
+
+def test_request_log_keeps_the_old_format(client):
+    client.get("/monitor/cache")
+    flush_logs()
+    with open(os.path.join(LOG_DIR, "datalink_request.log"), encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert re.search(r"\| INFO \| datalink_request \| request_metrics\.py:\d+ \| 开始处理 GET /monitor/cache - 客户端: ", lines[-2])
+    assert re.search(r"完成处理 GET /monitor/cache - 状态码: 200 - 处理时间: \d+\.\d{3}s$", lines[-1])
@@ -0,0 +1,86 @@
+from datetime import date, datetime
+
+from sqlalchemy import delete, insert
+
+from models.activity import Activity
+from models.event import Event
+from models.maint import MaintDaily, MaintWeekly
+from models.user import User
+from services.search import parse_terms, search
+
+TABLES = [User, Activity, MaintDaily, MaintWeekly, Event]
+
+
+def titles(hits):
+    return [(hit["module"], hit["title"]) for hit in hits]
+
+
+def test_parse_terms_drops_quotes_and_short_terms():
+    assert parse_terms('"漏油" 电机  a 漏油') == ["漏油", "电机"]
+
+
+def test_ranked_hits_across_modules(memory_db):
+    async def run(engine, db):
+        db.add_all([
+            MaintDaily(date=date(2025, 3, 1), user_id=1, title="主轴电机漏油", wheres="二号线", content_daily="更换密封圈", solved_flag=0),
+            MaintWeekly(DateTime=date(2025, 3, 2), user_id=1, title="周检", wheres="三号线", content="电机漏油复查", degree="中等", solved_flag=0),
+            Event(name="电机漏油专项培训", department="MAINT", start_time=date(2025, 3, 5)),
+            MaintDaily(date=date(2025, 3, 3), user_id=1, title="更换灯管", wheres="仓库", content_daily="照明", solved_flag=1),
+        ])
+        # 与活动日志批量写入相同的 executemany 路径
+        await db.execute(insert(Activity), [
+            {"title": "更新日维护任务", "action": "更新了日维护任务: 主轴电机漏油", "type": "MAINT_UPDATE",
+             "user_name": "张工", "target": "/maintenance", "created_at": datetime(2025, 3, 4, 8)},
+        ])
+        await db.commit()
+
+        hits, has_more, total = await search(db, "电机漏油", include_total=True)
+        assert total == 4 and not has_more
+        assert {hit["module"] for hit in hits} == {"maint_daily", "maint_weekly", "event", "activity"}
+        assert hits == sorted(hits, key=lambda hit: hit["score"], reverse=True)
+        assert next(hit for hit in hits if hit["module"] == "activity")["target"] == "/maintenance"
+
+        # 两个字的词走 LIKE，多个词需全部命中
+        hits, _, _ = await search(db, "张工 漏油")
+        assert titles(hits) == [("activity", "更新日维护任务")]
+        hits, _, _ = await search(db, "漏油", modules=["event"])
+        assert titles(hits) == [("event", "电机漏油专项培训")]
+
+    memory_db(TABLES, run)
+
+
+def test_index_follows_updates_and_deletes(memory_db):
+    async def run(engine, db):
+        task = MaintDaily(date=date(2025, 3, 1), user_id=1, title="空压机异响", wheres="动力站", content_daily="", solved_flag=0)
+        event = Event(name="空压机保养", department="MAINT", start_time=date(2025, 3, 5))
+        db.add_all([task, event])
+        await db.commit()
+        assert len((await search(db, "空压机"))[0]) == 2
+
+        task.title = "冷却塔异响"
+        await db.commit()
+        await db.execute(delete(Event).where(Event.id == event.id))
+        await db.commit()
+        assert (await search(db, "空压机"))[0] == []
+        assert titles((await search(db, "冷却塔"))[0]) == [("maint_daily", "冷却塔异响")]
+
+    memory_db(TABLES, run)
+
+
+def test_pages_do_not_overlap(memory_db):
+    async def run(engine, db):
+        db.add_all([
+            Event(name=f"安全巡检 第{i}次", department="EHS", start_time=date(2025, 1, i + 1)) for i in range(7)
+        ])
+        await db.commit()
+
+        seen, offset = [], 0
+        while True:
+            hits, has_more, _ = await search(db, "安全巡检", limit=3, offset=offset)
+            seen += [hit["id"] for hit in hits]
+            if not has_more:
+                break
+            offset += 3
+        assert sorted(seen) == list(range(1, 8)) and len(seen) == 7
+
+    memory_db(TABLES, run)
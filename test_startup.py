@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# 与 benchmarks/bench_startup.py 一致：只在用到时加载的重依赖
+LAZY_MODULES = ("jwt", "passlib", "redis", "services.imports")
+
+
+def test_import_does_no_database_io_and_defers_heavy_modules(tmp_path):
+    database = tmp_path / "never_created.db"
+    script = (
+        "import json, sys\n"
+        "import main\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=dict(os.environ, DATABASE_URL=f"sqlite:///{database}", LOG_DIR=str(tmp_path), PYTHONWARNINGS="ignore"),
+        capture_output=True, text=True, check=True,
+    ).stdout
+    # 导入时没有连接数据库（SQLite 连接会创建文件），表结构只由 Alembic 维护
+    assert not database.exists()
+    assert json.loads(output.strip().splitlines()[-1]) == []
+
+
+def test_init_db_creates_schema_and_stamps_head(tmp_path):
+    from alembic.script import ScriptDirectory
+    from alembic.config import Config
+    from sqlalchemy import create_engine, inspect, text
+
+    from db.init_db import ALEMBIC_INI, init_db
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    try:
+        assert init_db(engine)
+        tables = set(inspect(engine).get_table_names())
+        assert {"qa", "ehs", "users", "departments", "events", "maint_daily", "maint_weekly",
+                "qad", "qa_kpi", "monthly_totals", "activities", "activities_fts"} <= tables
+        with engine.connect() as conn:
+            version = conn.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+        assert version == ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+        # 已有表的库不再改动
+        assert not init_db(engine)
+    finally:
+        engine.dispose()
@@ -0,0 +1,97 @@
+import asyncio
+import re
+import time
+import contextvars
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import DB_TIME_BUDGETS
+from core.request_metrics import RequestMetrics, RequestMetricsMiddleware
+from db.database import SessionLocal, async_engine, engine, get_async_db
+from db.query_metrics import track_queries
+from db.statement_timeout import (
+    QueryTimeout, query_timeout_handler, set_time_budget, time_budget, with_max_execution_time,
+)
+
+# 不带任何表的无限递归查询，只能被中断结束
+ENDLESS = text("WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT count(*) FROM r")
+
+
+def in_fresh_context(function):
+    """预算设置在 contextvar 中，每个测试在独立的上下文里运行，不影响其他测试"""
+    return contextvars.copy_context().run(function)
+
+
+def test_sync_statement_is_interrupted_and_connection_reused():
+    def scenario():
+        set_time_budget(0.2)
+        session = SessionLocal()
+        started = time.perf_counter()
+        try:
+            with track_queries("超时测试") as stats:
+                with pytest.raises(QueryTimeout, match="0.2s"):
+                    session.execute(ENDLESS)
+        finally:
+            session.close()
+        assert time.perf_counter() - started < 2
+        assert stats.timeouts == 1
+        assert engine.pool.checkedout() == 0
+        # 同一连接归还后没有遗留截止时间
+        set_time_budget(0)
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    in_fresh_context(scenario)
+
+
+def test_async_statement_is_interrupted_and_connection_released():
+    async def scenario():
+        set_time_budget(0.2)
+        async with AsyncSession(async_engine) as session:
+            with pytest.raises(QueryTimeout):
+                await session.execute(ENDLESS)
+        assert async_engine.pool.checkedout() == 0
+        # 预算之内的查询不受影响
+        set_time_budget(5)
+        async with AsyncSession(async_engine) as session:
+            assert (await session.execute(text("SELECT 1"))).scalar() == 1
+
+    in_fresh_context(lambda: asyncio.run(scenario()))
+
+
+def test_mysql_hint_uses_remaining_budget():
+    hinted = with_max_execution_time("SELECT qa.id FROM qa", time.monotonic() + 2)
+    assert re.fullmatch(r"SELECT /\*\+ MAX_EXECUTION_TIME\((19\d\d|2000)\) \*/ qa.id FROM qa", hinted)
+    assert with_max_execution_time("SELECT 1", time.monotonic() - 1).startswith("SELECT /*+ MAX_EXECUTION_TIME(1) */")
+    # MySQL 只对只读 SELECT 生效，写入原样执行
+    assert with_max_execution_time("UPDATE qa SET value = 1", time.monotonic() + 2) == "UPDATE qa SET value = 1"
+
+
+def test_route_budget_returns_504_and_is_counted(monkeypatch):
+    monkeypatch.setitem(DB_TIME_BUDGETS, "slow_test", 0.2)
+    router = APIRouter(dependencies=[Depends(time_budget("slow_test"))])
+
+    @router.get("/slow")
+    async def slow(db: AsyncSession = Depends(get_async_db)):
+        return (await db.execute(ENDLESS)).scalar()
+
+    @router.get("/fast")
+    async def fast(db: AsyncSession = Depends(get_async_db)):
+        return (await db.execute(text("SELECT 1"))).scalar()
+
+    metrics = RequestMetrics()
+    app = FastAPI()
+    app.include_router(router)
+    app.add_exception_handler(QueryTimeout, query_timeout_handler)
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics, log_requests=False)
+    client = TestClient(app)
+
+    response = client.get("/slow")
+    assert response.status_code == 504
+    assert "超出时间预算（0.2s）" in response.json()["detail"]
+    assert client.get("/fast").json() == 1
+    assert 'datalink_db_statement_timeouts_total{method="GET",route="/slow"} 1' in metrics.render()
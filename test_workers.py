@@ -0,0 +1,47 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from core import server
+from db.database import async_engine, engine
+
+
+def test_multiple_workers_require_shared_cache(monkeypatch):
+    monkeypatch.setattr(server, "REDIS_URL", None)
+    monkeypatch.setattr(server, "ALLOW_LOCAL_CACHE_WITH_WORKERS", False)
+    server.check_workers(1)
+    with pytest.raises(SystemExit, match="REDIS_URL"):
+        server.check_workers(4)
+
+    monkeypatch.setattr(server, "REDIS_URL", "redis://localhost:6379/0")
+    server.check_workers(4)
+
+
+def test_lifespan_closes_pools():
+    with TestClient(main.app) as client:
+        assert client.get("/metrics").status_code == 200
+        assert async_engine.pool.checkedin() > 0
+    # 关闭阶段释放了预热的连接
+    assert async_engine.pool.checkedin() == 0
+    assert engine.pool.checkedin() == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="需要 fork")
+def test_forked_child_does_not_reuse_parent_connections():
+    with engine.connect():
+        pass
+    assert engine.pool.checkedin() > 0
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # 子进程：继承来的连接已被丢弃
+        os.write(write, str(engine.pool.checkedin()).encode())
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    assert os.read(read, 16) == b"0"
+    os.close(read)
+    # 父进程的连接不受影响
+    assert engine.pool.checkedin() > 0